@@ -0,0 +1,272 @@
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, asdict
+from unittest.mock import patch
+
+from src.hangman_game import HangmanGame
+from src.hangman_puzzle import HangmanPuzzle, Puzzle
+from src.hangman_puzzle_generator import Category, PUZZLES_BY_CATEGORY_LIST, gen_puzzle
+from src.hangman_puzzle_store import PuzzleStore
+from src.hangman_representation import HangmanRepresentation
+from src.hangman_session import HangmanSession
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+DEFAULT_OUTPUT = "bench_results.json"
+DEFAULT_THRESHOLD = 0.3
+ROUNDS = 5
+
+
+@dataclass
+class Metric:
+    name: str
+    value: float
+    unit: str
+    lower_is_better: bool = True
+    gated: bool = True
+
+
+def percentile(sorted_values: list[int], share: float) -> float:
+    return sorted_values[min(int(share * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def latency_metrics(name: str, operation: Callable[[], object], iterations: int) -> list[Metric]:
+    """
+    Times every call of the operation in ROUNDS rounds (after a warm-up one) and reports in nanoseconds
+    the lowest median of the rounds, which is the least sensitive to noise, and the 99th percentile of all calls.
+    """
+    timer = time.perf_counter_ns
+    medians = []
+    samples = []
+    gc.disable()
+    try:
+        for round_ind in range(ROUNDS + 1):
+            round_samples = []
+            for _ in range(iterations // ROUNDS):
+                start = timer()
+                operation()
+                round_samples.append(timer() - start)
+            if round_ind:
+                round_samples.sort()
+                medians.append(percentile(round_samples, 0.5))
+                samples += round_samples
+    finally:
+        gc.enable()
+    samples.sort()
+    return [
+        Metric(f"{name}.p50", min(medians), "ns"),
+        Metric(f"{name}.p99", percentile(samples, 0.99), "ns", gated=False),
+    ]
+
+
+def bench_gen_puzzle(iterations: int) -> list[Metric]:
+    return latency_metrics("gen_puzzle", lambda: gen_puzzle(Category.RANDOM_FLAG, Category.RANDOM_FLAG), iterations)
+
+
+def bench_process_letter(iterations: int) -> list[Metric]:
+    puzzles = [(puzzle, category.alphabet) for category, puzzles in PUZZLES_BY_CATEGORY_LIST.items()
+               for puzzle in puzzles]
+    rng = random.Random(0)
+    state = {"puzzle": HangmanPuzzle(*puzzles[0]), "letters": iter(())}
+
+    def process_next_letter():
+        letter = next(state["letters"], None)
+        if letter is None:
+            puzzle, alphabet = rng.choice(puzzles)
+            state["puzzle"] = HangmanPuzzle(puzzle, alphabet)
+            state["letters"] = iter(rng.sample(alphabet.letters, len(alphabet)))
+            letter = next(state["letters"])
+        state["puzzle"].process_letter(letter)
+
+    return latency_metrics("process_letter", process_next_letter, iterations)
+
+
+def bench_hangman_picture(iterations: int) -> list[Metric]:
+    representation = HangmanRepresentation()
+    representation.update_hangman_parts(3, 1)
+    return latency_metrics("hangman_picture", lambda: representation.hangman_picture, iterations)
+
+
+def bench_play_game(games: int) -> list[Metric]:
+    """
+    Plays scripted console games (input and output are replaced) and measures whole-game throughput.
+    """
+    script = ["animals", "1"] + list("etaoinshrdlcumwfgypbvkjxqz")
+    output = io.StringIO()
+    samples = []
+    with patch("builtins.print"), contextlib.redirect_stdout(output):
+        for _ in range(games):
+            with patch("builtins.input", side_effect=script):
+                start = time.perf_counter_ns()
+                HangmanGame().play_game()
+                samples.append(time.perf_counter_ns() - start)
+            output.seek(0)
+            output.truncate()
+    samples.sort()
+    return [
+        Metric("play_game.p50", percentile(samples, 0.5), "ns"),
+        Metric("play_game.p99", percentile(samples, 0.99), "ns", gated=False),
+        Metric("play_game.throughput", games * 1e9 / sum(samples), "games/s", lower_is_better=False),
+    ]
+
+
+def measure_memory(name: str, factory: Callable[[], object], count: int) -> Metric:
+    """
+    Measures the memory allocated per object created by the factory, in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory() for _ in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del objects
+    return Metric(name, allocated / count, "bytes")
+
+
+def bench_memory(count: int) -> list[Metric]:
+    puzzles = PUZZLES_BY_CATEGORY_LIST[Category.ANIMALS]
+
+    def new_puzzle():
+        return HangmanPuzzle(puzzles[random.randrange(len(puzzles))])
+
+    def new_session():
+        session = HangmanSession()
+        session.start()
+        session.feed("animals")
+        session.feed("1")
+        session.feed("e")
+        return session
+
+    return [
+        measure_memory("memory.per_puzzle", new_puzzle, count),
+        measure_memory("memory.per_session", new_session, count // 10),
+    ]
+
+
+def measure_retained(factory: Callable[[], object]) -> int:
+    """
+    Measures the memory still allocated after the factory returns, that is, held by the object it built, in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        built = factory()
+        gc.collect()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del built
+    return allocated
+
+
+def bench_puzzle_store(count: int) -> list[Metric]:
+    """
+    Compares the memory taken by a word bank of synthetic puzzles kept as a list of Puzzle objects
+    and as a PuzzleStore, per puzzle with its word and hint.
+    """
+    rng = random.Random(0)
+    letters = Category.ANIMALS.alphabet.letters
+    words = ["".join(rng.choices(letters, k=rng.randint(4, 10))) for _ in range(count)]
+    hints = [f"Hint number {ind} about a word" for ind in range(count)]
+    encoded = [(word.encode(), hint.encode()) for word, hint in zip(words, hints)]
+    del words, hints
+
+    def new_objects():
+        return [Puzzle(word.decode(), hint.decode()) for word, hint in encoded]
+
+    objects = new_objects()
+    return [
+        Metric("memory.puzzle_objects", measure_retained(new_objects) / count, "bytes", gated=False),
+        Metric("memory.puzzle_store", measure_retained(lambda: PuzzleStore.from_puzzles({"words": objects})) / count,
+               "bytes"),
+    ]
+
+
+def run_benchmarks(scale: float = 1.0) -> list[Metric]:
+    iterations = int(20000 * scale)
+    random.seed(0)
+    return [
+        *bench_gen_puzzle(iterations),
+        *bench_process_letter(iterations),
+        *bench_hangman_picture(iterations),
+        *bench_play_game(int(500 * scale)),
+        *bench_memory(int(10000 * scale)),
+        *bench_puzzle_store(int(100000 * scale)),
+    ]
+
+
+def compare(metrics: list[Metric], baseline: dict, threshold: float) -> list[str]:
+    """
+    Returns the descriptions of the gated metrics that are worse than the baseline by more than the threshold.
+    """
+    regressions = []
+    for metric in metrics:
+        reference = baseline.get("metrics", {}).get(metric.name)
+        if not metric.gated or reference is None:
+            continue
+        reference_value = reference["value"]
+        if metric.lower_is_better:
+            regressed = metric.value > reference_value * (1 + threshold)
+        else:
+            regressed = metric.value < reference_value * (1 - threshold)
+        if regressed:
+            regressions.append(f"{metric.name}: {metric.value:.1f} {metric.unit} "
+                               f"(baseline {reference_value:.1f} {metric.unit})")
+    return regressions
+
+
+def format_report(metrics: list[Metric]) -> str:
+    return "\n".join(f"{metric.name:<28}{metric.value:>16.1f} {metric.unit}" for metric in metrics)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Hangman performance benchmarks.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare the results with")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the results JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative regression, e.g. 0.3 for 30%%")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier of the number of iterations")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results to the baseline")
+    args = parser.parse_args(argv)
+
+    metrics = run_benchmarks(args.scale)
+    print(format_report(metrics))
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "metrics": {metric.name: asdict(metric) for metric in metrics},
+    }
+    with open(args.baseline if args.update_baseline else args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+        file.write("\n")
+    if args.update_baseline:
+        return 0
+
+    try:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}, nothing to compare with.")
+        return 0
+
+    regressions = compare(metrics, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import math
+import threading
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+
+from src.hangman_alphabet import LATIN, Alphabet
+from src.hangman_puzzle import Puzzle
+from src.hangman_word_bank import iter_words
+
+
+def bits_to_int(word_ids: Iterable[int], size: int) -> int:
+    """
+    Builds a bitset (a Python int) with the given bits set.
+    """
+    bits = bytearray((size + 7) // 8)
+    for word_id in word_ids:
+        bits[word_id >> 3] |= 1 << (word_id & 7)
+    return int.from_bytes(bits, 'little')
+
+
+class LetterBitsets:
+    """
+    Bitsets over the words of the same length: bit i stands for words[i].
+    - contains[letter]: words containing the letter;
+    - at[pos][letter]: words with the letter at the position.
+    Letters are addressed by their index in the alphabet.
+    ids[i] is the index of words[i] in its category (i by default).
+    """
+    __slots__ = ('words', 'ids', 'alphabet', 'all', 'contains', 'at')
+
+    def __init__(self, words: Sequence[str], alphabet: Alphabet = LATIN, ids: Sequence[int] | None = None):
+        self.words = words
+        self.ids = ids if ids is not None else range(len(words))
+        self.alphabet = alphabet
+        indices = alphabet.indices
+        length = len(words[0]) if words else 0
+        contains_ids = [[] for _ in alphabet.letters]
+        at_ids = [[[] for _ in alphabet.letters] for _ in range(length)]
+        for word_id, word in enumerate(words):
+            for letter_ind in {indices[letter] for letter in word}:
+                contains_ids[letter_ind].append(word_id)
+            for pos, letter in enumerate(word):
+                at_ids[pos][indices[letter]].append(word_id)
+
+        self.all = (1 << len(words)) - 1
+        self.contains = [bits_to_int(ids, len(words)) for ids in contains_ids]
+        self.at = [[bits_to_int(ids, len(words)) for ids in letter_ids] for letter_ids in at_ids]
+
+
+class AdvisorIndex:
+    """
+    LetterBitsets of every category and word length of a word bank, built on first use.
+    The words of a category are indexed over its alphabet from alphabets (LATIN by default).
+    The index may be used from several threads; a category is built once.
+    """
+    def __init__(self, puzzles_by_category: Mapping[str, Sequence[Puzzle]],
+                 alphabets: Mapping[str, Alphabet] | None = None):
+        self._puzzles_by_category = puzzles_by_category
+        self._alphabets = alphabets if alphabets is not None else {}
+        self._bitsets: dict[str, dict[int, LetterBitsets]] = {}
+        self._build_lock = threading.Lock()
+
+    def reuse(self, previous: "AdvisorIndex", categories: Iterable[str]) -> None:
+        """
+        Takes the bitsets of the categories already built by another index over the same puzzles of these categories.
+        """
+        for category in categories:
+            if category in previous._bitsets:
+                self._bitsets[category] = previous._bitsets[category]
+
+    def bitsets(self, category: str, length: int) -> LetterBitsets:
+        if category not in self._bitsets:
+            with self._build_lock:
+                if category not in self._bitsets:
+                    self._bitsets[category] = self._build(category)
+        bitsets = self._bitsets[category].get(length)
+        return bitsets if bitsets is not None else LetterBitsets([], self._alphabets.get(category, LATIN))
+
+    def _build(self, category: str) -> dict[int, LetterBitsets]:
+        words_by_length: dict[int, tuple[list[str], array]] = {}
+        for word_id, word in enumerate(iter_words(self._puzzles_by_category[category])):
+            words, ids = words_by_length.setdefault(len(word), ([], array('I')))
+            words.append(word)
+            ids.append(word_id)
+        alphabet = self._alphabets.get(category, LATIN)
+        return {
+            word_length: LetterBitsets(words, alphabet, ids)
+            for word_length, (words, ids) in words_by_length.items()
+        }
+
+
+class LetterAdvisor:
+    """
+    Tracks the dictionary words consistent with the guesses of a game and recommends the next letter.
+    The candidate set is a bitset narrowed by intersections after every guess.
+    """
+    __slots__ = ('_bitsets', '_candidates', '_asked_mask')
+
+    def __init__(self, bitsets: LetterBitsets):
+        self._bitsets = bitsets
+        self._candidates = bitsets.all
+        self._asked_mask = 0
+
+    def observe(self, letter: str, positions: Sequence[int]) -> None:
+        """
+        Narrows the candidate set after a guess.
+
+        Args:
+            letter (str): The guessed letter.
+            positions (Sequence[int]): Positions of the letter in the hidden word, empty on a miss.
+        """
+        letter_ind = self._bitsets.alphabet.indices[letter]
+        self._asked_mask |= 1 << letter_ind
+        candidates = self._candidates
+        if not positions:
+            candidates &= ~self._bitsets.contains[letter_ind]
+        else:
+            candidates &= self._bitsets.contains[letter_ind]
+            for pos, words_with_letter in enumerate(self._bitsets.at):
+                if pos in positions:
+                    candidates &= words_with_letter[letter_ind]
+                else:
+                    candidates &= ~words_with_letter[letter_ind]
+        self._candidates = candidates
+
+    def count_candidates(self) -> int:
+        return self._candidates.bit_count()
+
+    def get_candidates(self) -> list[str]:
+        candidates = self._candidates
+        return [word for word_id, word in enumerate(self._bitsets.words) if candidates >> word_id & 1]
+
+    def suggest(self) -> tuple[str, int] | None:
+        """
+        Recommends the letter whose guess gives the most information about the hidden word:
+        the entropy of "the letter is in the word" over the candidates is maximized.
+        Among equally informative letters, the one contained in more candidates is preferred.
+
+        Returns:
+            tuple[str, int] | None: The letter and the number of candidates containing it,
+            or None if there is nothing to recommend.
+        """
+        total = self._candidates.bit_count()
+        if not total:
+            return None
+
+        best_key = None
+        best = None
+        for letter_ind, letter in enumerate(self._bitsets.alphabet.letters):
+            if self._asked_mask >> letter_ind & 1:
+                continue
+            count = (self._candidates & self._bitsets.contains[letter_ind]).bit_count()
+            if not count:
+                continue
+            share = count / total
+            entropy = -share * math.log2(share)
+            if share < 1:
+                entropy -= (1 - share) * math.log2(1 - share)
+            key = (entropy, count)
+            if best_key is None or key > best_key:
+                best_key = key
+                best = (letter, count)
+        return best
@@ -0,0 +1,53 @@
+import string
+from collections.abc import Iterator
+
+MAX_ALPHABET_SIZE = 64
+
+
+class Alphabet:
+    """
+    Letters of a language, each mapped to a dense index from 0 to len(alphabet) - 1.
+    The indices address fixed-size per-letter arrays and the bits of letter masks,
+    so an alphabet has at most MAX_ALPHABET_SIZE letters and a mask fits into 64 bits.
+    """
+    __slots__ = ('name', 'title', 'letters', 'indices', '_letter_set')
+
+    def __init__(self, name: str, title: str, letters: str):
+        if not letters or len(letters) > MAX_ALPHABET_SIZE:
+            raise ValueError(f"An alphabet must have from 1 to {MAX_ALPHABET_SIZE} letters")
+        if len(set(letters)) != len(letters):
+            raise ValueError(f"Alphabet {name} has repeated letters")
+        if letters != letters.lower():
+            raise ValueError(f"Alphabet {name} must consist of small letters")
+        self.name = name
+        self.title = title
+        self.letters = letters
+        self.indices = {letter: ind for ind, letter in enumerate(letters)}
+        self._letter_set = frozenset(letters)
+
+    def __len__(self) -> int:
+        return len(self.letters)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.letters)
+
+    def __contains__(self, letter: str) -> bool:
+        return letter in self.indices
+
+    def __repr__(self) -> str:
+        return f"Alphabet({self.name!r})"
+
+    def index(self, letter: str) -> int:
+        """
+        Raises:
+            KeyError: If the letter is not in the alphabet.
+        """
+        return self.indices[letter]
+
+    def contains_word(self, word: str) -> bool:
+        return self._letter_set.issuperset(word)
+
+
+LATIN = Alphabet("latin", "Latin", string.ascii_lowercase)
+CYRILLIC = Alphabet("cyrillic", "Cyrillic", "абвгдеёжзийклмнопрстуфхцчшщъыьэюя")
+ALPHABETS = {alphabet.name: alphabet for alphabet in (LATIN, CYRILLIC)}
@@ -0,0 +1,218 @@
+import argparse
+import contextlib
+import os
+import sys
+import unicodedata
+from array import array
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import StrEnum
+from itertools import islice
+
+from src.hangman_bank_cache import CategoryIndex, source_digest, write_bank_cache
+from src.hangman_puzzle_generator import Category
+from src.hangman_word_bank import COMMENT_PREFIX, FIELD_SEPARATOR, format_word_bank_line, unescape_field
+from src.hangman_word_difficulty import word_hardness
+
+DEFAULT_CHUNK_SIZE = 10000
+MIN_WORD_LENGTH = 3
+MAX_WORD_LENGTH = 24
+CATEGORY_ALPHABETS = {category.value: category.alphabet for category in Category if category != Category.RANDOM_FLAG}
+CATEGORIES = frozenset(CATEGORY_ALPHABETS)
+
+
+class Rejection(StrEnum):
+    MALFORMED = "malformed"
+    ENCODING = "encoding"
+    CATEGORY = "category"
+    ALPHABET = "alphabet"
+    LENGTH = "length"
+    DUPLICATE = "duplicate"
+
+
+@dataclass
+class IngestStats:
+    lines: int = 0
+    accepted: int = 0
+    rejected: Counter = field(default_factory=Counter)
+
+    def report(self) -> str:
+        rejected = ", ".join(f"{reason}: {count}" for reason, count in sorted(self.rejected.items()))
+        return f"{self.lines} lines, {self.accepted} puzzles accepted, rejected: {rejected or 'none'}"
+
+
+def normalize_word(word: str) -> str:
+    if not word.isascii():
+        word = unicodedata.normalize("NFKC", word)
+    return word.strip().lower()
+
+
+def normalize_hint(hint: str) -> str:
+    hint = unescape_field(hint)
+    if not hint.isascii():
+        hint = unicodedata.normalize("NFKC", hint)
+    return hint.strip()
+
+
+def process_chunk(lines: list[bytes], default_category: str | None = None, min_length: int = MIN_WORD_LENGTH,
+                  max_length: int = MAX_WORD_LENGTH) -> list[tuple[str, str, bytes, float] | str]:
+    """
+    Normalizes and validates raw lines: "category<TAB>word<TAB>hint" (as in a word bank),
+    or "word<TAB>hint" if default_category is set; the hint is optional.
+    Words must consist of the letters of the alphabet of their category.
+    Comments and blank lines are dropped.
+
+    Returns:
+        list[tuple[str, str, bytes, float] | str]: For every other line, in order, either the category, word,
+        encoded word bank line and hardness of the puzzle, or the reason it was rejected (see Rejection).
+    """
+    separator = FIELD_SEPARATOR
+    categories = {}
+    records = []
+    for raw_line in lines:
+        try:
+            line = raw_line.decode("utf-8").rstrip("\r\n")
+        except UnicodeDecodeError:
+            records.append(Rejection.ENCODING)
+            continue
+        if not line.strip() or line.startswith(COMMENT_PREFIX):
+            continue
+
+        if default_category is None:
+            fields = line.split(separator, 2)
+            if len(fields) < 2:
+                records.append(Rejection.MALFORMED)
+                continue
+            category = categories.get(fields[0])
+            if category is None:
+                category = categories[fields[0]] = normalize_word(fields[0])
+            word_and_hint = fields[1:]
+        else:
+            category = default_category
+            word_and_hint = line.split(separator, 1)
+
+        word = normalize_word(word_and_hint[0])
+        if category not in CATEGORIES:
+            records.append(Rejection.CATEGORY)
+        elif not CATEGORY_ALPHABETS[category].contains_word(word):
+            records.append(Rejection.ALPHABET)
+        elif not min_length <= len(word) <= max_length:
+            records.append(Rejection.LENGTH)
+        else:
+            hint = normalize_hint(word_and_hint[1]) if len(word_and_hint) > 1 else ""
+            line = format_word_bank_line(category, word, hint).encode("utf-8")
+            records.append((category, word, line, word_hardness(word)))
+    return records
+
+
+def _read_chunks(paths: Iterable[str], chunk_size: int) -> Iterator[list[bytes]]:
+    for path in paths:
+        with open(path, "rb") if path != "-" else contextlib.nullcontext(sys.stdin.buffer) as file:
+            while chunk := list(islice(file, chunk_size)):
+                yield chunk
+
+
+def _process_chunks(chunks: Iterator[list[bytes]], jobs: int, *args) -> Iterator[list]:
+    """
+    Yields the processed chunks in input order. With several jobs, the chunks are processed by worker processes
+    with at most two chunks per worker in flight.
+    """
+    if jobs <= 1:
+        for chunk in chunks:
+            yield process_chunk(chunk, *args)
+        return
+
+    with ProcessPoolExecutor(jobs) as executor:
+        pending = deque()
+        for chunk in chunks:
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+            pending.append(executor.submit(process_chunk, chunk, *args))
+        while pending:
+            yield pending.popleft().result()
+
+
+def build_word_bank(paths: Iterable[str], output_path: str, cache_path: str | None = None,
+                    default_category: str | None = None, jobs: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    min_length: int = MIN_WORD_LENGTH, max_length: int = MAX_WORD_LENGTH) -> IngestStats:
+    """
+    Builds a word bank file (see write_word_bank) from raw word lists.
+
+    The lines are read in chunks that are validated by a process pool (see process_chunk) and merged in input order.
+    A word is kept in the first category it appears in, later duplicates are rejected. If cache_path is set,
+    the indexes of the bank are written there too (see hangman_bank_cache), so the bank loads without rescoring.
+
+    Raises:
+        ValueError: If default_category is not a puzzle category or the output is one of the inputs.
+    """
+    if default_category is not None and default_category not in CATEGORIES:
+        raise ValueError(f"Unknown category: {default_category}")
+    paths = list(paths)
+    if os.path.abspath(output_path) in {os.path.abspath(path) for path in paths if path != "-"}:
+        raise ValueError(f"The word bank {output_path} would overwrite its input")
+
+    stats = IngestStats()
+    seen_words = set()
+    offsets: dict[str, array] = {}
+    hardness: dict[str, list[float]] = {}
+    position = 0
+    chunks = _read_chunks(paths, chunk_size)
+    # The bank is replaced by a rename, so the processes reading the previous version keep it intact.
+    temporary_path = f"{output_path}.tmp"
+    with open(temporary_path, "wb") as output:
+        for records in _process_chunks(chunks, jobs, default_category, min_length, max_length):
+            lines = []
+            for record in records:
+                stats.lines += 1
+                if isinstance(record, str):
+                    stats.rejected[record] += 1
+                    continue
+                category, word, line, word_hardness = record
+                if word in seen_words:
+                    stats.rejected[Rejection.DUPLICATE] += 1
+                    continue
+                seen_words.add(word)
+                stats.accepted += 1
+
+                if category not in offsets:
+                    offsets[category] = array('Q')
+                    hardness[category] = []
+                offsets[category].append(position)
+                hardness[category].append(word_hardness)
+                position += len(line)
+                lines.append(line)
+            output.write(b"".join(lines))
+    os.replace(temporary_path, output_path)
+
+    if cache_path is not None:
+        categories = {}
+        for category, category_offsets in offsets.items():
+            category_hardness = hardness[category]
+            order = sorted(range(len(category_hardness)), key=lambda word_id: (-category_hardness[word_id], word_id))
+            categories[category] = CategoryIndex(category_offsets, array('I', order))
+        write_bank_cache(cache_path, source_digest(output_path), categories)
+    return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Builds a Hangman word bank from raw word lists.")
+    parser.add_argument("inputs", nargs="+", help="word list files ('-' for stdin)")
+    parser.add_argument("--output", required=True, help="path of the word bank to write")
+    parser.add_argument("--cache", help="path of the word bank index cache to write")
+    parser.add_argument("--category", choices=sorted(CATEGORIES),
+                        help="category of all the words, for lists of 'word<TAB>hint' lines")
+    parser.add_argument("--jobs", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="lines per worker task")
+    parser.add_argument("--min-length", type=int, default=MIN_WORD_LENGTH)
+    parser.add_argument("--max-length", type=int, default=MAX_WORD_LENGTH)
+    args = parser.parse_args(argv)
+
+    stats = build_word_bank(args.inputs, args.output, args.cache, args.category, args.jobs, args.chunk_size,
+                            args.min_length, args.max_length)
+    print(stats.report(), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
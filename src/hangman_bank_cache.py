@@ -0,0 +1,103 @@
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+CACHE_MAGIC = b"HMBANKIX"
+# Bump when the layout or the way the indexes are derived from the source (e.g. word scoring) changes.
+CACHE_VERSION = 2
+BYTE_ORDERS = ("little", "big")
+
+# magic, cache version, byte order code, offset item size, order item size, source digest, number of categories
+HEADER = struct.Struct('<8sHBBB3x32sI')
+# category name length in bytes, number of puzzles
+CATEGORY_HEADER = struct.Struct('<HI')
+
+
+@dataclass(frozen=True)
+class CategoryIndex:
+    """
+    Derived data of one word bank category: line offsets of its puzzles in the file
+    and puzzle indices ordered from the hardest to the easiest word (see DifficultyIndex).
+    """
+    offsets: array
+    order: array
+
+
+def source_digest(path: str | os.PathLike) -> bytes:
+    """
+    Returns the digest of the word bank file the cache is keyed by.
+    """
+    with open(path, 'rb') as file:
+        return hashlib.file_digest(file, lambda: hashlib.blake2b(digest_size=32)).digest()
+
+
+def write_bank_cache(path: str | os.PathLike, digest: bytes, categories: Mapping[str, CategoryIndex]) -> None:
+    """
+    Writes the indexes of a word bank to a cache file: a HEADER followed by a CATEGORY_HEADER, the UTF-8 name
+    and the raw offset and order arrays of every category. The file is replaced atomically.
+    """
+    chunks = []
+    offset_itemsize = array('Q').itemsize
+    order_itemsize = array('I').itemsize
+    chunks.append(HEADER.pack(CACHE_MAGIC, CACHE_VERSION, BYTE_ORDERS.index(sys.byteorder),
+                              offset_itemsize, order_itemsize, digest, len(categories)))
+    for name, index in categories.items():
+        if len(index.offsets) != len(index.order):
+            raise ValueError(f"Offsets and order of category {name} have different lengths")
+        encoded_name = name.encode('utf-8')
+        chunks += [CATEGORY_HEADER.pack(len(encoded_name), len(index.offsets)), encoded_name,
+                   index.offsets.tobytes(), index.order.tobytes()]
+
+    temporary_path = f"{os.fspath(path)}.tmp"
+    with open(temporary_path, 'wb') as file:
+        file.write(b''.join(chunks))
+    os.replace(temporary_path, path)
+
+
+def read_bank_cache(path: str | os.PathLike, digest: bytes) -> dict[str, CategoryIndex] | None:
+    """
+    Reads the indexes written by write_bank_cache.
+
+    Returns:
+        dict[str, CategoryIndex] | None: The indexes keyed by category, or None if there is no cache file,
+        it was built from another source, by another version, on a platform with other array layouts, or is damaged.
+    """
+    try:
+        with open(path, 'rb') as file:
+            data = memoryview(file.read())
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+
+    magic, version, byte_order, offset_itemsize, order_itemsize, cached_digest, category_count = \
+        HEADER.unpack_from(data)
+    if (magic != CACHE_MAGIC or version != CACHE_VERSION or cached_digest != digest
+            or byte_order >= len(BYTE_ORDERS) or BYTE_ORDERS[byte_order] != sys.byteorder
+            or offset_itemsize != array('Q').itemsize or order_itemsize != array('I').itemsize):
+        return None
+
+    categories = {}
+    pos = HEADER.size
+    try:
+        for _ in range(category_count):
+            name_size, puzzle_count = CATEGORY_HEADER.unpack_from(data, pos)
+            pos += CATEGORY_HEADER.size
+            name = bytes(data[pos:pos + name_size]).decode('utf-8')
+            pos += name_size
+            offsets = array('Q')
+            offsets.frombytes(data[pos:pos + puzzle_count * offset_itemsize])
+            pos += puzzle_count * offset_itemsize
+            order = array('I')
+            order.frombytes(data[pos:pos + puzzle_count * order_itemsize])
+            pos += puzzle_count * order_itemsize
+            if len(offsets) != puzzle_count or len(order) != puzzle_count:
+                return None
+            categories[name] = CategoryIndex(offsets, order)
+    except (struct.error, UnicodeDecodeError, ValueError):
+        return None
+    return categories if pos == len(data) else None
@@ -0,0 +1,110 @@
+import os
+import sys
+import threading
+from collections.abc import Callable
+
+from src.hangman_puzzle_generator import ReloadReport, reload_word_bank
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+def file_signature(path: str | os.PathLike) -> tuple[int, int, int] | None:
+    """
+    Returns what tells versions of a file apart (inode, size and modification time), or None if there is no file.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def format_report(path: str | os.PathLike, report: ReloadReport) -> str:
+    changed = ", ".join(report.changed_categories) or "none"
+    reused = ", ".join(report.reused_categories) or "none"
+    message = (f"Reloaded {os.fspath(path)} in {report.duration:.3f} s: rebuilt {changed}, reused {reused}; "
+               f"indexes take {report.index_bytes / 2 ** 20:.1f} MiB")
+    if report.removed_categories:
+        message += f"; removed {', '.join(report.removed_categories)}"
+    return message
+
+
+class WordBankWatcher:
+    """
+    Polls a word bank file loaded by load_word_bank and reloads it (see reload_word_bank) when it changes.
+
+    A change is taken only when the file looks the same on two polls in a row, so a file that is still being
+    written is not loaded. If the new version cannot be loaded, on_error is called and the previous bank stays
+    in use until the file changes again. start() runs the polls in a background thread.
+    """
+    def __init__(self, path: str | os.PathLike, cache_path: str | os.PathLike | None = None,
+                 interval: float = DEFAULT_POLL_INTERVAL,
+                 on_reload: Callable[[ReloadReport], None] | None = None,
+                 on_error: Callable[[Exception], None] | None = None):
+        self.path = os.fspath(path)
+        self.cache_path = cache_path
+        self.interval = interval
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self._loaded_signature = file_signature(self.path)
+        self._pending_signature = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self) -> ReloadReport | None:
+        """
+        Polls the file once and reloads it if it has changed and is stable.
+
+        Returns:
+            ReloadReport | None: The report of the reload, or None if the bank was not reloaded.
+        """
+        signature = file_signature(self.path)
+        if signature is None or signature == self._loaded_signature:
+            self._pending_signature = None
+            return None
+        if signature != self._pending_signature:
+            self._pending_signature = signature
+            return None
+
+        self._loaded_signature = signature
+        self._pending_signature = None
+        try:
+            report = reload_word_bank(self.path, self.cache_path)
+        except (OSError, ValueError) as error:
+            if self.on_error is not None:
+                self.on_error(error)
+            return None
+        if self.on_reload is not None:
+            self.on_reload(report)
+        return report
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, name="word-bank-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+
+def watch_word_bank(path: str | os.PathLike, cache_path: str | os.PathLike | None = None,
+                    interval: float = DEFAULT_POLL_INTERVAL) -> WordBankWatcher:
+    """
+    Starts a watcher that reports the reloads and the failed ones to stderr.
+    """
+    watcher = WordBankWatcher(
+        path, cache_path, interval,
+        on_reload=lambda report: print(format_report(path, report), file=sys.stderr),
+        on_error=lambda error: print(f"Cannot reload {os.fspath(path)}: {error}", file=sys.stderr),
+    )
+    watcher.start()
+    return watcher
@@ -0,0 +1,114 @@
+from collections.abc import Sequence
+
+from src.hangman_advisor import LetterBitsets
+from src.hangman_puzzle import HangmanPuzzle, Puzzle
+
+
+def partition_by_letter(candidates: int, bitsets: LetterBitsets, letter_ind: int) -> list[tuple[tuple[int, ...], int]]:
+    """
+    Splits a candidate bitset into families of words with the same positions of the letter.
+
+    The families are refined position by position: a family is split by the bitset of the words having the letter
+    at the position, so every step is a few bitwise operations over the whole family rather than a pass
+    over its words. Positions where no candidate has the letter are skipped.
+
+    Returns:
+        list[tuple[tuple[int, ...], int]]: Non-empty families: the positions of the letter and the bitset of the words.
+    """
+    families = [((), candidates)]
+    for pos, letter_bitsets in enumerate(bitsets.at):
+        letter_at_pos = letter_bitsets[letter_ind]
+        if not candidates & letter_at_pos:
+            continue
+        split = []
+        for positions, family in families:
+            with_letter = family & letter_at_pos
+            if with_letter:
+                split.append((positions + (pos,), with_letter))
+                if with_letter != family:
+                    split.append((positions, family ^ with_letter))
+            else:
+                split.append((positions, family))
+        families = split
+    return families
+
+
+class EvilHangmanPuzzle(HangmanPuzzle):
+    """
+    A puzzle that does not commit to a word. It keeps the set of dictionary words of the same length consistent
+    with the guesses and after every guess keeps the largest family of words sharing the positions of the letter
+    (preferring the family revealing fewer letters), so the player hits a letter only when most words have it.
+
+    The revealed letters and their positions are tracked as in HangmanPuzzle, so the game and the advisor
+    work with it unchanged. get_puzzle() returns a word consistent with the guesses so far; a snapshot stores it
+    and restore_guesses() rebuilds the candidates from it.
+    """
+    __slots__ = ('_puzzles', '_bitsets', '_candidates')
+
+    def __init__(self, puzzles: Sequence[Puzzle], bitsets: LetterBitsets):
+        """
+        Args:
+            puzzles (Sequence[Puzzle]): Puzzles of the category, addressed by bitsets.ids.
+            bitsets (LetterBitsets): Bitsets over the words of the category of the same length.
+        """
+        if not bitsets.words:
+            raise ValueError("An evil puzzle needs at least one word")
+        self._puzzles = puzzles
+        self._bitsets = bitsets
+        self._candidates = bitsets.all
+        super().__init__(self._candidate_puzzle(), bitsets.alphabet)
+        self._positions = [()] * len(bitsets.alphabet)
+        self._letters_mask = 0
+
+    def _candidate_puzzle(self) -> Puzzle:
+        word_ind = (self._candidates & -self._candidates).bit_length() - 1
+        return self._puzzles[self._bitsets.ids[word_ind]]
+
+    def process_letter(self, letter) -> tuple[bool, str]:
+        """
+        Processes the entered letter as HangmanPuzzle.process_letter does, choosing the hidden word family first.
+        """
+        letter_ind = self._indices[letter]
+        letter_bit = 1 << letter_ind
+        if self._guessed_mask & letter_bit:
+            return False, self.remind_about_asked_letter(letter)
+
+        self._guessed_mask |= letter_bit
+        families = partition_by_letter(self._candidates, self._bitsets, letter_ind)
+        positions, self._candidates = max(families, key=lambda family: (family[1].bit_count(), -len(family[0])))
+        self._puzzle = self._candidate_puzzle()
+        if not positions:
+            return True, ""
+        self._positions[letter_ind] = positions
+        self._letters_mask |= letter_bit
+        self.update_guessed_part(letter)
+        return False, "Hit!"
+
+    def restore_guesses(self, word: str, guessed_mask: int) -> None:
+        """
+        Restores the state after the letters of the bitmask were asked and the word was left among the candidates.
+
+        The candidates after a guess are the words with the letter exactly at the positions it was revealed at
+        (nowhere on a miss), and these positions are the same in every candidate, so the candidates are the words
+        having each asked letter exactly where the word has it, whatever order the letters were asked in.
+
+        Raises:
+            ValueError: If the word is not a candidate of the puzzle.
+        """
+        candidates = self._candidates
+        for letter_ind, letter in enumerate(self._alphabet.letters):
+            if guessed_mask >> letter_ind & 1 and not self._guessed_mask >> letter_ind & 1:
+                for pos, word_letter in enumerate(word):
+                    letter_at_pos = self._bitsets.at[pos][letter_ind]
+                    candidates &= letter_at_pos if word_letter == letter else ~letter_at_pos
+        if len(word) != len(self._bitsets.at) or not candidates:
+            raise ValueError(f"Word {word!r} is not a candidate of the puzzle")
+        # Every asked letter now splits the candidates into a single family, so asking it keeps all of them.
+        self._candidates = candidates
+        self.restore_guessed_mask(guessed_mask)
+
+    def get_candidate_count(self) -> int:
+        """
+        Returns the number of dictionary words consistent with the guesses.
+        """
+        return self._candidates.bit_count()
@@ -1,14 +1,64 @@
-import os
+import time
 from textwrap import dedent
-
-from src.hangman_puzzle import HangmanPuzzle
-from src.hangman_puzzle_generator import Category, gen_puzzle
+from typing import TYPE_CHECKING
+
+from src.hangman_advisor import LetterAdvisor
+from src.hangman_evil_puzzle import EvilHangmanPuzzle
+from src.hangman_keyboard import KEY_NAMES, Key, Keyboard, select_option
+from src.hangman_metrics import METRICS
+from src.hangman_puzzle import HangmanPuzzle, Puzzle
+from src.hangman_puzzle_generator import (CATEGORY_ALPHABETS, Category, gen_puzzle, get_advisor_index,
+                                          get_bank_state)
+from src.hangman_renderer import TerminalRenderer
+from src.hangman_result_store import GameResult, ResultStore
+from src.hangman_word_sampler import WordSampler
 from src.hangman_representation import HangmanRepresentation, DIFFICULTY_LEVELS, MAX_DIFFICULTY
 from enum import StrEnum
 
+if TYPE_CHECKING:
+    from src.hangman_journal import GameJournal
+    from src.hangman_leaderboard import Leaderboard
+
+ALPHABET_TITLES = list(dict.fromkeys(alphabet.title for alphabet in CATEGORY_ALPHABETS.values()))
+
+
+def category_prompt() -> str:
+    return dedent(f"""
+        Please, choose hidden word category.
+        Available categories: {", ".join(list(Category))}. 
+        To choose random category, print "random".
+        """)
+
+
+def parse_category(text: str) -> Category | None:
+    """
+    Returns the category named in the text (or Category.RANDOM_FLAG), or None if the text is not a category.
+    """
+    try:
+        return Category(text.strip().lower())
+    except ValueError:
+        return None
+
 
-def clear_console() -> None:
-    os.system('cls' if os.name == 'nt' else 'clear')
+def difficulty_prompt() -> str:
+    message = dedent(f"""
+        Please, choose difficulty.
+        Enter X - integer number from 1 to {MAX_DIFFICULTY}.\n
+        To choose random difficulty, print "random".\n
+        """)
+    return message + HangmanRepresentation.report_difficulty_levels()
+
+
+def parse_difficulty(text: str) -> int | str | None:
+    """
+    Returns the difficulty level given in the text (or Category.RANDOM_FLAG), or None if the text is invalid.
+    """
+    difficulty = text.strip().lower()
+    if difficulty == Category.RANDOM_FLAG:
+        return difficulty
+    if difficulty.isdigit() and 1 <= int(difficulty) <= MAX_DIFFICULTY:
+        return int(difficulty)
+    return None
 
 
 def set_category() -> Category:
@@ -18,20 +68,13 @@ def set_category() -> Category:
     Returns:
         Category: Returns the user-selected category or Category.RANDOM_FLAG for a random category.
     """
-    message = dedent(f"""
-        Please, choose hidden word category.
-        Available categories: {", ".join(list(Category))}. 
-        To choose random category, print "random".
-        """)
-    print(message)
+    print(category_prompt())
 
     while True:
-        category = input().lower()
-        try:
-            category = Category(category)
+        category = parse_category(input())
+        if category is not None:
             break
-        except ValueError:
-            print("ERROR! INVALID INPUT")
+        print("ERROR! INVALID INPUT")
 
     print("ACCEPTED\n")
     return category
@@ -44,24 +87,13 @@ def set_difficulty() -> int | str:
     Returns:
         int | str: Returns the selected difficulty level or "random" for random selection.
     """
-    message = dedent(f"""
-        Please, choose difficulty.
-        Enter X - integer number from 1 to {MAX_DIFFICULTY}.\n
-        To choose random difficulty, print "random".\n
-        """)
-    message += HangmanRepresentation.report_difficulty_levels()
-    print(message)
+    print(difficulty_prompt())
 
     while True:
-        difficulty = input().lower()
-        if (difficulty.isdigit() and 1 <= int(difficulty) <= MAX_DIFFICULTY) or \
-                difficulty == Category.RANDOM_FLAG:
+        difficulty = parse_difficulty(input())
+        if difficulty is not None:
             break
-        else:
-            print("ERROR! INVALID INPUT.\n")
-
-    if difficulty != Category.RANDOM_FLAG:
-        difficulty = int(difficulty)
+        print("ERROR! INVALID INPUT.\n")
 
     print("ACCEPTED\n")
     return difficulty
@@ -71,11 +103,55 @@ class SpecialCommand(StrEnum):
     """
     After selecting the category and difficulty of the puzzle, player can enter commands from the list below
     instead of the next letter to quit the game (STOP_WORD) or to get a clue (HELP_WORD).
+    The first clue is the puzzle hint, the next ones recommend a letter to guess.
     """
     STOP_WORD = "quit"
     HELP_WORD = "help"
 
 
+# In the single-keystroke mode the special commands are bound to keys.
+KEY_COMMANDS = {Key.ESCAPE: SpecialCommand.STOP_WORD, Key.EOF: SpecialCommand.STOP_WORD, "?": SpecialCommand.HELP_WORD}
+KEY_PROMPT = "Press a letter ('?' for a clue, Esc to quit):"
+
+
+def select_category(keyboard: Keyboard, renderer: TerminalRenderer) -> Category:
+    """
+    Asks user to select a category in an arrow-key menu.
+    """
+    categories = list(Category)
+    return categories[select_option(keyboard, renderer, "Please, choose hidden word category.", categories)]
+
+
+def select_difficulty(keyboard: Keyboard, renderer: TerminalRenderer) -> int | str:
+    """
+    Asks user to select puzzle difficulty in an arrow-key menu.
+    """
+    options = [f"{level} mistakes" for level in DIFFICULTY_LEVELS] + [Category.RANDOM_FLAG]
+    selected = select_option(keyboard, renderer, "Please, choose difficulty.", options)
+    return selected + 1 if selected < MAX_DIFFICULTY else Category.RANDOM_FLAG
+
+
+class GameEvent(StrEnum):
+    """
+    Events reported by the I/O-free game core (HangmanGame.process_guess) and by HangmanSession.
+    """
+    CATEGORY_SET = "category_set"
+    DIFFICULTY_SET = "difficulty_set"
+    GAME_STARTED = "game_started"
+    HIT = "hit"
+    MISS = "miss"
+    REPEAT = "repeat"
+    HINT = "hint"
+    INVALID_INPUT = "invalid_input"
+    QUIT = "quit"
+    WON = "won"
+    LOST = "lost"
+
+
+# The events that change the saved state of the game (see hangman_snapshot).
+JOURNALED_EVENTS = frozenset({GameEvent.HIT, GameEvent.MISS, GameEvent.HINT})
+
+
 def report_game_parameters_and_info(category: Category, difficulty: int) -> str:
     """
     Returns a string with information about the game parameters: the selected category, difficulty, and rules.
@@ -93,57 +169,173 @@ class HangmanGame:
     """
     A class representing the "Hangman" game.
     It contains logic for initialization, playing and summarizing the game.
+
+    start_game, process_guess and finish_game do no I/O, so the game can be driven by other front ends
+    (see HangmanSession); play_game runs it in the console.
     """
-    def __init__(self):
+    def __init__(self, renderer: TerminalRenderer | None = None, result_store: ResultStore | None = None,
+                 player: str = "anonymous", sampler: WordSampler | None = None, evil: bool = False,
+                 journal: "GameJournal | None" = None, session_id: int = 0, keyboard: Keyboard | None = None,
+                 leaderboard: "Leaderboard | None" = None):
+        self.player = player
+        self.leaderboard = leaderboard
+        # With a keyboard in raw mode, every keypress is a move and the menus are chosen with the arrows.
+        self.keyboard = keyboard
+        # The journal records the game under the session id, so it can be recovered after a crash.
+        self.journal = journal
+        self.session_id = session_id
+        self.sampler = sampler if sampler is not None else WordSampler()
+        # In the evil mode the puzzles do not commit to a word (see EvilHangmanPuzzle).
+        self.evil = evil
+        self.result_store = result_store
+        self.guesses = None
+        self.started_at = None
+        self.category = None
+        self.difficulty = None
         self.current_score = None
         self.max_mistakes = None
         self.mistakes = None
         self.hangman_puzzle = None
+        # The word bank state the puzzle was taken from (see hangman_snapshot).
+        self.bank_state = None
         self.hangman_representation = None
+        self.advisor = None
+        self.hints_given = None
+        self.renderer = renderer if renderer is not None else TerminalRenderer()
         self.reset_game()
 
     def reset_game(self) -> None:
+        self.guesses = []
+        self.started_at = time.monotonic()
+        self.category = None
+        self.difficulty = None
         self.hangman_puzzle = HangmanPuzzle
+        self.bank_state = None
         self.mistakes = 0
         self.max_mistakes = 0
         self.current_score = 0
         self.hangman_representation = HangmanRepresentation()
+        self.advisor = None
+        self.hints_given = 0
+        self.renderer.reset()
 
     def play_game(self) -> None:
         """
         Basic game logic. The player enters letters to guess the word,
         or they use special commands to get a clue or quit the game.
         """
-        difficulty = self.init_game()
-
-        while self.mistakes < self.max_mistakes and not self.hangman_puzzle.get_is_guessed():
-            print(dedent(f"""\
-                The word: {''.join(self.hangman_puzzle.get_guessed_part())}
-                Guess a letter:
-                """))
+        self.difficulty = self.init_game()
+        self.play_turns()
 
-            guess_string = input().lower().strip()
-            clear_console()
-
-            if guess_string == SpecialCommand.STOP_WORD:
+    def play_turns(self) -> None:
+        """
+        Plays the started (or resumed) game until it is over or the player quits.
+        """
+        message = ""
+        prompt = KEY_PROMPT if self.is_raw_input() else "Guess a letter:"
+        while not self.is_over():
+            with METRICS.span("turn.render"):
+                self.render_screen(message, prompt=prompt)
+
+            with METRICS.span("turn.input_wait"):
+                guess_string = self.read_guess()
+            with METRICS.span("turn.process_guess"):
+                event, message = self.process_guess(guess_string)
+            METRICS.count(f"events.{event}")
+            if event == GameEvent.QUIT:
                 self.sum_up_the_game()
                 return
 
-            if guess_string == SpecialCommand.HELP_WORD:
-                message = f"{self.hangman_puzzle.get_puzzle().get_hint()}\n"
-            elif len(guess_string) == 1 and guess_string.isalpha():
-                got_mistake, message = self.hangman_puzzle.process_letter(guess_string)
-                if got_mistake:
-                    self.mistakes += 1
-                    message += f"Missed, mistake {self.mistakes} out of {self.max_mistakes}."
-                    self.hangman_representation.update_hangman_parts(self.mistakes, difficulty)
-                    self.hangman_representation.display()
-            else:
-                message = "Please, enter a single Latin letter.\n"
-            print(message)
-
+        self.render_screen(message)
         self.sum_up_the_game()
 
+    def is_raw_input(self) -> bool:
+        return self.keyboard is not None and self.keyboard.is_raw()
+
+    def read_guess(self) -> str:
+        """
+        Reads the next move: a line in the line mode, a key (special keys mapped to KEY_COMMANDS) in the raw mode.
+        """
+        if not self.is_raw_input():
+            return input()
+        while True:
+            key = self.keyboard.read_key()
+            guess = KEY_COMMANDS.get(key, key)
+            if guess not in KEY_NAMES:
+                return guess
+
+    def is_over(self) -> bool:
+        return self.mistakes >= self.max_mistakes or self.hangman_puzzle.get_is_guessed()
+
+    def process_guess(self, guess_string: str) -> tuple[GameEvent, str]:
+        """
+        Processes a line entered by the player: a letter or a special command.
+
+        Returns:
+            tuple[GameEvent, str]: What happened and the message for the player.
+        """
+        event, message = self._process_guess(guess_string)
+        if self.journal is not None and event in JOURNALED_EVENTS:
+            self.journal.log_guess(self.session_id, self)
+        return event, message
+
+    def _process_guess(self, guess_string: str) -> tuple[GameEvent, str]:
+        guess_string = guess_string.lower().strip()
+
+        if guess_string == SpecialCommand.STOP_WORD:
+            return GameEvent.QUIT, ""
+
+        if guess_string == SpecialCommand.HELP_WORD:
+            return GameEvent.HINT, self.give_hint()
+
+        alphabet = self.hangman_puzzle.get_alphabet()
+        if len(guess_string) != 1 or guess_string not in alphabet:
+            return GameEvent.INVALID_INPUT, f"Please, enter a single {alphabet.title} letter.\n"
+
+        self.guesses.append(guess_string)
+        is_repeated = self.hangman_puzzle.is_letter_asked(guess_string)
+        got_mistake, message = self.hangman_puzzle.process_letter(guess_string)
+        if self.advisor is not None:
+            self.advisor.observe(guess_string, self.hangman_puzzle.get_letter_positions(guess_string))
+        if not got_mistake:
+            return (GameEvent.REPEAT if is_repeated else GameEvent.HIT), message
+
+        self.mistakes += 1
+        message += f"Missed, mistake {self.mistakes} out of {self.max_mistakes}."
+        self.hangman_representation.update_hangman_parts(self.mistakes, self.difficulty)
+        return GameEvent.MISS, message
+
+    def give_hint(self) -> str:
+        """
+        Returns the puzzle hint on the first request, and a recommended letter on the next ones.
+        In the evil mode only letters are recommended: the hint of the current candidate word
+        would describe a word the puzzle may switch away from.
+        """
+        self.hints_given += 1
+        if self.hints_given == 1 and not self.evil:
+            return f"{self.hangman_puzzle.get_puzzle().get_hint()}\n"
+
+        if self.advisor is None:
+            self.advisor = self._build_advisor()
+        suggestion = self.advisor.suggest()
+        if suggestion is None:
+            return "No more clues, sorry!\n"
+        letter, count = suggestion
+        return f"Try the letter '{letter}': {count} of {self.advisor.count_candidates()} words that fit contain it.\n"
+
+    def render_screen(self, message: str, prompt: str = "") -> None:
+        """
+        Redraws the game screen: the rules of the round, the hangman picture, the guessed part of the word,
+        the result of the last move and the input prompt.
+        """
+        self.renderer.render(
+            header=report_game_parameters_and_info(self.category, self.difficulty) + "\n",
+            picture=self.hangman_representation.hangman_picture,
+            word=f"The word: {''.join(self.hangman_puzzle.get_guessed_part())}",
+            message=message,
+            prompt=prompt,
+        )
+
     def init_game(self) -> int:
         """
         Initializes a new game: asks the user for the category and difficulty level,
@@ -155,36 +347,126 @@ class HangmanGame:
         self.reset_game()
         print(self.report_game_intro())
 
-        category = set_category()
-        difficulty = set_difficulty()
-        category, difficulty, self.hangman_puzzle = gen_puzzle(category, difficulty)
+        if self.is_raw_input():
+            category = select_category(self.keyboard, self.renderer)
+            difficulty = select_difficulty(self.keyboard, self.renderer)
+            self.renderer.reset()
+        else:
+            category = set_category()
+            difficulty = set_difficulty()
+        category, difficulty = self.start_game(category, difficulty)
+        return difficulty
+
+    def start_game(self, category: Category, difficulty: int | str) -> tuple[Category, int]:
+        """
+        Generates a puzzle of the given category and difficulty (each may be Category.RANDOM_FLAG)
+        and sets the number of acceptable errors.
+
+        Returns:
+            tuple[Category, int]: The category and the difficulty level of the generated puzzle.
+        """
+        category, difficulty, hangman_puzzle = gen_puzzle(category, difficulty, sampler=self.sampler, evil=self.evil)
+        self._set_puzzle(category, difficulty, hangman_puzzle)
+        self.started_at = time.monotonic()
+        if self.journal is not None:
+            self.journal.log_start(self.session_id, self)
+        return self.category, self.difficulty
+
+    def resume_game(self, category: Category, difficulty: int, puzzle: Puzzle, guessed_mask: int,
+                    mistakes: int, current_score: int = 0, hints_given: int = 0, evil: bool = False) -> None:
+        """
+        Restores a game in progress from its saved state (see hangman_snapshot).
+        In the evil mode the puzzle is a word left among the candidates of the evil puzzle.
+        """
+        self.reset_game()
+        self.evil = evil
+        if evil:
+            state = get_bank_state()
+            bitsets = state.advisor_index.bitsets(category, len(puzzle.get_word()))
+            hangman_puzzle = EvilHangmanPuzzle(state.word_bank[category], bitsets)
+            hangman_puzzle.restore_guesses(puzzle.get_word(), guessed_mask)
+        else:
+            hangman_puzzle = HangmanPuzzle(puzzle, Category(category).alphabet)
+            hangman_puzzle.restore_guessed_mask(guessed_mask)
+        self._set_puzzle(category, difficulty, hangman_puzzle)
+
+        self.mistakes = mistakes
+        self.current_score = current_score
+        self.hints_given = hints_given
+        if mistakes:
+            self.hangman_representation.update_hangman_parts(mistakes, difficulty)
+
+    def _set_puzzle(self, category: Category, difficulty: int, hangman_puzzle: HangmanPuzzle) -> None:
+        self.category = category
+        self.difficulty = difficulty
+        self.hangman_puzzle = hangman_puzzle
+        self.bank_state = get_bank_state()
         self.max_mistakes = DIFFICULTY_LEVELS[difficulty - 1]
+        self.advisor = None
 
-        print(report_game_parameters_and_info(category, difficulty))
-        return difficulty
+    def _build_advisor(self) -> LetterAdvisor:
+        """
+        Builds the advisor on the first letter recommendation, as most games never ask for one,
+        and lets it observe the letters guessed so far.
+        """
+        word_length = len(self.hangman_puzzle.get_puzzle().get_word())
+        advisor = LetterAdvisor(get_advisor_index().bitsets(self.category, word_length))
+        guessed_mask = self.hangman_puzzle.get_guessed_mask()
+        for letter_ind, letter in enumerate(self.hangman_puzzle.get_alphabet()):
+            if guessed_mask >> letter_ind & 1:
+                advisor.observe(letter, self.hangman_puzzle.get_letter_positions(letter))
+        return advisor
 
     @staticmethod
     def report_game_intro() -> str:
-        return dedent("""\
+        return dedent(f"""\
             Welcome to Hangman game!
             Your goal is to guess the hidden word.
-            The hidden word consists of small Latin letters.
+            The hidden word consists of small {' or '.join(ALPHABET_TITLES)} letters, depending on the category.
             """)
 
     def sum_up_the_game(self) -> None:
         """
         Displays a message about victory or defeat, shows the hidden word and the final score.
         """
+        print(self.finish_game())
+
+    def finish_game(self) -> str:
+        """
+        Adds the points for the game to the score, records the result if there is a result store,
+        and returns the final message.
+        """
         message = ""
-        if self.hangman_puzzle.get_is_guessed():
+        is_guessed = self.hangman_puzzle.get_is_guessed()
+        if is_guessed:
             message += "You won!\n"
             self.current_score += 1 << (DIFFICULTY_LEVELS[0] - self.mistakes)
         else:
             message += "You lost!\n"
 
-        message += dedent(f"""\
-            The hidden word is {self.hangman_puzzle.get_puzzle().get_word()}.
-            Final score is {self.current_score}.
-            """).strip()
-
-        print(message)
+        if self.result_store is not None:
+            self.result_store.record(GameResult(
+                player=self.player,
+                category=str(self.category),
+                word=self.hangman_puzzle.get_puzzle().get_word(),
+                difficulty=self.difficulty,
+                mistakes=self.mistakes,
+                score=self.current_score,
+                won=is_guessed,
+                duration=time.monotonic() - self.started_at,
+                guesses="".join(self.guesses),
+                finished_at=time.time(),
+            ))
+
+        if self.journal is not None:
+            self.journal.log_end(self.session_id)
+        if self.leaderboard is not None:
+            self.leaderboard.record(self.player, self.category, self.difficulty, self.current_score)
+
+        message += (f"The hidden word is {self.hangman_puzzle.get_puzzle().get_word()}.\n"
+                    f"Final score is {self.current_score}.")
+        if self.leaderboard is not None:
+            entry = self.leaderboard.rank(self.player)
+            message += f"\nTotal score is {entry.score}, rank {entry.rank} of {self.leaderboard.size()}."
+
+        return message
@@ -0,0 +1,334 @@
+import argparse
+import os
+import struct
+import threading
+import time
+import zlib
+from enum import IntEnum
+
+from src.hangman_game import HangmanGame
+from src.hangman_metrics import METRICS
+from src.hangman_puzzle_generator import load_word_bank
+from src.hangman_snapshot import GAME_RECORD, SESSION_RECORD, dump_games, restore_game
+
+JOURNAL_MAGIC = b"HMJOURNL"
+JOURNAL_VERSION = 1
+SEGMENT_SUFFIX = ".journal"
+DEFAULT_SEGMENT_SIZE = 16 << 20
+DEFAULT_COMMIT_INTERVAL = 0.01
+# A compacted segment holds the state of every game in progress and supersedes the segments before it.
+COMPACTED_FLAG = 1
+
+# magic, journal version, flags, padding
+SEGMENT_HEADER = struct.Struct('<8sHB5x')
+# CRC-32 of the record type and payload, record type
+RECORD_HEADER = struct.Struct('<IB')
+SESSION_ID = struct.Struct('<Q')
+
+
+class RecordType(IntEnum):
+    START = 1
+    GUESS = 2
+    END = 3
+
+
+# START and GUESS records hold the state of the game after the event (see hangman_snapshot), END only the session id.
+PAYLOAD_SIZES = {RecordType.START: SESSION_RECORD.size, RecordType.GUESS: SESSION_RECORD.size,
+                 RecordType.END: SESSION_ID.size}
+
+
+def encode_record(record_type: RecordType, payload: bytes) -> bytes:
+    type_and_payload = bytes((record_type,)) + payload
+    return struct.pack('<I', zlib.crc32(type_and_payload)) + type_and_payload
+
+
+def _segment_path(directory: str, sequence: int) -> str:
+    return os.path.join(directory, f"{sequence:016d}{SEGMENT_SUFFIX}")
+
+
+def list_segments(directory: str | os.PathLike) -> list[tuple[int, str]]:
+    """
+    Returns the sequence numbers and paths of the journal segments in the directory, oldest first.
+    """
+    directory = os.fspath(directory)
+    segments = []
+    for name in os.listdir(directory):
+        stem, suffix = os.path.splitext(name)
+        if suffix == SEGMENT_SUFFIX and stem.isdigit():
+            segments.append((int(stem), os.path.join(directory, name)))
+    return sorted(segments)
+
+
+def _is_compacted(path: str) -> bool:
+    with open(path, 'rb') as file:
+        header = file.read(SEGMENT_HEADER.size)
+    return len(header) == SEGMENT_HEADER.size and bool(SEGMENT_HEADER.unpack(header)[2] & COMPACTED_FLAG)
+
+
+def _read_segment(path: str, games: dict[int, memoryview]) -> None:
+    """
+    Applies the records of a segment to the states of the games in progress, keyed by session id.
+    Reading stops at the first torn or damaged record: the records after it were never acknowledged as committed.
+    """
+    with open(path, 'rb') as file:
+        data = memoryview(file.read())
+    if len(data) < SEGMENT_HEADER.size:
+        return
+    magic, version, _ = SEGMENT_HEADER.unpack_from(data)
+    if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+        raise ValueError(f"{path} is not a version {JOURNAL_VERSION} game journal segment")
+
+    pos = SEGMENT_HEADER.size
+    end = len(data)
+    while pos + RECORD_HEADER.size <= end:
+        crc, record_type = RECORD_HEADER.unpack_from(data, pos)
+        payload_size = PAYLOAD_SIZES.get(record_type)
+        if payload_size is None:
+            break
+        payload_end = pos + RECORD_HEADER.size + payload_size
+        if payload_end > end or zlib.crc32(data[pos + 4:payload_end]) != crc:
+            break
+        session_id, = SESSION_ID.unpack_from(data, pos + RECORD_HEADER.size)
+        if record_type == RecordType.END:
+            games.pop(session_id, None)
+        else:
+            games[session_id] = data[payload_end - GAME_RECORD.size:payload_end]
+        pos = payload_end
+
+
+def read_segments(segments: list[tuple[int, str]]) -> dict[int, bytes]:
+    """
+    Replays the given journal segments, skipping the ones before the last compacted segment.
+
+    Returns:
+        dict[int, bytes]: The last state of every game in progress as a snapshot record (see restore_game),
+        keyed by session id.
+    """
+    for ind in range(len(segments) - 1, -1, -1):
+        if _is_compacted(segments[ind][1]):
+            segments = segments[ind:]
+            break
+    games = {}
+    for _, path in segments:
+        _read_segment(path, games)
+    return {session_id: bytes(record) for session_id, record in games.items()}
+
+
+def read_journal(directory: str | os.PathLike) -> dict[int, bytes]:
+    """
+    Replays the journal segments in the directory (see read_segments).
+    """
+    return read_segments(list_segments(directory))
+
+
+def _fsync_directory(directory: str) -> None:
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class GameJournal:
+    """
+    Append-only log of the starts, guesses and ends of games, to rebuild the games in progress after a crash.
+
+    The records are appended to a buffer; a background thread writes the buffer and fsyncs the file
+    once per commit_interval seconds, so all the records appended in between share one fsync (group commit).
+    With durable set, the log calls wait until their record is on disk, otherwise up to commit_interval seconds
+    of the latest records are lost on a crash. The journal is a directory of segments: a new one is started
+    when the current one grows over segment_size bytes, and on every start, so a torn tail is never appended to.
+    compact() folds the finished games out of the closed segments.
+
+    If the writer fails, it stops and keeps the error; the next log call, flush() or close() raises RuntimeError.
+    """
+    def __init__(self, directory: str | os.PathLike, commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+                 durable: bool = False, segment_size: int = DEFAULT_SEGMENT_SIZE):
+        self.directory = os.fspath(directory)
+        self.commit_interval = commit_interval
+        self.durable = durable
+        self.segment_size = segment_size
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._condition = threading.Condition()
+        self._buffer = bytearray()
+        self._appended = 0
+        self._committed = 0
+        self._closing = False
+        self.error: Exception | None = None
+        self._io_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        segments = list_segments(self.directory)
+        self._sequence = segments[-1][0] if segments else 0
+        self._file = None
+        self._open_segment()
+
+        self._writer = threading.Thread(target=self._commit_batches, name="game-journal-writer", daemon=True)
+        self._writer.start()
+
+    def _open_segment(self) -> None:
+        self._sequence += 1
+        self._file = open(_segment_path(self.directory, self._sequence), 'wb')
+        self._file.write(SEGMENT_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, 0))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        _fsync_directory(self.directory)
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._open_segment()
+
+    def _append(self, record: bytes) -> None:
+        with self._condition:
+            if self._closing:
+                raise RuntimeError("The journal is closed.")
+            self._raise_if_failed()
+            self._buffer += record
+            self._appended += 1
+            sequence = self._appended
+            self._condition.notify_all()
+            if self.durable:
+                while self._committed < sequence and self.error is None:
+                    self._condition.wait()
+                self._raise_if_failed()
+
+    def log_start(self, session_id: int, game: HangmanGame) -> None:
+        self._append(encode_record(RecordType.START, dump_games({session_id: game})))
+
+    def log_guess(self, session_id: int, game: HangmanGame) -> None:
+        self._append(encode_record(RecordType.GUESS, dump_games({session_id: game})))
+
+    def log_end(self, session_id: int) -> None:
+        self._append(encode_record(RecordType.END, SESSION_ID.pack(session_id)))
+
+    def flush(self) -> None:
+        """
+        Waits until every appended record is on disk.
+        """
+        with self._condition:
+            sequence = self._appended
+            self._condition.notify_all()
+            while self._committed < sequence and self._writer.is_alive() and self.error is None:
+                self._condition.wait()
+            self._raise_if_failed()
+
+    def _raise_if_failed(self) -> None:
+        if self.error is not None:
+            raise RuntimeError(f"Cannot write the game journal to {self.directory}") from self.error
+
+    def _commit_batches(self) -> None:
+        while True:
+            with self._condition:
+                while not self._buffer and not self._closing:
+                    self._condition.wait()
+                if not self._buffer:
+                    break
+            if self.commit_interval > 0 and not self._closing:
+                time.sleep(self.commit_interval)
+
+            with self._condition:
+                batch, self._buffer = self._buffer, bytearray()
+                sequence = self._appended
+            try:
+                with METRICS.span("journal.commit"), self._io_lock:
+                    if self._file.tell() >= self.segment_size:
+                        self._rotate()
+                    self._file.write(batch)
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+            except Exception as error:
+                # A batch may be partly written, so nothing appended after it could be read back.
+                with self._condition:
+                    self.error = error
+                    self._condition.notify_all()
+                return
+            with self._condition:
+                self._committed = sequence
+                self._condition.notify_all()
+
+    def recover(self) -> dict[int, HangmanGame]:
+        """
+        Rebuilds the games in progress from the journal, keyed by session id. The games are restored
+        from their word ids (see hangman_snapshot), so the same word bank must be loaded.
+
+        Raises:
+            ValueError: If the puzzles of a game's category changed since it was logged.
+        """
+        return {session_id: restore_game(record) for session_id, record in self.recover_records().items()}
+
+    def recover_records(self) -> dict[int, bytes]:
+        """
+        Returns the last state of every game in progress as a snapshot record, keyed by session id.
+        """
+        self.flush()
+        return read_journal(self.directory)
+
+    def compact(self) -> None:
+        """
+        Replaces the closed segments with one compacted segment holding the state of the games in progress.
+        The games are logged to a new segment meanwhile, so compaction does not stop them.
+        """
+        with self._compact_lock:
+            with self._io_lock:
+                self._rotate()
+                active_sequence = self._sequence
+            segments = [segment for segment in list_segments(self.directory) if segment[0] < active_sequence]
+            if not segments:
+                return
+
+            games = read_segments(segments)
+            records = [SEGMENT_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, COMPACTED_FLAG)]
+            records += [encode_record(RecordType.START, SESSION_ID.pack(session_id) + record)
+                        for session_id, record in games.items()]
+            last_sequence, last_path = segments[-1]
+            temporary_path = f"{last_path}.tmp"
+            with open(temporary_path, 'wb') as file:
+                file.write(b''.join(records))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, last_path)
+            _fsync_directory(self.directory)
+            for _, path in segments[:-1]:
+                os.remove(path)
+
+    def close(self) -> None:
+        """
+        Commits the appended records and stops the writer.
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._writer.join()
+        with self._io_lock:
+            self._file.close()
+        self._raise_if_failed()
+
+    def __enter__(self) -> "GameJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Inspects and compacts a Hangman game journal.")
+    parser.add_argument("directory", help="journal directory")
+    parser.add_argument("--word-bank", help="path to the word bank the games were played with")
+    parser.add_argument("--compact", action="store_true", help="drop the finished games from the journal")
+    args = parser.parse_args(argv)
+
+    if args.word_bank:
+        load_word_bank(args.word_bank)
+    started = time.perf_counter()
+    with GameJournal(args.directory) as journal:
+        games = journal.recover()
+        print(f"{len(games)} games in progress, replayed in {time.perf_counter() - started:.3f} s")
+        if args.compact:
+            journal.compact()
+            print(f"Compacted into {len(list_segments(args.directory))} segments")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+import atexit
+import codecs
+import os
+import select
+import signal
+import sys
+import threading
+from collections import deque
+from collections.abc import Sequence
+from enum import StrEnum
+from typing import TextIO
+
+try:
+    import termios
+    import tty
+except ImportError:
+    termios = None
+
+from src.hangman_renderer import TerminalRenderer
+
+ESCAPE = "\x1b"
+READ_SIZE = 64
+# How long to wait for the rest of an escape sequence before taking ESC for the Escape key, in seconds.
+ESCAPE_TIMEOUT = 0.1
+# Signals that terminate the process without unwinding the stack, so they are turned into SystemExit.
+TERMINATING_SIGNALS = tuple(getattr(signal, name) for name in ("SIGTERM", "SIGHUP") if hasattr(signal, name))
+
+
+class Key(StrEnum):
+    """
+    Names of the non-character keys returned by Keyboard.read_key.
+    """
+    UP = "<up>"
+    DOWN = "<down>"
+    LEFT = "<left>"
+    RIGHT = "<right>"
+    ENTER = "<enter>"
+    ESCAPE = "<escape>"
+    BACKSPACE = "<backspace>"
+    EOF = "<eof>"
+
+
+KEY_NAMES = frozenset(Key)
+_ARROWS = {"A": Key.UP, "B": Key.DOWN, "C": Key.RIGHT, "D": Key.LEFT}
+_CONTROL_KEYS = {"\r": Key.ENTER, "\n": Key.ENTER, "\x7f": Key.BACKSPACE, "\b": Key.BACKSPACE, "\x04": Key.EOF}
+
+
+def split_keys(text: str) -> tuple[list[str], str]:
+    """
+    Splits the text into keys as parse_keys does, except for an escape sequence cut off at the end of the text:
+    it is returned unparsed, to be completed by the text read next.
+
+    Returns:
+        tuple[list[str], str]: The keys and the unfinished escape sequence ("" if there is none).
+    """
+    keys = []
+    pos = 0
+    while pos < len(text):
+        char = text[pos]
+        pos += 1
+        if char != ESCAPE:
+            keys.append(_CONTROL_KEYS.get(char, char))
+        elif pos == len(text):
+            return keys, ESCAPE
+        elif text[pos] not in "[O":
+            keys.append(Key.ESCAPE)
+        else:
+            # A control sequence ends with a character from "@" to "~".
+            end = pos + 1
+            while end < len(text) and not "@" <= text[end] <= "~":
+                end += 1
+            if end == len(text):
+                return keys, text[pos - 1:]
+            if text[end] in _ARROWS:
+                keys.append(_ARROWS[text[end]])
+            pos = end + 1
+    return keys, ""
+
+
+def finish_keys(unfinished: str) -> list[str]:
+    """
+    Returns the keys of an escape sequence that was not completed in time: a lone ESC is the Escape key,
+    and a cut off control sequence is dropped.
+    """
+    return [Key.ESCAPE] if unfinished == ESCAPE else []
+
+
+def parse_keys(text: str) -> list[str]:
+    """
+    Splits the text read from a terminal in cbreak mode into keys: characters and Key names.
+    Arrows come as the escape sequences ESC [ A..D or ESC O A..D; other escape sequences are dropped,
+    and a lone ESC is the Escape key.
+    """
+    keys, unfinished = split_keys(text)
+    return keys + finish_keys(unfinished)
+
+
+class Keyboard:
+    """
+    Reads the keys pressed on a terminal one by one, without waiting for Enter.
+
+    Within the with block (or after enable()) the terminal is in cbreak mode (no line buffering and no echo,
+    but Ctrl+C still interrupts); it is restored when the block exits, by an exception too, on SIGTERM and SIGHUP,
+    and at exit.
+    If the input is not a terminal (or there is no termios), the mode is not changed and is_raw() is False,
+    so the caller falls back to reading lines.
+    """
+    def __init__(self, stream: TextIO | None = None):
+        self._stream = stream
+        self._fd = None
+        self._saved_attributes = None
+        self._saved_handlers = {}
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._keys = deque()
+        # The start of an escape sequence whose end has not been read yet.
+        self._unfinished = ""
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdin
+
+    def is_raw(self) -> bool:
+        return self._saved_attributes is not None
+
+    def __enter__(self) -> "Keyboard":
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.restore()
+
+    def enable(self) -> None:
+        """
+        Switches the terminal to cbreak mode if the input is a terminal.
+        """
+        isatty = getattr(self.stream, "isatty", None)
+        if self.is_raw() or termios is None or not (isatty and isatty()):
+            return
+        self._fd = self.stream.fileno()
+        self._saved_attributes = termios.tcgetattr(self._fd)
+        atexit.register(self.restore)
+        if threading.current_thread() is threading.main_thread():
+            for signal_number in TERMINATING_SIGNALS:
+                self._saved_handlers[signal_number] = signal.signal(signal_number, _exit_on_signal)
+        tty.setcbreak(self._fd)
+
+    def restore(self) -> None:
+        """
+        Restores the terminal mode saved by enable().
+        """
+        if self._saved_attributes is None:
+            return
+        termios.tcsetattr(self._fd, termios.TCSAFLUSH, self._saved_attributes)
+        self._saved_attributes = None
+        for signal_number, handler in self._saved_handlers.items():
+            signal.signal(signal_number, handler)
+        self._saved_handlers.clear()
+        atexit.unregister(self.restore)
+
+    def read_key(self) -> str:
+        """
+        Waits for the next key in raw mode: a character or a Key name. Returns Key.EOF when the input is closed.
+        An escape sequence may come in several reads (over ssh, for one), so ESC is the Escape key only
+        if nothing completing it arrives within ESCAPE_TIMEOUT seconds.
+        """
+        while not self._keys:
+            if self._unfinished and not select.select([self._fd], [], [], ESCAPE_TIMEOUT)[0]:
+                self._keys.extend(finish_keys(self._unfinished))
+                self._unfinished = ""
+                continue
+            data = os.read(self._fd, READ_SIZE)
+            if not data:
+                return Key.EOF
+            keys, self._unfinished = split_keys(self._unfinished + self._decoder.decode(data))
+            self._keys.extend(keys)
+        return self._keys.popleft()
+
+
+def _exit_on_signal(signal_number, frame) -> None:
+    raise SystemExit(128 + signal_number)
+
+
+def format_menu(options: Sequence[str], selected: int) -> str:
+    return "\n".join(f"{'>' if ind == selected else ' '} {ind + 1}. {option}" for ind, option in enumerate(options))
+
+
+def select_option(keyboard: Keyboard, renderer: TerminalRenderer, title: str, options: Sequence[str],
+                  selected: int = 0) -> int:
+    """
+    Shows a menu moved through with the arrow keys and chosen with Enter, or at once with the number of an option.
+    Only the lines of the menu that change are redrawn.
+
+    Returns:
+        int: The index of the chosen option.
+
+    Raises:
+        EOFError: If the input is closed, as input() does.
+    """
+    renderer.reset()
+    prompt = "Use the arrows and Enter, or press a number."
+    while True:
+        renderer.render(message=title, prompt=f"{format_menu(options, selected)}\n\n{prompt}")
+        key = keyboard.read_key()
+        if key == Key.UP:
+            selected = (selected - 1) % len(options)
+        elif key == Key.DOWN:
+            selected = (selected + 1) % len(options)
+        elif key == Key.ENTER:
+            return selected
+        elif key == Key.EOF:
+            raise EOFError("The input is closed")
+        elif key.isascii() and key.isdecimal() and 1 <= int(key) <= len(options):
+            return int(key) - 1
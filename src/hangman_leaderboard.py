@@ -0,0 +1,435 @@
+import argparse
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+LEADERBOARD_MAGIC = b"HMLEADER"
+LEADERBOARD_VERSION = 1
+GLOBAL_SCOPE = "all"
+BUCKET_LOAD = 1024
+DEFAULT_SNAPSHOT_INTERVAL = 60.0
+
+# Keys pack the score and the player id into one unsigned 64-bit integer, so that ascending keys go
+# from the highest score to the lowest one, and from the earliest registered player to the latest on ties.
+ID_BITS = 32
+ID_MASK = (1 << ID_BITS) - 1
+MAX_SCORE = (1 << 64 - ID_BITS) - 1
+
+# magic, version, byte order code, number of players, number of scopes, size of the player names in bytes
+HEADER = struct.Struct('<8sHB5xIIQ')
+# Separates the player names in a snapshot, so it is not allowed in them.
+NAME_SEPARATOR = "\0"
+# name length in bytes, number of keys
+SCOPE_HEADER = struct.Struct('<HI')
+BYTE_ORDERS = ("little", "big")
+
+
+def pack_key(score: int, player_id: int) -> int:
+    return (MAX_SCORE - score) << ID_BITS | player_id
+
+
+def unpack_key(key: int) -> tuple[int, int]:
+    """
+    Returns the score and the player id packed into a key.
+    """
+    return MAX_SCORE - (key >> ID_BITS), key & ID_MASK
+
+
+def scope_name(category: str | None = None, difficulty: int | None = None) -> str:
+    """
+    Returns the name of the leaderboard of a category, of a difficulty level in it, or the global one.
+    """
+    if category is None:
+        return GLOBAL_SCOPE
+    return str(category) if difficulty is None else f"{category}:{difficulty}"
+
+
+class RankedKeys:
+    """
+    Sorted set of unsigned 64-bit keys with O(log n) rank and select.
+
+    The keys are kept in sorted arrays (buckets) of up to 2 * BUCKET_LOAD keys, with the maximum key of every bucket
+    and a Fenwick tree of the bucket sizes: a key is found by bisecting the maximums and then its bucket, and
+    the number of keys before a bucket is a prefix sum of the tree. Inserting into or removing from a bucket moves
+    at most 2 * BUCKET_LOAD machine words; the tree is rebuilt when a bucket is split or removed.
+    """
+    __slots__ = ('_buckets', '_maxes', '_tree', '_size')
+
+    def __init__(self, sorted_keys: Iterable[int] = ()):
+        keys = array('Q', sorted_keys)
+        self._buckets = [keys[ind:ind + BUCKET_LOAD] for ind in range(0, len(keys), BUCKET_LOAD)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._size = len(keys)
+        self._build_tree()
+
+    def _build_tree(self) -> None:
+        tree = [0] * (len(self._buckets) + 1)
+        for ind, bucket in enumerate(self._buckets, 1):
+            tree[ind] += len(bucket)
+            parent = ind + (ind & -ind)
+            if parent < len(tree):
+                tree[parent] += tree[ind]
+        self._tree = tree
+
+    def _update_tree(self, bucket_ind: int, delta: int) -> None:
+        ind = bucket_ind + 1
+        while ind < len(self._tree):
+            self._tree[ind] += delta
+            ind += ind & -ind
+
+    def _keys_before(self, bucket_ind: int) -> int:
+        count = 0
+        while bucket_ind > 0:
+            count += self._tree[bucket_ind]
+            bucket_ind -= bucket_ind & -bucket_ind
+        return count
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """
+        Returns the bucket and the position in it of the key with the given index (binary lifting on the tree).
+        """
+        bucket_ind = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            next_ind = bucket_ind + step
+            if next_ind < len(self._tree) and self._tree[next_ind] <= index:
+                bucket_ind = next_ind
+                index -= self._tree[next_ind]
+            step >>= 1
+        return bucket_ind, index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[int]:
+        for bucket in self._buckets:
+            yield from bucket
+
+    def __contains__(self, key: int) -> bool:
+        bucket_ind = bisect_left(self._maxes, key)
+        if bucket_ind == len(self._maxes):
+            return False
+        bucket = self._buckets[bucket_ind]
+        return bucket[bisect_left(bucket, key)] == key
+
+    def add(self, key: int) -> None:
+        if not self._buckets:
+            self._buckets.append(array('Q', (key,)))
+            self._maxes.append(key)
+            self._size = 1
+            self._build_tree()
+            return
+
+        bucket_ind = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+        bucket = self._buckets[bucket_ind]
+        bucket.insert(bisect_left(bucket, key), key)
+        self._maxes[bucket_ind] = bucket[-1]
+        self._size += 1
+        if len(bucket) > 2 * BUCKET_LOAD:
+            self._buckets[bucket_ind:bucket_ind + 1] = [bucket[:BUCKET_LOAD], bucket[BUCKET_LOAD:]]
+            self._maxes[bucket_ind:bucket_ind + 1] = [bucket[BUCKET_LOAD - 1], bucket[-1]]
+            self._build_tree()
+        else:
+            self._update_tree(bucket_ind, 1)
+
+    def remove(self, key: int) -> None:
+        """
+        Raises:
+            KeyError: If there is no such key.
+        """
+        bucket_ind = bisect_left(self._maxes, key)
+        bucket = self._buckets[bucket_ind] if bucket_ind < len(self._buckets) else None
+        pos = bisect_left(bucket, key) if bucket is not None else 0
+        if bucket is None or bucket[pos] != key:
+            raise KeyError(key)
+
+        del bucket[pos]
+        self._size -= 1
+        if not bucket:
+            del self._buckets[bucket_ind]
+            del self._maxes[bucket_ind]
+            self._build_tree()
+        else:
+            self._maxes[bucket_ind] = bucket[-1]
+            self._update_tree(bucket_ind, -1)
+
+    def rank(self, key: int) -> int:
+        """
+        Returns the number of keys less than the key.
+        """
+        bucket_ind = bisect_left(self._maxes, key)
+        if bucket_ind == len(self._maxes):
+            return self._size
+        return self._keys_before(bucket_ind) + bisect_left(self._buckets[bucket_ind], key)
+
+    def iter_from(self, index: int) -> Iterator[int]:
+        """
+        Iterates over the keys starting from the one with the given index.
+        """
+        if index >= self._size:
+            return
+        bucket_ind, pos = self._locate(max(index, 0))
+        for bucket in self._buckets[bucket_ind:]:
+            yield from bucket[pos:]
+            pos = 0
+
+    def to_array(self) -> array:
+        keys = array('Q')
+        for bucket in self._buckets:
+            keys += bucket
+        return keys
+
+
+@dataclass(frozen=True)
+class LeaderboardEntry:
+    rank: int
+    player: str
+    score: int
+
+
+class _ScopeBoard:
+    __slots__ = ('keys', 'scores')
+
+    def __init__(self, keys: RankedKeys | None = None):
+        self.keys = keys if keys is not None else RankedKeys()
+        # Score of every player id with games in the scope.
+        self.scores: dict[int, int] = {}
+
+
+class Leaderboard:
+    """
+    Cumulative scores of the players, globally, per category and per category and difficulty level (see scope_name).
+
+    Every scope keeps the keys (see pack_key) of its players in a RankedKeys, so the top, the rank of a player and
+    the players around them are found in O(log n) without sorting. A player takes an 8-byte key and a dict entry
+    with the score (about 100 bytes) in every scope they played in, besides the name. The methods are thread-safe,
+    so the board can be saved by a background thread (see start_snapshots).
+    """
+    def __init__(self):
+        self._players: list[str] = []
+        self._player_ids: dict[str, int] = {}
+        self._scopes: dict[str, _ScopeBoard] = {}
+        self._lock = threading.Lock()
+        self._snapshots = None
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def scopes(self) -> list[str]:
+        with self._lock:
+            return list(self._scopes)
+
+    def _player_id(self, player: str) -> int:
+        player_id = self._player_ids.get(player)
+        if player_id is None:
+            if len(self._players) > ID_MASK:
+                raise OverflowError("Too many players")
+            player_id = self._player_ids[player] = len(self._players)
+            self._players.append(player)
+        return player_id
+
+    def _add_score(self, scope: str, player_id: int, score: int) -> None:
+        board = self._scopes.get(scope)
+        if board is None:
+            board = self._scopes[scope] = _ScopeBoard()
+        stored = board.scores.get(player_id)
+        if stored is not None:
+            board.keys.remove(pack_key(stored, player_id))
+        total = min(stored + score if stored is not None else score, MAX_SCORE)
+        board.scores[player_id] = total
+        board.keys.add(pack_key(total, player_id))
+
+    def record(self, player: str, category: str, difficulty: int, score: int) -> None:
+        """
+        Adds the score of a finished game to the global, category and category and difficulty scores of the player.
+        """
+        if score < 0:
+            raise ValueError("Score must not be negative")
+        if NAME_SEPARATOR in player:
+            raise ValueError("Player name must not contain NUL characters")
+        with self._lock:
+            player_id = self._player_id(player)
+            for scope in (GLOBAL_SCOPE, scope_name(category), scope_name(category, difficulty)):
+                self._add_score(scope, player_id, score)
+
+    def _entry(self, rank: int, key: int) -> LeaderboardEntry:
+        score, player_id = unpack_key(key)
+        return LeaderboardEntry(rank, self._players[player_id], score)
+
+    def _entries(self, board: _ScopeBoard, start: int, count: int) -> list[LeaderboardEntry]:
+        entries = []
+        for rank, key in enumerate(board.keys.iter_from(start), start + 1):
+            if len(entries) == count:
+                break
+            entries.append(self._entry(rank, key))
+        return entries
+
+    def _player_key(self, board: _ScopeBoard | None, player: str) -> int | None:
+        player_id = self._player_ids.get(player)
+        if board is None or player_id not in board.scores:
+            return None
+        return pack_key(board.scores[player_id], player_id)
+
+    def top(self, count: int, scope: str = GLOBAL_SCOPE) -> list[LeaderboardEntry]:
+        """
+        Returns the players with the highest scores in the scope, ranked from 1.
+        """
+        with self._lock:
+            board = self._scopes.get(scope)
+            return self._entries(board, 0, count) if board is not None else []
+
+    def rank(self, player: str, scope: str = GLOBAL_SCOPE) -> LeaderboardEntry | None:
+        """
+        Returns the place of the player in the scope, or None if they have no games in it.
+        Players with equal scores are ranked in the order they joined the leaderboard.
+        """
+        with self._lock:
+            board = self._scopes.get(scope)
+            key = self._player_key(board, player)
+            return self._entry(board.keys.rank(key) + 1, key) if key is not None else None
+
+    def around(self, player: str, count: int, scope: str = GLOBAL_SCOPE) -> list[LeaderboardEntry]:
+        """
+        Returns the player with up to count players ranked right above and right below them.
+        """
+        with self._lock:
+            board = self._scopes.get(scope)
+            key = self._player_key(board, player)
+            if key is None:
+                return []
+            index = board.keys.rank(key)
+            start = max(index - count, 0)
+            return self._entries(board, start, index - start + count + 1)
+
+    def size(self, scope: str = GLOBAL_SCOPE) -> int:
+        """
+        Returns the number of players with games in the scope.
+        """
+        with self._lock:
+            board = self._scopes.get(scope)
+            return len(board.keys) if board is not None else 0
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Writes a snapshot of the leaderboard: a HEADER, the UTF-8 player names separated by NAME_SEPARATOR
+        and, for every scope, a SCOPE_HEADER, the UTF-8 name and the sorted keys.
+        The file is written and synced under a temporary name and then replaced, so a crash leaves either
+        the previous snapshot or the new one.
+        """
+        with self._lock:
+            player_count = len(self._players)
+            names = NAME_SEPARATOR.join(self._players).encode('utf-8')
+            scopes = [(scope.encode('utf-8'), board.keys.to_array()) for scope, board in self._scopes.items()]
+
+        chunks = [HEADER.pack(LEADERBOARD_MAGIC, LEADERBOARD_VERSION, BYTE_ORDERS.index(sys.byteorder),
+                              player_count, len(scopes), len(names)), names]
+        for name, keys in scopes:
+            chunks += [SCOPE_HEADER.pack(len(name), len(keys)), name, keys.tobytes()]
+        temporary_path = f"{os.fspath(path)}.tmp"
+        with open(temporary_path, 'wb') as file:
+            file.write(b''.join(chunks))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "Leaderboard":
+        """
+        Reads a snapshot written by save.
+
+        Raises:
+            ValueError: If the file is not a leaderboard snapshot or is damaged.
+        """
+        with open(path, 'rb') as file:
+            data = memoryview(file.read())
+        try:
+            magic, version, byte_order, player_count, scope_count, names_size = HEADER.unpack_from(data)
+            if magic != LEADERBOARD_MAGIC or version != LEADERBOARD_VERSION:
+                raise ValueError(f"{path} is not a version {LEADERBOARD_VERSION} leaderboard snapshot")
+            pos = HEADER.size + names_size
+            leaderboard = cls()
+            if player_count:
+                leaderboard._players = bytes(data[HEADER.size:pos]).decode('utf-8').split(NAME_SEPARATOR)
+                leaderboard._player_ids = {player: player_id for player_id, player in enumerate(leaderboard._players)}
+            if len(leaderboard._players) != player_count or len(leaderboard._player_ids) != player_count:
+                raise ValueError("Damaged leaderboard snapshot: wrong player names")
+
+            for _ in range(scope_count):
+                name_size, key_count = SCOPE_HEADER.unpack_from(data, pos)
+                pos += SCOPE_HEADER.size
+                scope = bytes(data[pos:pos + name_size]).decode('utf-8')
+                pos += name_size
+                keys = array('Q')
+                keys.frombytes(data[pos:pos + 8 * key_count])
+                pos += 8 * key_count
+                if len(keys) != key_count:
+                    raise ValueError("Truncated leaderboard snapshot")
+                if BYTE_ORDERS[byte_order] != sys.byteorder:
+                    keys.byteswap()
+                leaderboard._scopes[scope] = _restore_scope(keys, player_count)
+        except (struct.error, UnicodeDecodeError, IndexError) as error:
+            raise ValueError(f"Damaged leaderboard snapshot: {error}") from None
+        if pos != len(data):
+            raise ValueError("Damaged leaderboard snapshot: trailing data")
+        return leaderboard
+
+    def start_snapshots(self, path: str | os.PathLike, interval: float = DEFAULT_SNAPSHOT_INTERVAL) -> None:
+        """
+        Saves the leaderboard to the path every interval seconds in a background thread until stop_snapshots().
+        """
+        self.stop_snapshots()
+        stop = threading.Event()
+
+        def save_periodically() -> None:
+            while not stop.wait(interval):
+                self.save(path)
+
+        thread = threading.Thread(target=save_periodically, name="leaderboard-snapshots", daemon=True)
+        self._snapshots = (thread, stop)
+        thread.start()
+
+    def stop_snapshots(self) -> None:
+        """
+        Stops the periodic snapshots, waiting for the snapshot being written.
+        """
+        if self._snapshots is not None:
+            thread, stop = self._snapshots
+            stop.set()
+            thread.join()
+            self._snapshots = None
+
+
+def _restore_scope(keys: array, player_count: int) -> _ScopeBoard:
+    if any(map(int.__ge__, keys, keys[1:])):
+        raise ValueError("Damaged leaderboard snapshot: the keys are not sorted")
+    board = _ScopeBoard(RankedKeys(keys))
+    board.scores = {player_id: score for score, player_id in map(unpack_key, keys)}
+    if len(board.scores) != len(keys) or any(player_id >= player_count for player_id in board.scores):
+        raise ValueError("Damaged leaderboard snapshot: wrong player ids")
+    return board
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Shows a Hangman leaderboard snapshot.")
+    parser.add_argument("snapshot", help="path to the leaderboard snapshot")
+    parser.add_argument("--scope", default=GLOBAL_SCOPE, help="'all', a category or 'category:difficulty'")
+    parser.add_argument("--top", type=int, default=10, help="number of the best players to show")
+    parser.add_argument("--player", help="show the players around this one instead")
+    args = parser.parse_args(argv)
+
+    leaderboard = Leaderboard.load(args.snapshot)
+    if args.player:
+        entries = leaderboard.around(args.player, args.top // 2, args.scope)
+    else:
+        entries = leaderboard.top(args.top, args.scope)
+    for entry in entries:
+        print(f"{entry.rank:>8}  {entry.score:>10}  {entry.player}")
+
+
+if __name__ == '__main__':
+    main()
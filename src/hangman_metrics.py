@@ -0,0 +1,228 @@
+import atexit
+import contextlib
+import json
+import os
+import re
+import signal
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds of the histogram buckets, in seconds: 1, 2.5 and 5 of every decade from 1 µs to 10 s.
+BUCKET_BOUNDS = tuple(mantissa * 10.0 ** exponent for exponent in range(-6, 1) for mantissa in (1, 2.5, 5)) + (10.0,)
+METRIC_PREFIX = "hangman"
+EXPORT_FORMATS = ("prometheus", "json")
+
+
+class Histogram:
+    """
+    Distribution of durations in seconds over BUCKET_BOUNDS (the last bucket has no upper bound).
+    """
+    __slots__ = ('counts', 'count', 'total')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, share: float) -> float:
+        """
+        Returns the upper bound of the bucket containing the quantile (infinity for the last bucket).
+        """
+        rank = share * self.count
+        seen = 0
+        for bucket_ind, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return BUCKET_BOUNDS[bucket_ind] if bucket_ind < len(BUCKET_BOUNDS) else float("inf")
+        return 0.0
+
+
+class _Span:
+    __slots__ = ('_metrics', '_name', '_start')
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self._metrics = metrics
+        self._name = name
+        self._start = 0
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._metrics.observe(self._name, (time.perf_counter_ns() - self._start) / 1e9)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Metrics:
+    """
+    Registry of counters and duration histograms. While it is disabled, span() returns a shared no-op
+    context manager and count()/observe() return at once, so the instrumentation costs one method call.
+    """
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.counters: dict[str, int] = {}
+        self.histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str):
+        """
+        Returns a context manager that records the duration of its block in the histogram `name`.
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name)
+
+    def count(self, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_json(self) -> str:
+        with self._lock:
+            snapshot = {
+                "counters": dict(self.counters),
+                "histograms": {
+                    name: {
+                        "count": histogram.count,
+                        "sum": histogram.total,
+                        "p50": histogram.quantile(0.5),
+                        "p99": histogram.quantile(0.99),
+                        "buckets": dict(zip([*map(str, BUCKET_BOUNDS), "+Inf"], histogram.counts)),
+                    }
+                    for name, histogram in self.histograms.items()
+                },
+            }
+        return json.dumps(snapshot, indent=2)
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric_name = prometheus_name(name) + "_total"
+                lines += [f"# TYPE {metric_name} counter", f"{metric_name} {value}"]
+            for name, histogram in sorted(self.histograms.items()):
+                metric_name = prometheus_name(name) + "_seconds"
+                lines.append(f"# TYPE {metric_name} histogram")
+                cumulative = 0
+                for bound, bucket_count in zip([*map(repr, BUCKET_BOUNDS), "+Inf"], histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric_name}_bucket{{le="{bound}"}} {cumulative}')
+                lines += [f"{metric_name}_sum {histogram.total!r}", f"{metric_name}_count {histogram.count}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str | os.PathLike, export_format: str = "prometheus") -> None:
+        """
+        Writes the metrics to a file in the Prometheus text format or as JSON. The file is replaced atomically.
+        """
+        text = self.to_json() if export_format == "json" else self.to_prometheus()
+        temporary_path = f"{os.fspath(path)}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(temporary_path, path)
+
+
+def prometheus_name(name: str) -> str:
+    return f"{METRIC_PREFIX}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}"
+
+
+METRICS = Metrics()
+
+
+class SignalExporter:
+    """
+    Exports metrics to a file from a background thread every time SIGUSR1 arrives. The signal handler only writes
+    a byte into a pipe the thread waits on: exporting in the handler would take the lock of the metrics,
+    which the interrupted code of the main thread may be holding.
+    """
+    def __init__(self, metrics: Metrics, path: str | os.PathLike, export_format: str = "prometheus"):
+        self.metrics = metrics
+        self.path = path
+        self.export_format = export_format
+        self._read_fd, self._write_fd = os.pipe()
+        os.set_blocking(self._write_fd, False)
+        self._thread = threading.Thread(target=self._run, name="metrics-export", daemon=True)
+
+    def install(self) -> None:
+        """
+        Starts the export thread and sets the SIGUSR1 handler. Must be called from the main thread.
+        """
+        self._thread.start()
+        signal.signal(signal.SIGUSR1, self._handle_signal)
+
+    def request(self) -> None:
+        """
+        Asks the thread for an export. Safe to call from a signal handler: it neither blocks nor takes locks.
+        """
+        if self._write_fd is None:
+            return
+        with contextlib.suppress(BlockingIOError):
+            # A full pipe already holds requests the thread has not read yet.
+            os.write(self._write_fd, b"\0")
+
+    def close(self) -> None:
+        """
+        Stops the export thread once it has served the pending requests. The signal handler is left as is.
+        """
+        # A signal arriving from now on is ignored rather than written to a closed (or reused) descriptor.
+        write_fd, self._write_fd = self._write_fd, None
+        os.close(write_fd)
+        if self._thread.is_alive():
+            self._thread.join()
+        else:
+            os.close(self._read_fd)
+
+    def _handle_signal(self, signum, frame) -> None:
+        self.request()
+
+    def _run(self) -> None:
+        # Requests that arrived during an export are served by a single export.
+        while os.read(self._read_fd, 4096):
+            self.metrics.export(self.path, self.export_format)
+        os.close(self._read_fd)
+
+
+def enable_metrics(path: str | os.PathLike, export_format: str = "prometheus") -> None:
+    """
+    Enables METRICS and exports them to the file on exit and on SIGUSR1 (where available).
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown metrics format: {export_format}")
+
+    METRICS.enabled = True
+    atexit.register(METRICS.export, path, export_format)
+    if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+        SignalExporter(METRICS, path, export_format).install()
@@ -0,0 +1,344 @@
+import argparse
+import sys
+from array import array
+from collections import Counter
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from itertools import chain, compress
+
+from src.hangman_alphabet import LATIN, Alphabet
+from src.hangman_puzzle import MASKED_LETTER, Puzzle
+from src.hangman_word_bank import iter_words
+
+# Bitmaps are split into chunks of 2 ** CHUNK_BITS ids, like Roaring bitmaps.
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+CHUNK_BYTES = CHUNK_SIZE // 8
+# A chunk with at most SPARSE_LIMIT ids is a sorted array of their 2-byte offsets in the chunk, a denser one
+# is a bitmap (a Python int). Sparse chunks take at most a quarter of a bitmap; denser ones are kept as bitmaps,
+# although arrays of up to 4096 offsets would still be smaller, because operations on bitmaps run in C
+# and those on arrays loop in Python.
+SPARSE_LIMIT = 1024
+
+
+def _chunk_len(chunk: array | int) -> int:
+    return chunk.bit_count() if isinstance(chunk, int) else len(chunk)
+
+
+def _dense(chunk: array | int) -> int:
+    if isinstance(chunk, int):
+        return chunk
+    bits = bytearray(CHUNK_BYTES)
+    for low in chunk:
+        bits[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _filter(sparse: array, other: array | int, keep: bool) -> array:
+    """
+    Returns the offsets of the sparse chunk that are in the other chunk if keep is True, and that are not otherwise.
+    """
+    if isinstance(other, int):
+        bits = other.to_bytes(CHUNK_BYTES, 'little')
+        return array('H', [low for low in sparse if bool(bits[low >> 3] >> (low & 7) & 1) == keep])
+    other_set = set(other)
+    return array('H', [low for low in sparse if (low in other_set) == keep])
+
+
+def _and_chunks(first: array | int, second: array | int) -> array | int:
+    if isinstance(first, int) and isinstance(second, int):
+        return first & second
+    if isinstance(first, int):
+        first, second = second, first
+    return _filter(first, second, True)
+
+
+def _and_not_chunks(first: array | int, second: array | int) -> array | int:
+    if isinstance(first, int):
+        return first & ~_dense(second)
+    return _filter(first, second, False)
+
+
+def _iter_chunk(chunk: array | int, base: int) -> Iterator[int]:
+    if isinstance(chunk, int):
+        # Only the nonzero 64-bit words of the bitmap are visited.
+        words = memoryview(chunk.to_bytes(CHUNK_BYTES, sys.byteorder)).cast('Q')
+        for word_ind in compress(range(len(words)), words):
+            word = words[word_ind]
+            word_base = base + (word_ind << 6)
+            while word:
+                low = word & -word
+                yield word_base + low.bit_length() - 1
+                word ^= low
+    else:
+        for low in chunk:
+            yield base + low
+
+
+class CompressedBitmap:
+    """
+    Set of non-negative ids stored in chunks of CHUNK_SIZE ids: only the chunks with ids are kept,
+    each either as a sorted array of 2-byte offsets (if sparse) or as a bitmap. Intersections and differences
+    work chunk by chunk: two bitmaps are combined by a single int operation, and a sparse chunk is filtered
+    against the other one, so the cost follows the smaller of the sets.
+    """
+    __slots__ = ('_keys', '_chunks', '_count')
+
+    def __init__(self, keys: Sequence[int] = (), chunks: Sequence[array | int] = ()):
+        self._keys = list(keys)
+        self._chunks = list(chunks)
+        self._count = None
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> "CompressedBitmap":
+        """
+        Builds a bitmap from ids in ascending order.
+        """
+        keys = []
+        chunks = []
+        for word_id in ids:
+            key = word_id >> CHUNK_BITS
+            if not keys or keys[-1] != key:
+                keys.append(key)
+                chunks.append(array('H'))
+            chunks[-1].append(word_id & CHUNK_SIZE - 1)
+        return cls(keys, [chunk if len(chunk) <= SPARSE_LIMIT else _dense(chunk) for chunk in chunks])
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self._count = sum(_chunk_len(chunk) for chunk in self._chunks)
+        return self._count
+
+    def __iter__(self) -> Iterator[int]:
+        for key, chunk in zip(self._keys, self._chunks):
+            yield from _iter_chunk(chunk, key << CHUNK_BITS)
+
+    def __contains__(self, word_id: int) -> bool:
+        key = word_id >> CHUNK_BITS
+        for chunk_key, chunk in zip(self._keys, self._chunks):
+            if chunk_key == key:
+                low = word_id & CHUNK_SIZE - 1
+                if isinstance(chunk, int):
+                    return bool(chunk >> low & 1)
+                pos = bisect_left(chunk, low)
+                return pos < len(chunk) and chunk[pos] == low
+        return False
+
+    def __and__(self, other: "CompressedBitmap") -> "CompressedBitmap":
+        other_chunks = dict(zip(other._keys, other._chunks))
+        keys = []
+        chunks = []
+        for key, chunk in zip(self._keys, self._chunks):
+            if key in other_chunks:
+                chunk = _and_chunks(chunk, other_chunks[key])
+                if chunk:
+                    keys.append(key)
+                    chunks.append(chunk)
+        return CompressedBitmap(keys, chunks)
+
+    def __sub__(self, other: "CompressedBitmap") -> "CompressedBitmap":
+        other_chunks = dict(zip(other._keys, other._chunks))
+        keys = []
+        chunks = []
+        for key, chunk in zip(self._keys, self._chunks):
+            if key in other_chunks:
+                chunk = _and_not_chunks(chunk, other_chunks[key])
+            if chunk:
+                keys.append(key)
+                chunks.append(chunk)
+        return CompressedBitmap(keys, chunks)
+
+    def nbytes(self) -> int:
+        """
+        Returns the size of the chunk contents in bytes.
+        """
+        return sum(CHUNK_BYTES if isinstance(chunk, int) else len(chunk) * chunk.itemsize for chunk in self._chunks)
+
+
+def parse_pattern(pattern: str, alphabet: Alphabet = LATIN) -> list[str | None]:
+    """
+    Returns the letters of a pattern like "_a__a_", with None for the hidden positions.
+
+    Raises:
+        ValueError: If the pattern contains a character out of the alphabet other than MASKED_LETTER.
+    """
+    letters = []
+    for char in pattern.lower():
+        if char == MASKED_LETTER:
+            letters.append(None)
+        elif char in alphabet:
+            letters.append(char)
+        else:
+            raise ValueError(f"Pattern {pattern!r} contains a character out of the {alphabet.title} alphabet: {char!r}")
+    return letters
+
+
+class PositionBitmaps:
+    """
+    Compressed bitmaps over the words of the same length of a category: bit i stands for the word with the index
+    ids[i] in the category.
+    - all: every word;
+    - contains[letter]: words containing the letter;
+    - counts[letter][k]: words containing the letter exactly k times (k >= 1);
+    - at[pos][letter]: words with the letter at the position.
+    Letters are addressed by their index in the alphabet.
+    """
+    __slots__ = ('ids', 'all', 'contains', 'counts', 'at')
+
+    def __init__(self, words: Sequence[str], ids: array, alphabet: Alphabet = LATIN):
+        indices = alphabet.indices
+        length = len(words[0]) if words else 0
+        count_ids = [[[] for _ in range(length + 1)] for _ in alphabet.letters]
+        at_ids = [[[] for _ in alphabet.letters] for _ in range(length)]
+        for word_id, word in enumerate(words):
+            for letter in set(word):
+                count_ids[indices[letter]][word.count(letter)].append(word_id)
+            for pos, letter in enumerate(word):
+                at_ids[pos][indices[letter]].append(word_id)
+
+        self.ids = ids
+        self.all = CompressedBitmap.from_ids(range(len(words)))
+        self.contains = [CompressedBitmap.from_ids(sorted(chain.from_iterable(letter_ids)))
+                         for letter_ids in count_ids]
+        self.counts = [[CompressedBitmap.from_ids(ids_by_count) for ids_by_count in letter_ids]
+                       for letter_ids in count_ids]
+        self.at = [[CompressedBitmap.from_ids(letter_ids) for letter_ids in pos_ids] for pos_ids in at_ids]
+
+    def nbytes(self) -> int:
+        bitmaps = [self.all, *self.contains, *chain.from_iterable(self.counts), *chain.from_iterable(self.at)]
+        return self.ids.itemsize * len(self.ids) + sum(bitmap.nbytes() for bitmap in bitmaps)
+
+
+class PatternMatches:
+    """
+    Words of a category matching a pattern. The count is known at once; the words are found while iterating.
+    """
+    __slots__ = ('_bitmap', '_ids', '_puzzles')
+
+    def __init__(self, bitmap: CompressedBitmap, ids: array, puzzles: Sequence[Puzzle]):
+        self._bitmap = bitmap
+        self._ids = ids
+        self._puzzles = puzzles
+
+    def __len__(self) -> int:
+        return len(self._bitmap)
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterates over the indices of the matching puzzles in their category, in ascending order.
+        """
+        ids = self._ids
+        for bit in self._bitmap:
+            yield ids[bit]
+
+    def puzzles(self) -> Iterator[Puzzle]:
+        puzzles = self._puzzles
+        for word_id in self:
+            yield puzzles[word_id]
+
+
+class PatternIndex:
+    """
+    Positional inverted index of a word bank: compressed bitmaps of the words of every category
+    keyed by (length, position, letter) and by (length, letter) for letter presence, built on first use.
+    The words of a category are indexed over its alphabet from alphabets (LATIN by default).
+    """
+    def __init__(self, puzzles_by_category: Mapping[str, Sequence[Puzzle]],
+                 alphabets: Mapping[str, Alphabet] | None = None):
+        self._puzzles_by_category = puzzles_by_category
+        self._alphabets = alphabets if alphabets is not None else {}
+        self._bitmaps: dict[str, dict[int, PositionBitmaps]] = {}
+
+    def reuse(self, previous: "PatternIndex", categories: Iterable[str]) -> None:
+        """
+        Takes the bitmaps of the categories already built by another index over the same puzzles of these categories.
+        """
+        for category in categories:
+            if category in previous._bitmaps:
+                self._bitmaps[category] = previous._bitmaps[category]
+
+    def alphabet(self, category: str) -> Alphabet:
+        return self._alphabets.get(category, LATIN)
+
+    def bitmaps(self, category: str, length: int) -> PositionBitmaps | None:
+        if category not in self._bitmaps:
+            words_by_length: dict[int, tuple[list[str], array]] = {}
+            for word_id, word in enumerate(iter_words(self._puzzles_by_category[category])):
+                words, ids = words_by_length.setdefault(len(word), ([], array('I')))
+                words.append(word)
+                ids.append(word_id)
+            alphabet = self.alphabet(category)
+            self._bitmaps[category] = {
+                word_length: PositionBitmaps(words, ids, alphabet)
+                for word_length, (words, ids) in words_by_length.items()
+            }
+        return self._bitmaps[category].get(length)
+
+    def match(self, category: str, pattern: str, excluded: Iterable[str] = ()) -> PatternMatches:
+        """
+        Finds the words of the category that fit a pattern like "_a__a_" seen in a game:
+        the open letters are at their positions and nowhere else, and the words contain none of the excluded letters.
+
+        The sets of the open letters at their positions and of the words with as many of every open letter
+        are intersected from the smallest one, then the sets of the excluded letters are subtracted; no word is read.
+
+        Raises:
+            ValueError: If the pattern or the excluded letters have characters out of the category alphabet.
+        """
+        alphabet = self.alphabet(category)
+        letters = parse_pattern(pattern, alphabet)
+        excluded_inds = set()
+        for letter in excluded:
+            if letter not in alphabet:
+                raise ValueError(f"Letter {letter!r} is out of the {alphabet.title} alphabet")
+            excluded_inds.add(alphabet.indices[letter])
+
+        bitmaps = self.bitmaps(category, len(letters))
+        if bitmaps is None:
+            return PatternMatches(CompressedBitmap(), array('I'), self._puzzles_by_category[category])
+
+        open_counts = Counter(alphabet.indices[letter] for letter in letters if letter is not None)
+        required = [bitmaps.at[pos][alphabet.indices[letter]] for pos, letter in enumerate(letters)
+                    if letter is not None]
+        required += [bitmaps.counts[letter_ind][count] for letter_ind, count in open_counts.items()]
+        required.sort(key=len)
+        forbidden = [bitmaps.contains[letter_ind] for letter_ind in excluded_inds - open_counts.keys()]
+
+        result = required[0] if required else bitmaps.all
+        for bitmap in required[1:]:
+            result = result & bitmap
+            if not result:
+                break
+        for bitmap in forbidden:
+            if not result:
+                break
+            result = result - bitmap
+        return PatternMatches(result, bitmaps.ids, self._puzzles_by_category[category])
+
+
+def main(argv: list[str] | None = None) -> None:
+    from src.hangman_puzzle_generator import Category, get_pattern_index, load_word_bank
+
+    parser = argparse.ArgumentParser(description="Finds the words of a category matching a hangman pattern.")
+    parser.add_argument("category", choices=[cat.value for cat in Category if cat != Category.RANDOM_FLAG])
+    parser.add_argument("pattern", help=f"letters and {MASKED_LETTER!r} for the hidden ones, e.g. _a__a_")
+    parser.add_argument("--exclude", default="", help="letters the words must not contain")
+    parser.add_argument("--word-bank", help="path to a word bank file to search instead of the built-in words")
+    parser.add_argument("--count", action="store_true", help="print the number of matches only")
+    parser.add_argument("--limit", type=int, default=20, help="print at most this many matches")
+    args = parser.parse_args(argv)
+
+    if args.word_bank:
+        load_word_bank(args.word_bank)
+    try:
+        matches = get_pattern_index().match(args.category, args.pattern, args.exclude)
+    except ValueError as error:
+        parser.error(str(error))
+    print(len(matches))
+    if not args.count:
+        for _, puzzle in zip(range(args.limit), matches.puzzles()):
+            print(puzzle.get_word())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,21 @@
-from dataclasses import dataclass
+from collections.abc import Sequence
+from functools import lru_cache
+
+from src.hangman_alphabet import LATIN, Alphabet
+
+# The letters of the default alphabet.
+LETTERS = LATIN.letters
+LETTER_INDICES = LATIN.indices
+MASKED_LETTER = '_'
 
 
-@dataclass
 class Puzzle:
-    def __init__(self, word: str, hint: str):
+    __slots__ = ('_word', '_hint', '_id')
+
+    def __init__(self, word: str, hint: str, puzzle_id: int | None = None):
         self._word = word
         self._hint = hint
+        self._id = puzzle_id
 
     def get_word(self) -> str:
         return self._word
@@ -13,13 +23,89 @@ class Puzzle:
     def get_hint(self) -> str:
         return self._hint
 
+    def get_id(self) -> int | None:
+        """
+        Returns the index of the puzzle in its category of the word bank, if known.
+        """
+        return self._id
+
+    def set_id(self, puzzle_id: int) -> None:
+        self._id = puzzle_id
+
+
+@lru_cache(maxsize=4096)
+def index_word(word: str, alphabet: Alphabet = LATIN) -> tuple[tuple[tuple[int, ...], ...], int]:
+    """
+    Builds the lookup tables of a word.
+
+    Returns:
+        tuple[tuple[tuple[int, ...], ...], int]: Positions of every letter of the alphabet in the word
+        (indexed by the letter index) and the bitmask of the letters the word contains.
+    """
+    indices = alphabet.indices
+    positions = [[] for _ in alphabet.letters]
+    for pos, letter in enumerate(word):
+        if letter not in indices:
+            raise ValueError(f"Word {word!r} contains a letter out of the {alphabet.title} alphabet: {letter!r}")
+        positions[indices[letter]].append(pos)
+
+    letters_mask = 0
+    for letter_ind, letter_positions in enumerate(positions):
+        if letter_positions:
+            letters_mask |= 1 << letter_ind
+    return tuple(tuple(letter_positions) for letter_positions in positions), letters_mask
+
+
+class MaskedWord(Sequence):
+    """
+    Read-only view of the guessed part of the word. It compares equal to a list or a tuple with the same letters.
+    """
+    __slots__ = ('_letters',)
+
+    def __init__(self, letters: list[str]):
+        self._letters = letters
+
+    def __getitem__(self, index):
+        return self._letters[index]
+
+    def __len__(self) -> int:
+        return len(self._letters)
+
+    def __iter__(self):
+        return iter(self._letters)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (MaskedWord, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __str__(self) -> str:
+        return ''.join(self._letters)
+
+    def __repr__(self) -> str:
+        return f"MaskedWord({self._letters!r})"
+
 
 class HangmanPuzzle:
-    def __init__(self, puzzle: Puzzle):
+    """
+    State of a puzzle being guessed. The letters of the word are indexed once, so checking a guess,
+    revealing its positions and detecting the win do not scan the word.
+    """
+    __slots__ = ('_puzzle', '_alphabet', '_indices', '_positions', '_letters_mask', '_guessed_mask', '_hidden_left',
+                 '_guessed_part', '_guessed_view')
+
+    def __init__(self, puzzle: Puzzle, alphabet: Alphabet = LATIN):
         self._puzzle = puzzle
-        self._is_guessed = False
-        self._guessed_letters = set()
-        self._guessed_part = ['_'] * len(self._puzzle.get_word())
+        self._alphabet = alphabet
+        self._indices = alphabet.indices
+        word = puzzle.get_word()
+        self._positions, self._letters_mask = index_word(word, alphabet)
+        self._guessed_mask = 0
+        self._hidden_left = len(word)
+        self._guessed_part = [MASKED_LETTER] * len(word)
+        self._guessed_view = MaskedWord(self._guessed_part)
 
     def process_letter(self, letter) -> tuple[bool, str]:
         """
@@ -27,13 +113,14 @@ class HangmanPuzzle:
         - bool: True if player made an error (the letter is not in the word)
         - str: Result message (player guessed the letter, or they have already asked about this letter)
         """
+        letter_bit = 1 << self._indices[letter]
         message = ""
         got_mistake = False
-        if letter in self._guessed_letters:
+        if self._guessed_mask & letter_bit:
             message = self.remind_about_asked_letter(letter)
         else:
-            self._guessed_letters.add(letter)
-            if letter in self.get_puzzle().get_word():
+            self._guessed_mask |= letter_bit
+            if self._letters_mask & letter_bit:
                 self.update_guessed_part(letter)
                 message = "Hit!"
             else:
@@ -46,7 +133,7 @@ class HangmanPuzzle:
         Returns a message if player has already asked about given letter and whether it is contained in the hidden word.
         """
         message = "You have already asked about this letter!\n"
-        if c in self.get_puzzle().get_word():
+        if self._letters_mask & (1 << self._indices[c]):
             message += "Hidden word contains it.\n"
         else:
             message += "Hidden word doesn't contain it.\n"
@@ -54,20 +141,41 @@ class HangmanPuzzle:
 
     def update_guessed_part(self, guess_letter) -> None:
         """
-        Updates the guessed part of the word if the letter was guessed correctly.
-        Checks if the whole word is guessed.
+        Reveals the positions of a correctly guessed letter and decreases the number of hidden letters.
         """
-        for pos, let in enumerate(self.get_puzzle().get_word()):
-            if let == guess_letter:
-                self._guessed_part[pos] = guess_letter
-        if '_' not in self._guessed_part:
-            self._is_guessed = True
+        positions = self._positions[self._indices[guess_letter]]
+        for pos in positions:
+            self._guessed_part[pos] = guess_letter
+        self._hidden_left -= len(positions)
 
     def get_puzzle(self) -> Puzzle:
         return self._puzzle
 
+    def get_alphabet(self) -> Alphabet:
+        return self._alphabet
+
+    def get_guessed_mask(self) -> int:
+        """
+        Returns the bitmask of the asked letters (bit i stands for the letter with index i in the alphabet).
+        """
+        return self._guessed_mask
+
+    def restore_guessed_mask(self, guessed_mask: int) -> None:
+        """
+        Asks every letter of the bitmask that has not been asked yet.
+        """
+        for letter_ind, letter in enumerate(self._alphabet.letters):
+            if guessed_mask >> letter_ind & 1 and not self._guessed_mask >> letter_ind & 1:
+                self.process_letter(letter)
+
+    def is_letter_asked(self, letter) -> bool:
+        return bool(self._guessed_mask & (1 << self._indices[letter]))
+
+    def get_letter_positions(self, letter) -> tuple[int, ...]:
+        return self._positions[self._indices[letter]]
+
     def get_is_guessed(self) -> bool:
-        return self._is_guessed
+        return self._hidden_left == 0
 
-    def get_guessed_part(self) -> list[str]:
-        return self._guessed_part[:]
+    def get_guessed_part(self) -> MaskedWord:
+        return self._guessed_view
@@ -1,17 +1,47 @@
+import os
 import random
+import time
+from array import array
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
 from enum import StrEnum
 from textwrap import dedent
 
 from src.hangman_representation import MAX_DIFFICULTY
+from src.hangman_advisor import AdvisorIndex
+from src.hangman_alphabet import CYRILLIC, LATIN, Alphabet
+from src.hangman_bank_cache import CategoryIndex, read_bank_cache, source_digest, write_bank_cache
+from src.hangman_evil_puzzle import EvilHangmanPuzzle
+from src.hangman_metrics import METRICS
+from src.hangman_pattern_index import PatternIndex
 from src.hangman_puzzle import Puzzle, HangmanPuzzle
+from src.hangman_word_bank import WordBank, category_digest
+from src.hangman_word_difficulty import DifficultyIndex
+from src.hangman_word_sampler import WordSampler
 
 
 class Category(StrEnum):
     ANIMALS = "animals"
     FRUITS = "fruits"
     NATURE = "nature"
+    ANIMALS_RU = "животные"
     RANDOM_FLAG = "random"
 
+    @property
+    def alphabet(self) -> Alphabet:
+        """
+        The alphabet the words of the category are written in (LATIN for Category.RANDOM_FLAG).
+        """
+        return CATEGORY_ALPHABETS.get(self, LATIN)
+
+
+CATEGORY_ALPHABETS = {
+    Category.ANIMALS: LATIN,
+    Category.FRUITS: LATIN,
+    Category.NATURE: LATIN,
+    Category.ANIMALS_RU: CYRILLIC,
+}
+
 
 PUZZLES_BY_CATEGORY_LIST = {
     Category.ANIMALS: [
@@ -118,27 +148,271 @@ PUZZLES_BY_CATEGORY_LIST = {
             Endlessly swimming in a waterless sea.
             """)
         ), ],
+    Category.ANIMALS_RU: [
+        Puzzle(
+            word="волк",
+            hint="Сколько его ни корми, он всё в лес смотрит."
+        ),
+        Puzzle(
+            word="лиса",
+            hint="Рыжая плутовка, хитрая да ловкая."
+        ),
+        Puzzle(
+            word="заяц",
+            hint="Летом серый, зимой белый."
+        ),
+        Puzzle(
+            word="медведь",
+            hint="Зимой спит в берлоге и сосёт лапу."
+        ),
+        Puzzle(
+            word="ёжик",
+            hint=dedent("""\
+            Сердитый недотрога живёт в глуши лесной:
+            Иголок очень много, а нитки ни одной.
+            """)
+        ),
+        Puzzle(
+            word="черепаха",
+            hint="Носит свой дом на спине."
+        ), ],
 }
 
 
-def gen_puzzle(category, difficulty) -> tuple[Category, int, HangmanPuzzle]:
+def number_puzzles(puzzles_by_category: Mapping[Category, Sequence[Puzzle]]) -> None:
+    """
+    Sets the ids of the puzzles kept in lists: the id of a puzzle is its index in the category.
+    Word banks read from files set the ids themselves.
+    """
+    for puzzles in puzzles_by_category.values():
+        if isinstance(puzzles, list):
+            for puzzle_id, puzzle in enumerate(puzzles):
+                puzzle.set_id(puzzle_id)
+
+
+@dataclass(frozen=True)
+class BankState:
+    """
+    The puzzles used by gen_puzzle with their indexes. It is replaced as a whole by a single reference assignment,
+    so a reader that took the state once never sees the indexes of another word bank.
+    digests caches the category digests (see category_digest) computed so far.
+    """
+    word_bank: Mapping[Category, Sequence[Puzzle]]
+    difficulty_index: DifficultyIndex
+    advisor_index: AdvisorIndex
+    pattern_index: PatternIndex
+    digests: dict[str, bytes] = field(default_factory=dict)
+
+    def category_digest(self, category: str) -> bytes:
+        """
+        Returns the digest of the category lines (see category_digest), computing it on first use.
+        """
+        digest = self.digests.get(category)
+        if digest is None:
+            digest = self.digests[category] = category_digest(category, self.word_bank[category])
+        return digest
+
+
+@dataclass(frozen=True)
+class ReloadReport:
+    duration: float
+    changed_categories: list[str]
+    reused_categories: list[str]
+    removed_categories: list[str]
+    # Memory taken by the line offsets and difficulty orders of the new bank, shared arrays included.
+    index_bytes: int
+
+
+number_puzzles(PUZZLES_BY_CATEGORY_LIST)
+_state = BankState(PUZZLES_BY_CATEGORY_LIST, DifficultyIndex(PUZZLES_BY_CATEGORY_LIST),
+                   AdvisorIndex(PUZZLES_BY_CATEGORY_LIST, CATEGORY_ALPHABETS),
+                   PatternIndex(PUZZLES_BY_CATEGORY_LIST, CATEGORY_ALPHABETS))
+
+
+def get_bank_state() -> BankState:
+    return _state
+
+
+def get_word_bank() -> Mapping[Category, Sequence[Puzzle]]:
+    return _state.word_bank
+
+
+def get_difficulty_index() -> DifficultyIndex:
+    return _state.difficulty_index
+
+
+def get_advisor_index() -> AdvisorIndex:
+    return _state.advisor_index
+
+
+def get_pattern_index() -> PatternIndex:
+    return _state.pattern_index
+
+
+def set_word_bank(word_bank: Mapping[Category, Sequence[Puzzle]],
+                  difficulty_index: DifficultyIndex | None = None) -> None:
+    """
+    Replaces the puzzles used by gen_puzzle and scores their words, unless their difficulty index is passed.
+    By default, PUZZLES_BY_CATEGORY_LIST is used.
+    """
+    global _state
+    number_puzzles(word_bank)
+    if difficulty_index is None:
+        difficulty_index = DifficultyIndex(word_bank)
+    _state = BankState(word_bank, difficulty_index, AdvisorIndex(word_bank, CATEGORY_ALPHABETS),
+                       PatternIndex(word_bank, CATEGORY_ALPHABETS))
+
+
+def _open_word_bank(path: str | os.PathLike, cache_path: str | os.PathLike | None,
+                    previous: BankState | None = None) -> tuple[BankState, list[str]]:
+    """
+    Opens a word bank file and builds its indexes, taking them from the cache if possible. If the previous state
+    is passed, the categories with the same lines (see category_digest) keep its difficulty order, advisor bitsets
+    and pattern bitmaps.
+
+    Returns:
+        tuple[BankState, list[str]]: The state of the new bank and the categories whose indexes were reused.
+    """
+    digest = source_digest(path) if cache_path is not None else None
+    cached = read_bank_cache(cache_path, digest) if cache_path is not None else None
+    if cached is not None:
+        word_bank = WordBank(path, {category: index.offsets for category, index in cached.items()})
+    else:
+        word_bank = WordBank(path)
+
+    known_categories = {cat.value for cat in Category if cat != Category.RANDOM_FLAG}
+    unknown_categories = [category for category in word_bank if category not in known_categories]
+    if unknown_categories:
+        word_bank.close()
+        raise ValueError(f"Unknown categories in word bank {path}: {', '.join(unknown_categories)}")
+
+    digests = {}
+    reused = []
+    orders = {}
+    if previous is not None:
+        digests = {category: category_digest(category, puzzles) for category, puzzles in word_bank.items()}
+        reused = [category for category, digest in digests.items()
+                  if category in previous.word_bank and previous.category_digest(category) == digest]
+        orders = {category: previous.difficulty_index.order(category) for category in reused}
+
+    if cached is not None:
+        difficulty_index = DifficultyIndex(word_bank, {category: index.order for category, index in cached.items()})
+    else:
+        difficulty_index = DifficultyIndex(word_bank, orders)
+        if cache_path is not None:
+            write_bank_cache(cache_path, digest, {
+                category: CategoryIndex(puzzles.offsets(), difficulty_index.order(category))
+                for category, puzzles in word_bank.items()
+            })
+    if cache_path is not None:
+        METRICS.count("word_bank.cache_hits" if cached is not None else "word_bank.cache_misses")
+
+    advisor_index = AdvisorIndex(word_bank, CATEGORY_ALPHABETS)
+    pattern_index = PatternIndex(word_bank, CATEGORY_ALPHABETS)
+    if previous is not None:
+        advisor_index.reuse(previous.advisor_index, reused)
+        pattern_index.reuse(previous.pattern_index, reused)
+    return BankState(word_bank, difficulty_index, advisor_index, pattern_index, digests), reused
+
+
+def load_word_bank(path: str | os.PathLike, cache_path: str | os.PathLike | None = None) -> WordBank:
+    """
+    Opens a word bank file and makes gen_puzzle use it.
+
+    If cache_path is set, the line offsets and the difficulty order of the words are taken from the cache file
+    when it was built from the same contents of the word bank, and the cache is rewritten otherwise.
+
+    Raises:
+        ValueError: If the file contains a category that is not listed in Category.
+    """
+    global _state
+    with METRICS.span("word_bank.load"):
+        _state, _ = _open_word_bank(path, cache_path)
+        return _state.word_bank
+
+
+def reload_word_bank(path: str | os.PathLike, cache_path: str | os.PathLike | None = None) -> ReloadReport:
+    """
+    Opens a new version of a word bank file and makes gen_puzzle use it, as load_word_bank does,
+    but rebuilds the indexes of the changed categories only: the categories with the same lines
+    (see category_digest) keep their difficulty order, advisor bitsets and pattern bitmaps.
+
+    The new state is published by a single reference swap when it is complete, so gen_puzzle never waits
+    for the reload. The previous word bank is not closed: the puzzles and the games that still refer to it
+    stay valid, and it is released when the last of them is gone. For that, a new version of the file must
+    replace the old one by a rename (as hangman_bank_builder does), not be rewritten in place.
+
+    Raises:
+        ValueError: If the file contains a category that is not listed in Category.
+    """
+    global _state
+    started = time.perf_counter()
+    with METRICS.span("word_bank.reload"):
+        previous = _state
+        _state, reused = _open_word_bank(path, cache_path, previous)
+
+    word_bank = _state.word_bank
+    index_bytes = sum(array_bytes(puzzles.offsets()) + array_bytes(_state.difficulty_index.order(category))
+                      for category, puzzles in word_bank.items())
+    METRICS.observe("word_bank.reload_index_bytes", index_bytes)
+    return ReloadReport(
+        duration=time.perf_counter() - started,
+        changed_categories=sorted(set(word_bank) - set(reused)),
+        reused_categories=sorted(reused),
+        removed_categories=sorted(set(previous.word_bank) - set(word_bank)),
+        index_bytes=index_bytes,
+    )
+
+
+def array_bytes(values: array) -> int:
+    return values.buffer_info()[1] * values.itemsize
+
+
+def gen_puzzle(category, difficulty, word_band: tuple[int, int] | None = None, sampler: WordSampler | None = None,
+               rng: random.Random | None = None, evil: bool = False) -> tuple[Category, int, HangmanPuzzle]:
     """
     Puzzle generation depending on the category and difficulty.
+    The word is taken from the words suitable for the difficulty (see DifficultyIndex).
 
     Args:
         category (Category): Puzzle category (a string or Category.RANDOM_FLAG).
         difficulty (int | str): Puzzle difficulty (an int from 1 to MAX_DIFFICULTY or Category.RANDOM_FLAG).
+        word_band (tuple[int, int] | None): If set, the word is taken from the words suitable
+            for the difficulty levels from word_band[0] to word_band[1] instead.
+        sampler (WordSampler | None): If set, the word is drawn by the sampler, so the words of the band
+            do not repeat until all of them were drawn. Otherwise, it is chosen at random.
+        rng (random.Random | None): Source of the random choices, the module-level generator by default.
+        evil (bool): If set, the puzzle does not commit to the word: only its length is taken from the chosen word,
+            and any word of the category with that length may turn out hidden (see EvilHangmanPuzzle).
 
     Returns:
         tuple[Category, int, HangmanPuzzle]: Generated puzzle category, generated puzzle difficulty,
         and the generated puzzle.
     """
+    with METRICS.span("puzzle.generate"):
+        # The state is taken once, so a concurrent reload does not mix the indexes of two word banks.
+        state = get_bank_state()
+        word_bank = state.word_bank
+        if rng is None:
+            rng = random
+
+        if category == Category.RANDOM_FLAG:
+            category = rng.choice([cat for cat in Category if cat != Category.RANDOM_FLAG and word_bank.get(cat)])
 
-    if category == Category.RANDOM_FLAG:
-        category = random.choice([cat for cat in Category if cat != Category.RANDOM_FLAG])
+        if difficulty == Category.RANDOM_FLAG:
+            difficulty = rng.randint(1, MAX_DIFFICULTY)
 
-    if difficulty == Category.RANDOM_FLAG:
-        difficulty = random.randint(1, MAX_DIFFICULTY)
+        if not word_bank.get(category):
+            raise ValueError(f"There are no puzzles in category {category}")
 
-    puzzle = random.choice(PUZZLES_BY_CATEGORY_LIST[category])
-    return category, difficulty, HangmanPuzzle(puzzle)
+        if word_band is None:
+            word_band = (difficulty, difficulty)
+        puzzles = state.difficulty_index.band(category, *word_band)
+        if sampler is not None:
+            puzzle = puzzles[sampler.draw(f"{category}:{word_band[0]}-{word_band[1]}", len(puzzles))]
+        else:
+            puzzle = rng.choice(puzzles)
+        if evil:
+            bitsets = state.advisor_index.bitsets(category, len(puzzle.get_word()))
+            return category, difficulty, EvilHangmanPuzzle(word_bank[category], bitsets)
+        return category, difficulty, HangmanPuzzle(puzzle, CATEGORY_ALPHABETS[category])
@@ -0,0 +1,232 @@
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+
+from src.hangman_puzzle import Puzzle
+from src.hangman_word_difficulty import MAX_DIFFICULTY, DifficultyIndex
+
+# Difficulty code of the puzzles stored without a difficulty index.
+NO_DIFFICULTY = 0
+# Offsets into the text blobs take 4 bytes until the blobs outgrow them.
+MAX_SHORT_OFFSET = 2 ** 32 - 1
+
+
+def _offsets_array(lengths: Iterator[int]) -> array:
+    offsets = array('Q', [0])
+    position = 0
+    for length in lengths:
+        position += length
+        offsets.append(position)
+    return array('I', offsets) if position <= MAX_SHORT_OFFSET else offsets
+
+
+class StoredPuzzle:
+    """
+    A puzzle of a PuzzleStore: a reference to the store and a row number, with the interface of Puzzle.
+    The word and the hint are decoded from the store when they are asked for.
+    """
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store: "PuzzleStore", row: int):
+        self._store = store
+        self._row = row
+
+    def get_word(self) -> str:
+        return self._store.word(self._row)
+
+    def get_hint(self) -> str:
+        return self._store.hint(self._row)
+
+    def get_id(self) -> int:
+        """
+        Returns the index of the puzzle in its category of the store.
+        """
+        return self._row - self._store.category_start(self._store.category_code(self._row))
+
+    def get_category(self) -> str:
+        return self._store.category(self._row)
+
+    def get_difficulty(self) -> int:
+        return self._store.difficulty(self._row)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, StoredPuzzle):
+            return self._store is other._store and self._row == other._row
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._row))
+
+    def __repr__(self) -> str:
+        return f"StoredPuzzle({self.get_word()!r}, row={self._row})"
+
+
+class PuzzleStoreCategory(Sequence):
+    """
+    Puzzles of one category of a PuzzleStore: a range of its rows. Items are StoredPuzzle views built on access.
+    """
+    __slots__ = ('_store', '_start', '_stop')
+
+    def __init__(self, store: "PuzzleStore", start: int, stop: int):
+        self._store = store
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[ind] for ind in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PuzzleStoreCategory index out of range")
+        return StoredPuzzle(self._store, self._start + index)
+
+    def __iter__(self) -> Iterator[StoredPuzzle]:
+        for row in range(self._start, self._stop):
+            yield StoredPuzzle(self._store, row)
+
+    def rows(self) -> range:
+        """
+        Returns the rows of the category in the store.
+        """
+        return range(self._start, self._stop)
+
+    def iter_words(self) -> Iterator[str]:
+        """
+        Iterates over the words of the category without building StoredPuzzle objects.
+        """
+        word = self._store.word
+        for row in range(self._start, self._stop):
+            yield word(row)
+
+
+class PuzzleStore(Mapping):
+    """
+    Puzzles kept in columns instead of one Python object with two strings per puzzle:
+    the words and the hints are concatenated into two UTF-8 blobs with arrays of their offsets,
+    and the category and the difficulty level of every puzzle are one-byte codes.
+
+    The rows of a category are contiguous. As a mapping from categories to sequences of puzzles,
+    the store can be used wherever the word bank is (see set_word_bank).
+    """
+    def __init__(self, categories: Sequence[str], words: bytes, word_offsets: array, hints: bytes,
+                 hint_offsets: array, category_codes: array, difficulty_codes: array):
+        self._category_names = list(categories)
+        self._words = words
+        self._word_offsets = word_offsets
+        self._hints = hints
+        self._hint_offsets = hint_offsets
+        self._category_codes = category_codes
+        self._difficulty_codes = difficulty_codes
+
+        bounds = [0] * (len(self._category_names) + 1)
+        for code in category_codes:
+            bounds[code + 1] += 1
+        for code in range(len(self._category_names)):
+            bounds[code + 1] += bounds[code]
+        self._category_bounds = array('I', bounds)
+        self._categories = {
+            category: PuzzleStoreCategory(self, bounds[code], bounds[code + 1])
+            for code, category in enumerate(self._category_names)
+        }
+
+    @classmethod
+    def from_puzzles(cls, puzzles_by_category: Mapping[str, Sequence[Puzzle]],
+                     difficulty_index: DifficultyIndex | None = None) -> "PuzzleStore":
+        """
+        Copies puzzles into a store. If the difficulty index of the puzzles is passed, every puzzle gets
+        the code of the difficulty level whose band holds it, and NO_DIFFICULTY otherwise.
+
+        Raises:
+            ValueError: If there are more than 256 categories.
+        """
+        if len(puzzles_by_category) > 256:
+            raise ValueError(f"A puzzle store holds at most 256 categories, got {len(puzzles_by_category)}")
+
+        encoded_words = []
+        encoded_hints = []
+        category_codes = array('B')
+        difficulty_codes = array('B')
+        for code, (category, puzzles) in enumerate(puzzles_by_category.items()):
+            start = len(encoded_words)
+            for puzzle in puzzles:
+                encoded_words.append(puzzle.get_word().encode('utf-8'))
+                encoded_hints.append(puzzle.get_hint().encode('utf-8'))
+            size = len(encoded_words) - start
+            category_codes.extend(array('B', [code]) * size)
+            category_difficulties = array('B', [NO_DIFFICULTY]) * size
+            if difficulty_index is not None:
+                for difficulty in range(1, MAX_DIFFICULTY + 1):
+                    for word_id in difficulty_index.puzzles(category, difficulty).word_ids():
+                        category_difficulties[word_id] = difficulty
+            difficulty_codes.extend(category_difficulties)
+
+        return cls(
+            list(puzzles_by_category),
+            b"".join(encoded_words), _offsets_array(map(len, encoded_words)),
+            b"".join(encoded_hints), _offsets_array(map(len, encoded_hints)),
+            category_codes, difficulty_codes,
+        )
+
+    def __getitem__(self, category: str) -> PuzzleStoreCategory:
+        return self._categories[category]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._categories)
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+    def puzzle_count(self) -> int:
+        return len(self._category_codes)
+
+    def puzzle(self, row: int) -> StoredPuzzle:
+        if not 0 <= row < self.puzzle_count():
+            raise IndexError("PuzzleStore row out of range")
+        return StoredPuzzle(self, row)
+
+    def word(self, row: int) -> str:
+        offsets = self._word_offsets
+        return self._words[offsets[row]:offsets[row + 1]].decode('utf-8')
+
+    def hint(self, row: int) -> str:
+        offsets = self._hint_offsets
+        return self._hints[offsets[row]:offsets[row + 1]].decode('utf-8')
+
+    def category_code(self, row: int) -> int:
+        return self._category_codes[row]
+
+    def category_start(self, code: int) -> int:
+        return self._category_bounds[code]
+
+    def category(self, row: int) -> str:
+        return self._category_names[self._category_codes[row]]
+
+    def difficulty(self, row: int) -> int:
+        return self._difficulty_codes[row]
+
+    def rows_with_difficulty(self, category: str, difficulty: int) -> array:
+        """
+        Returns the rows of the category puzzles that have the difficulty code, by a scan of the code column.
+        """
+        codes = self._difficulty_codes
+        return array('I', (row for row in self._categories[category].rows() if codes[row] == difficulty))
+
+    def nbytes(self) -> int:
+        """
+        Returns the size of the columns in bytes.
+        """
+        columns = (self._word_offsets, self._hint_offsets, self._category_codes, self._difficulty_codes)
+        return len(self._words) + len(self._hints) + sum(len(column) * column.itemsize for column in columns)
+
+
+def store_word_bank(puzzles_by_category: Mapping[str, Sequence[Puzzle]],
+                    difficulty_index: DifficultyIndex | None = None) -> PuzzleStore:
+    """
+    Copies a word bank into a PuzzleStore, scoring the words unless their difficulty index is passed.
+    """
+    if difficulty_index is None:
+        difficulty_index = DifficultyIndex(puzzles_by_category)
+    return PuzzleStore.from_puzzles(puzzles_by_category, difficulty_index)
@@ -0,0 +1,101 @@
+import sys
+from typing import TextIO
+
+from src.hangman_metrics import METRICS
+
+CURSOR_HOME = "\x1b[H"
+ERASE_SCREEN = "\x1b[2J"
+ERASE_LINE = "\x1b[2K"
+ERASE_BELOW = "\x1b[J"
+
+
+def move_cursor(row: int) -> str:
+    """
+    Returns the ANSI sequence moving the cursor to the beginning of the given 1-based screen row.
+    """
+    return f"\x1b[{row};1H"
+
+
+class TerminalRenderer:
+    """
+    Owns the game screen and draws it as a sequence of named regions stacked from top to bottom
+    (the rules of the round, the hangman picture, the masked word, the message line and the input prompt).
+
+    On a terminal only the regions that changed since the previous frame are redrawn with ANSI cursor
+    and erase sequences, and every frame is sent with a single buffered write.
+    If the output stream is not a TTY, each frame is written as plain text without escape sequences,
+    and the header is only written when it differs from the previous frame's header.
+    """
+    REGIONS = ("header", "picture", "word", "message", "prompt")
+
+    def __init__(self, stream: TextIO | None = None):
+        self._stream = stream
+        self._frame: dict[str, tuple[str, ...]] | None = None
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    def is_tty(self) -> bool:
+        isatty = getattr(self.stream, "isatty", None)
+        return bool(isatty and isatty())
+
+    def reset(self) -> None:
+        """
+        Forgets the previous frame, so the next one is drawn on a cleared screen.
+        """
+        self._frame = None
+
+    def render(self, **regions: str) -> None:
+        """
+        Draws a frame. Regions that are not passed are drawn empty.
+
+        Args:
+            **regions (str): Text of the regions listed in REGIONS, keyed by region name.
+        """
+        unknown = set(regions) - set(self.REGIONS)
+        if unknown:
+            raise ValueError(f"Unknown screen regions: {', '.join(sorted(unknown))}")
+
+        frame = {name: tuple(str(regions.get(name, "")).splitlines()) for name in self.REGIONS}
+        if self.is_tty():
+            output = self._diff_frame(frame)
+        else:
+            output = "".join(line + "\n" for name in self.REGIONS for line in frame[name]
+                             if name != "header" or self._frame is None or self._frame[name] != frame[name])
+        self._frame = frame
+
+        stream = self.stream
+        with METRICS.span("render.write"):
+            stream.write(output)
+            stream.flush()
+        METRICS.count("render.bytes", len(output))
+
+    def _diff_frame(self, frame: dict[str, tuple[str, ...]]) -> str:
+        """
+        Builds the escape sequence that turns the previous frame into the given one.
+        Once a region changes its height, every region below it is shifted and gets redrawn too.
+        """
+        chunks = []
+        shifted = False
+        if self._frame is None:
+            chunks.append(CURSOR_HOME + ERASE_SCREEN)
+            shifted = True
+
+        row = 1
+        for name in self.REGIONS:
+            lines = frame[name]
+            if not shifted:
+                previous = self._frame[name]
+                shifted = len(previous) != len(lines)
+                redraw = shifted or previous != lines
+            else:
+                redraw = True
+
+            if redraw:
+                for offset, line in enumerate(lines):
+                    chunks.append(move_cursor(row + offset) + ERASE_LINE + line)
+            row += len(lines)
+
+        chunks.append(move_cursor(row) + ERASE_BELOW)
+        return "".join(chunks)
@@ -0,0 +1,187 @@
+import argparse
+import json
+import random
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import TextIO
+
+from src.hangman_game import GameEvent, HangmanGame
+from src.hangman_puzzle import Puzzle
+from src.hangman_puzzle_generator import Category, gen_puzzle, load_word_bank
+from src.hangman_representation import MAX_DIFFICULTY
+
+DEFAULT_CHUNK_SIZE = 2000
+_CATEGORIES = {category.value for category in Category if category != Category.RANDOM_FLAG}
+
+_game: HangmanGame | None = None
+
+
+class ScriptError(ValueError):
+    pass
+
+
+def _parse_difficulty(value) -> int | str:
+    if value == Category.RANDOM_FLAG:
+        return Category.RANDOM_FLAG
+    if isinstance(value, int) and not isinstance(value, bool) and 1 <= value <= MAX_DIFFICULTY:
+        return value
+    raise ScriptError(f"invalid difficulty: {value!r}")
+
+
+def replay_script(game: HangmanGame, script: dict) -> dict:
+    """
+    Plays a game script on the game core and returns its result.
+
+    A script is an object with either "word" and "category" or a "seed" (the puzzle is then generated
+    as by gen_puzzle with random.Random(seed), "category" may be "random" or absent), "difficulty"
+    (a level or "random", the default) and "guesses": a string of letters or a list of lines entered by the player.
+    The guesses left after the game is over are ignored.
+
+    Raises:
+        ScriptError: If the script is malformed.
+    """
+    guesses = script.get("guesses", "")
+    if not isinstance(guesses, (str, list)):
+        raise ScriptError("guesses must be a string or a list")
+    difficulty = _parse_difficulty(script.get("difficulty", Category.RANDOM_FLAG))
+    category = script.get("category", Category.RANDOM_FLAG)
+    if category != Category.RANDOM_FLAG and category not in _CATEGORIES:
+        raise ScriptError(f"unknown category: {category!r}")
+
+    if "word" in script:
+        word = script["word"]
+        if not isinstance(word, str) or not word:
+            raise ScriptError("word must be a non-empty string")
+        if category == Category.RANDOM_FLAG:
+            raise ScriptError("a script with a word needs its category")
+        if difficulty == Category.RANDOM_FLAG:
+            raise ScriptError("a script with a word needs its difficulty")
+        puzzle = Puzzle(word, script.get("hint", ""))
+    elif "seed" in script:
+        category, difficulty, hangman_puzzle = gen_puzzle(category, difficulty, rng=random.Random(script["seed"]))
+        puzzle = hangman_puzzle.get_puzzle()
+    else:
+        raise ScriptError("a script needs a word or a seed")
+
+    try:
+        game.resume_game(Category(category), difficulty, puzzle, 0, 0)
+    except (KeyError, ValueError) as error:
+        raise ScriptError(f"cannot start the game: {error}") from None
+
+    outcome = "unfinished"
+    guesses_made = 0
+    for guess in guesses:
+        if game.is_over():
+            break
+        guesses_made += 1
+        event, _ = game.process_guess(guess)
+        if event == GameEvent.QUIT:
+            outcome = "quit"
+            break
+    if outcome == "quit" or game.is_over():
+        if outcome != "quit":
+            outcome = "won" if game.hangman_puzzle.get_is_guessed() else "lost"
+        game.finish_game()
+
+    return {
+        "category": str(game.category),
+        "word": puzzle.get_word(),
+        "difficulty": game.difficulty,
+        "outcome": outcome,
+        "mistakes": game.mistakes,
+        "score": game.current_score,
+        "guesses": guesses_made,
+    }
+
+
+def replay_lines(lines: list[str], first_line_number: int = 1) -> list[str]:
+    """
+    Replays a chunk of JSONL scripts and returns the JSONL results, one per script, in the same order.
+    A script's "id" is copied to its result; a malformed script gets a result with "line" and "error".
+    """
+    global _game
+    if _game is None:
+        _game = HangmanGame()
+    game = _game
+
+    results = []
+    for line_number, line in enumerate(lines, first_line_number):
+        if not line.strip():
+            continue
+        script = None
+        try:
+            script = json.loads(line)
+            if not isinstance(script, dict):
+                raise ScriptError("a script must be an object")
+            result = replay_script(game, script)
+        except (ValueError, TypeError) as error:
+            result = {"line": line_number, "error": str(error)}
+        if isinstance(script, dict) and "id" in script:
+            result = {"id": script["id"], **result}
+        results.append(json.dumps(result, separators=(",", ":")) + "\n")
+    return results
+
+
+def _chunks(lines: Iterable[str], chunk_size: int) -> Iterator[tuple[list[str], int]]:
+    lines = iter(lines)
+    line_number = 1
+    while chunk := list(islice(lines, chunk_size)):
+        yield chunk, line_number
+        line_number += len(chunk)
+
+
+def replay_stream(lines: Iterable[str], output: TextIO, jobs: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  word_bank: str | None = None) -> None:
+    """
+    Replays JSONL scripts read lazily from lines and writes the results in the input order.
+    With several jobs, chunks of scripts are replayed by worker processes; at most two chunks per worker
+    are in flight, so memory use does not depend on the length of the input.
+    """
+    if jobs <= 1:
+        for chunk, line_number in _chunks(lines, chunk_size):
+            output.writelines(replay_lines(chunk, line_number))
+        return
+
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(word_bank,)) as executor:
+        pending = deque()
+        for chunk, line_number in _chunks(lines, chunk_size):
+            if len(pending) >= 2 * jobs:
+                output.writelines(pending.popleft().result())
+            pending.append(executor.submit(replay_lines, chunk, line_number))
+        while pending:
+            output.writelines(pending.popleft().result())
+
+
+def _init_worker(word_bank: str | None) -> None:
+    if word_bank:
+        load_word_bank(word_bank)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Replays JSONL Hangman game scripts and prints JSONL results.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file with the scripts, stdin by default")
+    parser.add_argument("--output", default="-", help="where to write the results, stdout by default")
+    parser.add_argument("--word-bank", help="path to a word bank file to generate the seeded puzzles from")
+    parser.add_argument("--jobs", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="scripts per worker task")
+    args = parser.parse_args(argv)
+
+    if args.word_bank:
+        load_word_bank(args.word_bank)
+
+    input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output_file = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        replay_stream(input_file, output_file, args.jobs, args.chunk_size, args.word_bank)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,35 +5,69 @@ DIFFICULTY_LEVELS = [6, 3, 2, 1]
 MAX_DIFFICULTY = len(DIFFICULTY_LEVELS)
 
 
+PICTURE_TEMPLATE = dedent("""\
+        +---+
+        |   |
+        |   {0}
+        |  {2}{1}{3}
+        |  {4} {5}
+        |
+        =======
+        """)
+
+
+def count_parts_drawn(mistakes: int, difficulty: int) -> int:
+    """
+    Returns the number of hangman parts drawn after the given number of mistakes at the difficulty level.
+    """
+    parts_per_mistake = DIFFICULTY_LEVELS[0] // DIFFICULTY_LEVELS[difficulty - 1]
+    return min(mistakes * parts_per_mistake, len(HANGMAN_PARTS))
+
+
+PARTS_DRAWN = tuple(
+    tuple(HANGMAN_PARTS[:count] + [' '] * (len(HANGMAN_PARTS) - count)) for count in range(len(HANGMAN_PARTS) + 1)
+)
+PICTURES = tuple(PICTURE_TEMPLATE.format(*parts) for parts in PARTS_DRAWN)
+PICTURES_BYTES = tuple(picture.encode() for picture in PICTURES)
+
+
 class HangmanRepresentation:
+    """
+    The hangman picture of a game. All the pictures are built at import (see PICTURES),
+    so the representation only keeps the number of drawn parts.
+    """
+    __slots__ = ('_parts_drawn',)
+
     def __init__(self):
-        self.hangman_parts_drawn = [' '] * DIFFICULTY_LEVELS[0]
+        self._parts_drawn = 0
 
     def update_hangman_parts(self, mistakes, difficulty) -> None:
         """
         Updates the hangman picture depending on the error number and difficulty level.
+        Parts are only ever added: a lower number of mistakes than before leaves the picture as it is.
         Args:
             mistakes (int): number of mistakes made.
             difficulty (int): Difficulty level, from 1 to MAX_DIFFICULTY.
         """
-        parts_per_mistake = DIFFICULTY_LEVELS[0] // DIFFICULTY_LEVELS[difficulty-1]
-        end = mistakes * parts_per_mistake
-        self.hangman_parts_drawn[0:end] = HANGMAN_PARTS[0:end]
+        self._parts_drawn = max(self._parts_drawn, count_parts_drawn(mistakes, difficulty))
+
+    @property
+    def hangman_parts_drawn(self) -> list[str]:
+        return list(PARTS_DRAWN[self._parts_drawn])
 
     @property
     def hangman_picture(self) -> str:
         """
-        Generates a string representing the current picture of the hangman.
+        Returns a string representing the current picture of the hangman.
         """
-        return dedent(f"""\
-        +---+
-        |   |
-        |   {self.hangman_parts_drawn[0]}
-        |  {self.hangman_parts_drawn[2]}{self.hangman_parts_drawn[1]}{self.hangman_parts_drawn[3]}
-        |  {self.hangman_parts_drawn[4]} {self.hangman_parts_drawn[5]}
-        |
-        =======
-        """)
+        return PICTURES[self._parts_drawn]
+
+    @property
+    def hangman_picture_bytes(self) -> bytes:
+        """
+        Returns the current picture of the hangman encoded in UTF-8.
+        """
+        return PICTURES_BYTES[self._parts_drawn]
 
     def display(self) -> None:
         """
@@ -0,0 +1,206 @@
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass, astuple, fields
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 0.05
+# Attempts to write a batch while the database is locked by another connection (each waits for the busy timeout).
+LOCKED_ATTEMPTS = 3
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS game_results (
+        id INTEGER PRIMARY KEY,
+        player TEXT NOT NULL,
+        category TEXT NOT NULL,
+        word TEXT NOT NULL,
+        difficulty INTEGER NOT NULL,
+        mistakes INTEGER NOT NULL,
+        score INTEGER NOT NULL,
+        won INTEGER NOT NULL,
+        duration REAL NOT NULL,
+        guesses TEXT NOT NULL,
+        finished_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS game_results_by_player ON game_results (player, finished_at);
+    CREATE INDEX IF NOT EXISTS game_results_by_word ON game_results (word);
+"""
+
+
+@dataclass(frozen=True)
+class GameResult:
+    player: str
+    category: str
+    word: str
+    difficulty: int
+    mistakes: int
+    score: int
+    won: bool
+    duration: float
+    guesses: str
+    finished_at: float
+
+
+@dataclass(frozen=True)
+class WordStats:
+    word: str
+    games: int
+    wins: int
+    average_mistakes: float
+    average_score: float
+
+
+_COLUMNS = ", ".join(field.name for field in fields(GameResult))
+_INSERT = f"INSERT INTO game_results ({_COLUMNS}) VALUES ({', '.join('?' * len(fields(GameResult)))})"
+_STOP = object()
+
+
+class ResultStore:
+    """
+    Stores finished games in an SQLite database.
+
+    record() only puts the result into a queue; a background thread writes the queued results
+    in one transaction per batch_size results or per flush_interval seconds, whichever comes first.
+    The database works in WAL mode, so the query helpers do not wait for the writer.
+
+    A batch that cannot be written is dropped: the first failure is reported to stderr, and the next flush()
+    or close() raises RuntimeError. Only a locked database is retried, up to LOCKED_ATTEMPTS times.
+    """
+    def __init__(self, path: str | os.PathLike, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.path = os.fspath(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._read_lock = threading.Lock()
+        self.dropped_results = 0
+        # The last error that dropped results and the number of the dropped results not reported yet.
+        self.error: sqlite3.Error | None = None
+        self._unreported_drops = 0
+
+        connection = self._connect()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        connection.close()
+        self._reader = self._connect(check_same_thread=False)
+
+        self._writer = threading.Thread(target=self._write_batches, name="result-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def record(self, result: GameResult) -> None:
+        """
+        Queues a result for writing. Never blocks.
+        """
+        self._queue.put_nowait(result)
+
+    def flush(self) -> None:
+        """
+        Waits until every queued result is committed.
+
+        Raises:
+            RuntimeError: If results were dropped since the previous flush() or close().
+        """
+        self._queue.join()
+        self._raise_if_dropped()
+
+    def close(self) -> None:
+        """
+        Commits the queued results and stops the writer.
+
+        Raises:
+            RuntimeError: If results were dropped since the previous flush() or close().
+        """
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._reader.close()
+        self._raise_if_dropped()
+
+    def _raise_if_dropped(self) -> None:
+        if self._unreported_drops:
+            dropped, self._unreported_drops = self._unreported_drops, 0
+            raise RuntimeError(f"{dropped} game results were not written to {self.path}") from self.error
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write_batches(self) -> None:
+        connection = self._connect()
+        stopped = False
+        while not stopped:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            stopped = batch[-1] is _STOP
+            results = [astuple(result) for result in batch if result is not _STOP]
+            try:
+                if results:
+                    self._write(connection, results)
+            except sqlite3.Error as error:
+                self._drop(len(results), error)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        connection.close()
+
+    @staticmethod
+    def _write(connection: sqlite3.Connection, results: list[tuple]) -> None:
+        for attempt in range(1, LOCKED_ATTEMPTS + 1):
+            try:
+                with connection:
+                    connection.executemany(_INSERT, results)
+                return
+            except sqlite3.OperationalError as error:
+                # Errors other than a lock (a wrong schema, a full disk) would fail again.
+                is_locked = error.sqlite_errorcode in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+                if not is_locked or attempt == LOCKED_ATTEMPTS:
+                    raise
+
+    def _drop(self, count: int, error: sqlite3.Error) -> None:
+        if self.error is None:
+            print(f"Cannot write game results to {self.path}: {error}", file=sys.stderr)
+        self.error = error
+        self.dropped_results += count
+        self._unreported_drops += count
+
+    def _query(self, sql: str, parameters: tuple) -> list[tuple]:
+        with self._read_lock:
+            return self._reader.execute(sql, parameters).fetchall()
+
+    def player_history(self, player: str, limit: int = 20) -> list[GameResult]:
+        """
+        Returns the last games of the player, the most recent first.
+        """
+        rows = self._query(
+            f"SELECT {_COLUMNS} FROM game_results WHERE player = ? ORDER BY finished_at DESC, id DESC LIMIT ?",
+            (player, limit))
+        return [GameResult(*row[:6], bool(row[6]), *row[7:]) for row in rows]
+
+    def word_stats(self, word: str) -> WordStats:
+        """
+        Returns the number of games, wins and average results of the games played on the word.
+        """
+        games, wins, average_mistakes, average_score = self._query(
+            "SELECT COUNT(*), COALESCE(SUM(won), 0), COALESCE(AVG(mistakes), 0), COALESCE(AVG(score), 0) "
+            "FROM game_results WHERE word = ?",
+            (word,))[0]
+        return WordStats(word, games, wins, average_mistakes, average_score)
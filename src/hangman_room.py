@@ -0,0 +1,417 @@
+import argparse
+import asyncio
+import contextlib
+import io
+from collections import deque
+from collections.abc import Callable
+from enum import StrEnum
+
+from src.hangman_game import GameEvent, HangmanGame, SpecialCommand, parse_category, parse_difficulty
+from src.hangman_puzzle_generator import Category
+from src.hangman_renderer import TerminalRenderer
+from src.hangman_server import (DEFAULT_HOST, DEFAULT_IDLE_TIMEOUT, DEFAULT_PORT, WRITE_BUFFER_HIGH_WATER,
+                               HangmanServer)
+
+# A member whose unsent messages take more than this is sent a snapshot instead of them when it catches up.
+MAX_PENDING_BYTES = 16 * 1024
+NO_LETTERS = "-"
+
+
+class RoomMode(StrEnum):
+    TURNS = "turns"
+    FREE_FOR_ALL = "free"
+
+
+# Messages of the room protocol, one line each. Every broadcast message has a sequence number,
+# so a client can tell that it has missed messages; a snapshot replaces all the messages before it.
+def encode_snapshot(seq: int, guessed_part: str, mistakes: int, max_mistakes: int, asked: str,
+                    turn: str | None = None) -> bytes:
+    """
+    "= seq masked_word mistakes/max_mistakes asked_letters [player]": the whole state of the round
+    and whose turn it is in the TURNS mode.
+    """
+    line = f"= {seq} {guessed_part} {mistakes}/{max_mistakes} {asked or NO_LETTERS}"
+    return f"{line} {turn}\n".encode() if turn is not None else f"{line}\n".encode()
+
+
+def encode_delta(seq: int, player: str, letter: str, positions: tuple[int, ...], mistakes: int) -> bytes:
+    """
+    "+ seq player letter positions mistakes": an accepted guess, with the positions it revealed ("-" on a miss).
+    """
+    revealed = ",".join(map(str, positions)) or NO_LETTERS
+    return f"+ {seq} {player} {letter} {revealed} {mistakes}\n".encode()
+
+
+def encode_turn(seq: int, player: str) -> bytes:
+    """
+    "> seq player": whose turn it is.
+    """
+    return f"> {seq} {player}\n".encode()
+
+
+def encode_end(seq: int, won: bool, word: str) -> bytes:
+    """
+    "! seq won|lost word": the end of the round.
+    """
+    return f"! {seq} {'won' if won else 'lost'} {word}\n".encode()
+
+
+class RoomView:
+    """
+    The state of a room rebuilt by a client from the snapshots and the deltas it receives.
+    """
+    def __init__(self):
+        self.seq = None
+        self.guessed_part = []
+        self.mistakes = 0
+        self.max_mistakes = 0
+        self.asked = set()
+        self.turn = None
+        self.result = None
+
+    def apply(self, line: str) -> None:
+        """
+        Raises:
+            ValueError: If a delta does not follow the previous message, so a snapshot is needed.
+        """
+        kind, seq, *fields = line.split()
+        seq = int(seq)
+        if kind == "=":
+            guessed_part, mistakes, asked, *turn = fields
+            self.guessed_part = list(guessed_part)
+            self.mistakes, self.max_mistakes = map(int, mistakes.split("/"))
+            self.asked = set() if asked == NO_LETTERS else set(asked)
+            self.turn = turn[0] if turn else None
+            self.result = None
+        elif self.seq is None or seq != self.seq + 1:
+            raise ValueError(f"Message {seq} does not follow message {self.seq}")
+        elif kind == "+":
+            _, letter, positions, mistakes = fields
+            if positions != NO_LETTERS:
+                for pos in map(int, positions.split(",")):
+                    self.guessed_part[pos] = letter
+            self.asked.add(letter)
+            self.mistakes = int(mistakes)
+        elif kind == ">":
+            self.turn = fields[0]
+        elif kind == "!":
+            self.result = fields[0]
+        self.seq = seq
+
+    @property
+    def word(self) -> str:
+        return "".join(self.guessed_part)
+
+
+class RoomMember:
+    """
+    A player or a spectator of a room with the queue of the messages not yet sent to it.
+
+    The room puts the same encoded messages into the queues of all the members. If a member does not keep up and
+    its queue grows over max_pending_bytes, the queue is dropped and the member gets a snapshot of the room
+    when it asks for the next messages: a slow consumer neither holds the room back nor makes it buffer
+    without a bound.
+    """
+    __slots__ = ('room', 'name', 'is_player', 'dropped', '_queue', '_pending_bytes', '_needs_snapshot',
+                 '_max_pending_bytes', '_on_message')
+
+    def __init__(self, room: "HangmanRoom", name: str, is_player: bool, max_pending_bytes: int,
+                 on_message: Callable[[], None] | None):
+        self.room = room
+        self.name = name
+        self.is_player = is_player
+        # The number of times the queue was replaced by a snapshot.
+        self.dropped = 0
+        self._queue = deque()
+        self._pending_bytes = 0
+        self._needs_snapshot = True
+        self._max_pending_bytes = max_pending_bytes
+        self._on_message = on_message
+
+    def push(self, data: bytes) -> None:
+        if self._needs_snapshot:
+            return
+        if self._pending_bytes + len(data) > self._max_pending_bytes:
+            self._queue.clear()
+            self._pending_bytes = 0
+            self._needs_snapshot = True
+            self.dropped += 1
+        else:
+            was_empty = not self._queue
+            self._queue.append(data)
+            self._pending_bytes += len(data)
+            if not was_empty:
+                return
+        if self._on_message is not None:
+            self._on_message()
+
+    def has_messages(self) -> bool:
+        return self._needs_snapshot or bool(self._queue)
+
+    def take(self) -> bytes:
+        """
+        Returns the messages to send to the member (or a snapshot of the room) and empties the queue.
+        """
+        if self._needs_snapshot:
+            self._needs_snapshot = False
+            return self.room.snapshot()
+        data = b"".join(self._queue)
+        self._queue.clear()
+        self._pending_bytes = 0
+        return data
+
+
+class HangmanRoom:
+    """
+    A puzzle guessed together by the players of a room and watched by its spectators, as an I/O-free core:
+    the front end feeds the guesses of the members and sends them the messages taken from RoomMember.
+
+    In the TURNS mode the players guess one after another in the order they joined, in the FREE_FOR_ALL mode
+    anyone can guess at any time. Every accepted guess is encoded once as a delta (see encode_delta),
+    not as the whole screen, and the same bytes are queued for every member. When a round is over,
+    the next one starts with a new puzzle.
+    """
+    def __init__(self, name: str, mode: RoomMode = RoomMode.FREE_FOR_ALL,
+                 category: Category | str = Category.RANDOM_FLAG, difficulty: int | str = Category.RANDOM_FLAG,
+                 max_pending_bytes: int = MAX_PENDING_BYTES):
+        self.name = name
+        self.mode = mode
+        self.category = category
+        self.difficulty = difficulty
+        self.max_pending_bytes = max_pending_bytes
+        self.members: list[RoomMember] = []
+        self.players: list[RoomMember] = []
+        self.seq = 0
+        self.rounds = 0
+        self._turn = 0
+        self._snapshot = None
+        self.game = HangmanGame(renderer=TerminalRenderer(io.StringIO()))
+        self._start_round()
+
+    def join(self, name: str, is_player: bool = True, on_message: Callable[[], None] | None = None) -> RoomMember:
+        """
+        Adds a member, who gets a snapshot of the room first.
+
+        Args:
+            on_message: Called when the member gets messages after it has taken all the previous ones.
+
+        Raises:
+            ValueError: If the name is empty or has whitespace.
+        """
+        if not name or name != "".join(name.split()):
+            raise ValueError(f"Invalid member name: {name!r}")
+        member = RoomMember(self, name, is_player, self.max_pending_bytes, on_message)
+        self.members.append(member)
+        if is_player:
+            self.players.append(member)
+            if self.mode == RoomMode.TURNS and len(self.players) == 1:
+                self._broadcast(encode_turn, name)
+        if on_message is not None:
+            on_message()
+        return member
+
+    def leave(self, member: RoomMember) -> None:
+        if member not in self.members:
+            return
+        self.members.remove(member)
+        if not member.is_player:
+            return
+        ind = self.players.index(member)
+        was_turn = self.current_player() is member
+        self.players.remove(member)
+        if ind < self._turn:
+            self._turn -= 1
+        if self.players:
+            self._turn %= len(self.players)
+            if was_turn and self.mode == RoomMode.TURNS:
+                self._broadcast(encode_turn, self.players[self._turn].name)
+
+    def current_player(self) -> RoomMember | None:
+        """
+        Returns the player whose turn it is, or None in the FREE_FOR_ALL mode.
+        """
+        if self.mode != RoomMode.TURNS or not self.players:
+            return None
+        return self.players[self._turn]
+
+    def guess(self, member: RoomMember, line: str) -> str | None:
+        """
+        Processes a line entered by a member.
+
+        Returns:
+            str | None: The message for this member only (a hint or why the guess is not accepted),
+            or None if the guess was accepted and broadcast.
+        """
+        if line.lower().strip() == SpecialCommand.STOP_WORD:
+            self.leave(member)
+            return "You left the room.\n"
+        if not member.is_player:
+            return "Spectators cannot guess.\n"
+        if self.mode == RoomMode.TURNS and self.current_player() is not member:
+            return f"It is {self.current_player().name}'s turn.\n"
+
+        event, message = self.game.process_guess(line)
+        if event not in (GameEvent.HIT, GameEvent.MISS):
+            return message or "Please, enter a letter.\n"
+
+        letter = line.lower().strip()
+        puzzle = self.game.hangman_puzzle
+        self._broadcast(encode_delta, member.name, letter, puzzle.get_letter_positions(letter), self.game.mistakes)
+        if self.game.is_over():
+            self._broadcast(encode_end, puzzle.get_is_guessed(), puzzle.get_puzzle().get_word())
+            self._start_round()
+        elif self.mode == RoomMode.TURNS and len(self.players) > 1:
+            self._turn = (self._turn + 1) % len(self.players)
+            self._broadcast(encode_turn, self.players[self._turn].name)
+        return None
+
+    def snapshot(self) -> bytes:
+        """
+        Returns the encoded state of the round, built once per change of the room.
+        """
+        if self._snapshot is None:
+            puzzle = self.game.hangman_puzzle
+            asked = "".join(letter for letter in puzzle.get_alphabet() if puzzle.is_letter_asked(letter))
+            player = self.current_player()
+            self._snapshot = encode_snapshot(self.seq, "".join(puzzle.get_guessed_part()), self.game.mistakes,
+                                             self.game.max_mistakes, asked, player.name if player else None)
+        return self._snapshot
+
+    def _start_round(self) -> None:
+        self.game.reset_game()
+        self.game.start_game(self.category, self.difficulty)
+        self.rounds += 1
+        self.seq += 1
+        self._snapshot = None
+        for member in self.members:
+            member.push(self.snapshot())
+
+    def _broadcast(self, encode: Callable[..., bytes], *fields) -> None:
+        """
+        Encodes a message with the next sequence number once and queues it for every member.
+        """
+        self.seq += 1
+        self._snapshot = None
+        data = encode(self.seq, *fields)
+        for member in self.members:
+            member.push(data)
+
+
+class HangmanRoomServer(HangmanServer):
+    """
+    Line-protocol TCP server of rooms. The first line of a connection is "join <room> <player>" to play
+    or "watch <room>" to watch; then every line is a guess, and the room messages (see HangmanRoom) are sent
+    as they come. Writing to a connection waits for the socket, while the messages of a slow connection
+    are replaced by a snapshot (see RoomMember).
+    """
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT, mode: RoomMode = RoomMode.FREE_FOR_ALL,
+                 category: Category | str = Category.RANDOM_FLAG, difficulty: int | str = Category.RANDOM_FLAG):
+        super().__init__(host, port, idle_timeout)
+        self.mode = mode
+        self.category = category
+        self.difficulty = difficulty
+        self.rooms: dict[str, HangmanRoom] = {}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH_WATER)
+        self.active_sessions += 1
+        member = None
+        sender = None
+        try:
+            await self._send(writer, "Enter 'join <room> <player>' to play or 'watch <room>' to watch.\n")
+            wakeup = asyncio.Event()
+            member = await self._join(reader, writer, wakeup.set)
+            if member is None:
+                return
+            sender = asyncio.create_task(self._send_messages(member, writer, wakeup))
+            # Spectators only listen, so they are not disconnected when idle.
+            idle_timeout = self.idle_timeout if member.is_player else None
+            while not sender.done() and member in member.room.members:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), idle_timeout)
+                except (TimeoutError, ValueError):
+                    break
+                if not line:
+                    break
+                reply = member.room.guess(member, line.decode("utf-8", errors="replace"))
+                if reply is not None:
+                    writer.write(f"? {reply.strip()}\n".encode())
+        except ConnectionError:
+            pass
+        finally:
+            self.active_sessions -= 1
+            if member is not None:
+                self._leave(member)
+            if sender is not None:
+                sender.cancel()
+                with contextlib.suppress(asyncio.CancelledError, ConnectionError):
+                    await sender
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _join(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                    on_message: Callable[[], None]) -> RoomMember | None:
+        while True:
+            try:
+                line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+            except (TimeoutError, ValueError):
+                return None
+            if not line:
+                return None
+            command = line.decode("utf-8", errors="replace").split()
+            if len(command) == 3 and command[0] == "join":
+                return self._room(command[1]).join(command[2], True, on_message)
+            if len(command) == 2 and command[0] == "watch":
+                return self._room(command[1]).join("spectator", False, on_message)
+            await self._send(writer, "? Enter 'join <room> <player>' or 'watch <room>'.\n")
+
+    def _room(self, name: str) -> HangmanRoom:
+        room = self.rooms.get(name)
+        if room is None:
+            room = self.rooms[name] = HangmanRoom(name, self.mode, self.category, self.difficulty)
+        return room
+
+    def _leave(self, member: RoomMember) -> None:
+        room = member.room
+        room.leave(member)
+        if not room.members and self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+
+    @staticmethod
+    async def _send_messages(member: RoomMember, writer: asyncio.StreamWriter, wakeup: asyncio.Event) -> None:
+        """
+        Sends the messages of the member as they come. While a write waits for the socket,
+        new messages pile up in the member queue and go out with the next write.
+        """
+        while True:
+            await wakeup.wait()
+            wakeup.clear()
+            while member.has_messages():
+                writer.write(member.take())
+                await writer.drain()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Hangman rooms server: players guess the same word together.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT, help="seconds")
+    parser.add_argument("--mode", choices=[mode.value for mode in RoomMode], default=RoomMode.FREE_FOR_ALL,
+                        help="'turns' to guess one after another, 'free' to guess at any time")
+    parser.add_argument("--category", default=Category.RANDOM_FLAG, help="category of the puzzles")
+    parser.add_argument("--difficulty", default=Category.RANDOM_FLAG, help="difficulty level of the puzzles")
+    args = parser.parse_args(argv)
+    category = parse_category(args.category)
+    difficulty = parse_difficulty(args.difficulty)
+    if category is None or difficulty is None:
+        parser.error("invalid category or difficulty level")
+
+    server = HangmanRoomServer(args.host, args.port, args.idle_timeout, RoomMode(args.mode), category, difficulty)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.serve_forever())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import contextlib
+
+from src.hangman_bank_watcher import DEFAULT_POLL_INTERVAL, watch_word_bank
+from src.hangman_puzzle_generator import load_word_bank
+from src.hangman_session import HangmanSession
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+DEFAULT_IDLE_TIMEOUT = 300.0
+MAX_LINE_LENGTH = 1024
+WRITE_BUFFER_HIGH_WATER = 64 * 1024
+
+
+class HangmanServer:
+    """
+    Line-protocol TCP server: every connection plays one HangmanSession.
+    The player sends lines of text (UTF-8) and receives the text of the session replies.
+    """
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT, session_factory=HangmanSession):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.session_factory = session_factory
+        self.active_sessions = 0
+        self._server = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self.handle_connection, self.host, self.port,
+                                                  limit=MAX_LINE_LENGTH)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Runs a session until it is finished, the client disconnects or stays idle for idle_timeout seconds.
+        Every reply is sent with a single write; the writer is drained only when its buffer is over the limit.
+        """
+        loop = asyncio.get_running_loop()
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH_WATER)
+        session = self.session_factory()
+        self.active_sessions += 1
+        try:
+            await self._send(writer, session.start().output)
+            while not session.finished:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except TimeoutError:
+                    await self._send(writer, "Idle timeout, bye!\n")
+                    break
+                except ValueError:
+                    await self._send(writer, "Line is too long, bye!\n")
+                    break
+                if not line:
+                    break
+                # Starting a game or composing a hint may build an index of the word bank on first use,
+                # so the lines are processed off the event loop to keep the other connections responsive.
+                reply = await loop.run_in_executor(None, session.feed, line.decode("utf-8", errors="replace"))
+                await self._send(writer, reply.output)
+        except ConnectionError:
+            pass
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, text: str) -> None:
+        writer.write(text.encode("utf-8"))
+        await writer.drain()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Hangman game server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT, help="seconds")
+    parser.add_argument("--word-bank", help="path to a word bank file to take the puzzles from")
+    parser.add_argument("--word-bank-cache", help="path to a cache of the word bank indexes to start faster")
+    parser.add_argument("--watch-word-bank", action="store_true",
+                        help="reload the word bank when the file is replaced, without stopping the games")
+    parser.add_argument("--watch-interval", type=float, default=DEFAULT_POLL_INTERVAL, help="seconds between checks")
+    args = parser.parse_args(argv)
+    if args.watch_word_bank and not args.word_bank:
+        parser.error("--watch-word-bank needs --word-bank")
+
+    if args.word_bank:
+        load_word_bank(args.word_bank, args.word_bank_cache)
+    if args.watch_word_bank:
+        watch_word_bank(args.word_bank, args.word_bank_cache, args.watch_interval)
+
+    server = HangmanServer(args.host, args.port, args.idle_timeout)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.serve_forever())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import io
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+from src.hangman_game import (GameEvent, HangmanGame, category_prompt, difficulty_prompt, parse_category,
+                              parse_difficulty, report_game_parameters_and_info)
+from src.hangman_renderer import TerminalRenderer
+
+
+class SessionState(StrEnum):
+    CHOOSING_CATEGORY = "choosing_category"
+    CHOOSING_DIFFICULTY = "choosing_difficulty"
+    GUESSING = "guessing"
+    FINISHED = "finished"
+
+
+@dataclass
+class SessionReply:
+    events: list[GameEvent] = field(default_factory=list)
+    output: str = ""
+
+
+class HangmanSession:
+    """
+    One game of Hangman as an I/O-free state machine: every line entered by the player is fed to the session,
+    which returns the events and the text to show. The screen is drawn as plain text frames.
+    """
+    def __init__(self, game: HangmanGame | None = None):
+        self._screen = io.StringIO()
+        self.game = game if game is not None else HangmanGame()
+        self.game.renderer = TerminalRenderer(self._screen)
+        self.state = SessionState.CHOOSING_CATEGORY
+        self._category = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state == SessionState.FINISHED
+
+    def start(self) -> SessionReply:
+        self.game.reset_game()
+        self.state = SessionState.CHOOSING_CATEGORY
+        return SessionReply(output=HangmanGame.report_game_intro() + category_prompt())
+
+    def feed(self, line: str) -> SessionReply:
+        """
+        Processes a line entered by the player.
+
+        Raises:
+            RuntimeError: If the session is finished.
+        """
+        if self.state == SessionState.CHOOSING_CATEGORY:
+            return self._choose_category(line)
+        if self.state == SessionState.CHOOSING_DIFFICULTY:
+            return self._choose_difficulty(line)
+        if self.state == SessionState.GUESSING:
+            return self._guess(line)
+        raise RuntimeError("The session is finished.")
+
+    def _choose_category(self, line: str) -> SessionReply:
+        category = parse_category(line)
+        if category is None:
+            return SessionReply([GameEvent.INVALID_INPUT], "ERROR! INVALID INPUT\n")
+
+        self._category = category
+        self.state = SessionState.CHOOSING_DIFFICULTY
+        return SessionReply([GameEvent.CATEGORY_SET], "ACCEPTED\n\n" + difficulty_prompt())
+
+    def _choose_difficulty(self, line: str) -> SessionReply:
+        difficulty = parse_difficulty(line)
+        if difficulty is None:
+            return SessionReply([GameEvent.INVALID_INPUT], "ERROR! INVALID INPUT.\n\n")
+
+        category, difficulty = self.game.start_game(self._category, difficulty)
+        self.state = SessionState.GUESSING
+        output = "ACCEPTED\n\n" + report_game_parameters_and_info(category, difficulty)
+        return SessionReply([GameEvent.DIFFICULTY_SET, GameEvent.GAME_STARTED], output + self._frame(""))
+
+    def _guess(self, line: str) -> SessionReply:
+        event, message = self.game.process_guess(line)
+        if event == GameEvent.QUIT:
+            self.state = SessionState.FINISHED
+            return SessionReply([event, GameEvent.LOST], self.game.finish_game() + "\n")
+
+        if not self.game.is_over():
+            return SessionReply([event], self._frame(message))
+
+        self.state = SessionState.FINISHED
+        result = GameEvent.WON if self.game.hangman_puzzle.get_is_guessed() else GameEvent.LOST
+        output = self._frame(message, prompt="") + self.game.finish_game() + "\n"
+        return SessionReply([event, result], output)
+
+    def _frame(self, message: str, prompt: str = "Guess a letter:") -> str:
+        self.game.render_screen(message, prompt)
+        frame = self._screen.getvalue()
+        self._screen.seek(0)
+        self._screen.truncate()
+        return frame
@@ -0,0 +1,311 @@
+import argparse
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency, installed with the "simulation" extra.
+    np = None
+
+from src.hangman_alphabet import LATIN, Alphabet
+from src.hangman_puzzle_generator import Category, PUZZLES_BY_CATEGORY_LIST
+from src.hangman_representation import DIFFICULTY_LEVELS, MAX_DIFFICULTY
+from src.hangman_word_difficulty import DifficultyIndex
+
+DEFAULT_BATCH_SIZE = 65536
+# The largest size of the candidate bitmaps of a batch of CandidateFilteringStrategy, in bytes.
+MAX_CANDIDATE_BYTES = 64 << 20
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("The simulator requires NumPy, install it with the 'simulation' extra.")
+
+
+class WordMatrix:
+    """
+    A list of words encoded as NumPy arrays, with a column per letter of the alphabet:
+    - presence: (words, letters) bool matrix, True if the word contains the letter;
+    - positions: (words, letters) int64 matrix, bitmask of the positions the letter takes in the word;
+    - lengths: (words,) vector of word lengths.
+    """
+    def __init__(self, words: list[str], alphabet: Alphabet = LATIN):
+        require_numpy()
+        if not words:
+            raise ValueError("Word list is empty.")
+
+        self.words = list(words)
+        self.alphabet = alphabet
+        self.presence = np.zeros((len(words), len(alphabet)), dtype=bool)
+        self.positions = np.zeros((len(words), len(alphabet)), dtype=np.int64)
+        self.lengths = np.array([len(word) for word in words], dtype=np.int64)
+        for word_ind, word in enumerate(self.words):
+            for pos, letter in enumerate(word):
+                letter_ind = alphabet.index(letter)
+                self.presence[word_ind, letter_ind] = True
+                self.positions[word_ind, letter_ind] |= 1 << pos
+
+
+class GameBatch:
+    """
+    State of a batch of simultaneous games, one row per game.
+    """
+    def __init__(self, words: WordMatrix, targets):
+        self.words = words
+        self.targets = targets
+        self.target_presence = words.presence[targets]
+        self.guessed = np.zeros((len(targets), len(words.alphabet)), dtype=bool)
+        self.mistakes = np.zeros(len(targets), dtype=np.int64)
+        self.active = np.ones(len(targets), dtype=bool)
+
+
+class GuessingStrategy:
+    """
+    Base class of a guessing strategy. A strategy chooses the next letter for every game of a batch at once.
+    """
+    name = ""
+
+    def max_batch_size(self, words: WordMatrix) -> int | None:
+        """
+        Returns the largest number of games the strategy plays in one batch, or None if it is not limited.
+        """
+        return None
+
+    def start(self, batch: GameBatch, rng) -> None:
+        """
+        Called once before the first guess of the batch.
+        """
+
+    def choose(self, batch: GameBatch, rng):
+        """
+        Returns a vector with the index of the next letter for each game. The letter must not be guessed yet.
+        """
+        raise NotImplementedError
+
+    def observe(self, batch: GameBatch, letters) -> None:
+        """
+        Called after the chosen letters have been applied to the batch.
+        """
+
+
+class RandomStrategy(GuessingStrategy):
+    """
+    Guesses a uniformly random letter that has not been asked yet.
+    """
+    name = "random"
+
+    def choose(self, batch, rng):
+        keys = rng.random(batch.guessed.shape)
+        keys[batch.guessed] = 2.0
+        return keys.argmin(axis=1)
+
+
+class FrequencyStrategy(GuessingStrategy):
+    """
+    Guesses letters in the order of the number of dictionary words containing them.
+    """
+    name = "frequency"
+
+    def __init__(self):
+        self._rank = None
+
+    def start(self, batch, rng):
+        counts = batch.words.presence.sum(axis=0)
+        self._rank = np.empty(len(counts), dtype=np.int64)
+        self._rank[np.argsort(-counts, kind="stable")] = np.arange(len(counts))
+
+    def choose(self, batch, rng):
+        keys = np.broadcast_to(self._rank, batch.guessed.shape).copy()
+        keys[batch.guessed] = len(self._rank)
+        return keys.argmin(axis=1)
+
+
+class CandidateFilteringStrategy(GuessingStrategy):
+    """
+    Keeps the dictionary words consistent with everything revealed so far
+    and guesses the letter contained in the largest number of them. Ties are broken randomly.
+
+    The candidates of a game are a bitmap over the dictionary packed eight words to a byte, so a batch takes
+    a byte per eight words per game, and batches are limited to MAX_CANDIDATE_BYTES. The games of a batch
+    with the same word length, or with the same letter revealed at the same positions, are narrowed
+    by the same bitmap, built once per turn.
+    """
+    name = "optimal"
+
+    def __init__(self):
+        self._candidates = None
+        self._presence = None
+
+    def max_batch_size(self, words):
+        return max(1, MAX_CANDIDATE_BYTES // ((len(words.words) + 7) // 8))
+
+    def start(self, batch, rng):
+        words = batch.words
+        # Counts up to 2 ** 24 words are exact in float32.
+        self._presence = words.presence.astype(np.float32)
+        self._candidates = np.empty((len(batch.targets), (len(words.words) + 7) // 8), dtype=np.uint8)
+        lengths, games_lengths = np.unique(words.lengths[batch.targets], return_inverse=True)
+        for length_ind, length in enumerate(lengths):
+            self._candidates[games_lengths == length_ind] = np.packbits(words.lengths == length)
+
+    def choose(self, batch, rng):
+        word_count = len(batch.words.words)
+        # The candidates are unpacked a slice of games at a time: a byte and a float32 per word and game.
+        rows = max(1, MAX_CANDIDATE_BYTES // (5 * word_count))
+        counts = np.empty(batch.guessed.shape)
+        for start in range(0, len(counts), rows):
+            candidates = np.unpackbits(self._candidates[start:start + rows], axis=1, count=word_count)
+            counts[start:start + rows] = candidates.astype(np.float32) @ self._presence
+        counts += rng.random(counts.shape) * 0.5
+        counts[batch.guessed] = -1.0
+        return counts.argmax(axis=1)
+
+    def observe(self, batch, letters):
+        positions = batch.words.positions
+        revealed = positions[batch.targets, letters]
+        for letter in np.unique(letters):
+            games = np.flatnonzero(letters == letter)
+            masks, games_masks = np.unique(revealed[games], return_inverse=True)
+            for mask_ind, mask in enumerate(masks):
+                self._candidates[games[games_masks == mask_ind]] &= np.packbits(positions[:, letter] == mask)
+
+
+STRATEGIES = {
+    strategy.name: strategy for strategy in (RandomStrategy, FrequencyStrategy, CandidateFilteringStrategy)
+}
+
+
+def play_batch(words: WordMatrix, targets, strategy: GuessingStrategy, rng):
+    """
+    Plays every game of the batch until the word is guessed, without a mistake limit.
+
+    Args:
+        words (WordMatrix): Dictionary of the games.
+        targets (np.ndarray): Index of the hidden word of each game.
+        strategy (GuessingStrategy): Guessing strategy.
+        rng (np.random.Generator): Random generator.
+
+    Returns:
+        np.ndarray: Number of mistakes made by the moment the word was guessed, for each game.
+    """
+    batch = GameBatch(words, targets)
+    strategy.start(batch, rng)
+    rows = np.arange(len(targets))
+
+    for _ in range(len(words.alphabet)):
+        if not batch.active.any():
+            break
+        letters = strategy.choose(batch, rng)
+        batch.mistakes += batch.active & ~batch.target_presence[rows, letters]
+        batch.guessed[rows, letters] = True
+        strategy.observe(batch, letters)
+        batch.active = (batch.target_presence & ~batch.guessed).any(axis=1)
+
+    return batch.mistakes
+
+
+def simulate_games(words: list[str], games: int, strategy_name: str, seed: int | None = None,
+                   batch_size: int = DEFAULT_BATCH_SIZE,
+                   alphabet: Alphabet = LATIN) -> tuple[list[str], "np.ndarray", "np.ndarray"]:
+    """
+    Plays the given number of games on uniformly random words from the list.
+
+    Returns:
+        tuple[list[str], np.ndarray, np.ndarray]: The words, the hidden word index of each game,
+        and the number of mistakes made in each game by the moment the word was guessed.
+    """
+    require_numpy()
+    matrix = WordMatrix(words, alphabet)
+    rng = np.random.default_rng(seed)
+    strategy = STRATEGIES[strategy_name]()
+
+    max_batch_size = strategy.max_batch_size(matrix)
+    if max_batch_size is not None:
+        batch_size = min(batch_size, max_batch_size)
+
+    targets = rng.integers(0, len(words), size=games)
+    mistakes = np.empty(games, dtype=np.int64)
+    for start in range(0, games, batch_size):
+        stop = min(start + batch_size, games)
+        mistakes[start:stop] = play_batch(matrix, targets[start:stop], strategy, rng)
+    return matrix.words, targets, mistakes
+
+
+@dataclass(frozen=True)
+class CalibrationRow:
+    category: Category
+    difficulty: int
+    games: int
+    win_rate: float
+    expected_score: float
+    word: str | None = None
+
+
+def summarize(category: Category, mistakes, word: str | None = None) -> list[CalibrationRow]:
+    """
+    Converts the number of mistakes of finished games into a win rate and an expected score
+    for every difficulty level, following the rules of HangmanGame.
+    """
+    rows = []
+    for difficulty, max_mistakes in enumerate(DIFFICULTY_LEVELS, start=1):
+        won = mistakes < max_mistakes
+        scores = np.where(won, np.left_shift(1, np.maximum(DIFFICULTY_LEVELS[0] - mistakes, 0)), 0)
+        rows.append(CalibrationRow(
+            category=category,
+            difficulty=difficulty,
+            games=len(mistakes),
+            win_rate=float(won.mean()) if len(mistakes) else 0.0,
+            expected_score=float(scores.mean()) if len(mistakes) else 0.0,
+            word=word,
+        ))
+    return rows
+
+
+def build_calibration_table(games: int, strategy_name: str, seed: int | None = None,
+                            per_word: bool = False, puzzles_by_category=None) -> list[CalibrationRow]:
+    """
+    Simulates games for every category and returns win rates and expected scores per difficulty level
+    (and per word, if per_word is set). As in gen_puzzle, a difficulty level is played on the words of its band.
+    """
+    if puzzles_by_category is None:
+        puzzles_by_category = PUZZLES_BY_CATEGORY_LIST
+
+    table = []
+    for category, puzzles in puzzles_by_category.items():
+        words, targets, mistakes = simulate_games(
+            [puzzle.get_word() for puzzle in puzzles], games, strategy_name, seed, alphabet=Category(category).alphabet)
+        if per_word:
+            # The mistakes of the games are grouped by the word in one sort.
+            word_mistakes = np.split(mistakes[np.argsort(targets, kind="stable")],
+                                     np.cumsum(np.bincount(targets, minlength=len(words)))[:-1])
+            for word, mistakes_of_word in zip(words, word_mistakes):
+                table.extend(summarize(category, mistakes_of_word, word))
+        else:
+            difficulty_index = DifficultyIndex({category: puzzles})
+            for difficulty in range(1, MAX_DIFFICULTY + 1):
+                word_ids = np.frombuffer(difficulty_index.puzzles(category, difficulty).word_ids(), dtype=np.uint32)
+                band_mistakes = mistakes[np.isin(targets, word_ids)]
+                table.append(summarize(category, band_mistakes)[difficulty - 1])
+    return table
+
+
+def format_table(table: list[CalibrationRow]) -> str:
+    lines = [f"{'category':<12}{'word':<14}{'difficulty':>10}{'games':>12}{'win rate':>10}{'score':>10}"]
+    for row in table:
+        lines.append(f"{row.category:<12}{row.word or '*':<14}{row.difficulty:>10}{row.games:>12}"
+                     f"{row.win_rate:>10.3f}{row.expected_score:>10.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Headless Hangman simulator for calibrating difficulty levels.")
+    parser.add_argument("--games", type=int, default=100000, help="games per category")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default=FrequencyStrategy.name)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--per-word", action="store_true", help="report every word separately")
+    args = parser.parse_args(argv)
+
+    print(format_table(build_calibration_table(args.games, args.strategy, args.seed, args.per_word)))
+
+
+if __name__ == '__main__':
+    main()
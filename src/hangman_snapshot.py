@@ -0,0 +1,97 @@
+import struct
+from collections.abc import Mapping
+
+from src.hangman_evil_puzzle import EvilHangmanPuzzle
+from src.hangman_game import HangmanGame
+from src.hangman_puzzle_generator import BankState, Category, get_bank_state
+
+SNAPSHOT_VERSION = 4
+CATEGORIES = [category for category in Category if category != Category.RANDOM_FLAG]
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+
+# Flags of a game record.
+EVIL_FLAG = 1
+
+# version, category code, difficulty, mistakes, hints given, flags, bank tag, word id, guessed letters mask, score
+GAME_RECORD = struct.Struct('<BBBBBBHIQI')
+# the same record prefixed with a session id
+SESSION_RECORD = struct.Struct('<Q' + GAME_RECORD.format[1:])
+
+
+def _bank_tag(state: BankState, category: Category) -> int:
+    """
+    Returns the 16 low bits of the category digest, to tell whether a word id still addresses the same word.
+    """
+    return int.from_bytes(state.category_digest(category)[:2], 'little')
+
+
+def _game_fields(game: HangmanGame) -> tuple[int, ...]:
+    puzzle_id = game.hangman_puzzle.get_puzzle().get_id()
+    if puzzle_id is None:
+        raise ValueError("The puzzle of the game has no id, it is not taken from the word bank.")
+    flags = EVIL_FLAG if isinstance(game.hangman_puzzle, EvilHangmanPuzzle) else 0
+    return (SNAPSHOT_VERSION, CATEGORY_CODES[game.category], game.difficulty, game.mistakes, game.hints_given, flags,
+            _bank_tag(game.bank_state, game.category), puzzle_id, game.hangman_puzzle.get_guessed_mask(),
+            game.current_score)
+
+
+def _restore_game(version: int, category_code: int, difficulty: int, mistakes: int, hints_given: int, flags: int,
+                  bank_tag: int, puzzle_id: int, guessed_mask: int, score: int,
+                  game: HangmanGame | None = None) -> HangmanGame:
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    if category_code >= len(CATEGORIES):
+        raise ValueError(f"Unknown category code: {category_code}")
+
+    category = CATEGORIES[category_code]
+    state = get_bank_state()
+    if category not in state.word_bank or _bank_tag(state, category) != bank_tag:
+        raise ValueError(f"The puzzles of category {category} changed since the game was saved")
+    puzzles = state.word_bank[category]
+    if puzzle_id >= len(puzzles):
+        raise ValueError(f"There is no puzzle {puzzle_id} in category {category}")
+
+    if game is None:
+        game = HangmanGame()
+    game.resume_game(category, difficulty, puzzles[puzzle_id], guessed_mask, mistakes, score, hints_given,
+                     evil=bool(flags & EVIL_FLAG))
+    return game
+
+
+def snapshot_game(game: HangmanGame) -> bytes:
+    """
+    Serializes a started game into a GAME_RECORD.size-byte record.
+    The word is stored as its id in the word bank the game took it from, along with a tag of the category
+    digest, so a game is only restored if the category has the same puzzles.
+    The record of an evil game has EVIL_FLAG set and stores a word left among its candidates.
+    """
+    return GAME_RECORD.pack(*_game_fields(game))
+
+
+def restore_game(record: bytes, game: HangmanGame | None = None) -> HangmanGame:
+    """
+    Restores a game serialized by snapshot_game, into the given game object or a new one.
+
+    Raises:
+        ValueError: If the record is malformed or does not match the current word bank.
+    """
+    return _restore_game(*GAME_RECORD.unpack(record), game=game)
+
+
+def dump_games(games: Mapping[int, HangmanGame]) -> bytes:
+    """
+    Serializes many games at once, keyed by session id (an unsigned 64-bit integer).
+    """
+    records = bytearray(SESSION_RECORD.size * len(games))
+    for record_ind, (session_id, game) in enumerate(games.items()):
+        SESSION_RECORD.pack_into(records, record_ind * SESSION_RECORD.size, session_id, *_game_fields(game))
+    return bytes(records)
+
+
+def load_games(data: bytes) -> dict[int, HangmanGame]:
+    """
+    Restores the games serialized by dump_games.
+    """
+    if len(data) % SESSION_RECORD.size:
+        raise ValueError("Truncated session snapshot.")
+    return {session_id: _restore_game(*fields) for session_id, *fields in SESSION_RECORD.iter_unpack(data)}
@@ -0,0 +1,222 @@
+import hashlib
+import mmap
+import os
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+
+from src.hangman_puzzle import Puzzle
+
+FIELD_SEPARATOR = '\t'
+LINE_SEPARATOR = '\n'
+COMMENT_PREFIX = '#'
+_ESCAPES = {'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'}
+_ESCAPE_TABLE = str.maketrans(_ESCAPES)
+_UNESCAPES = {'\\': '\\', 't': '\t', 'n': '\n', 'r': '\r'}
+
+
+def escape_field(text: str) -> str:
+    """
+    Escapes backslashes, tabs and line breaks, so the text fits into a single word bank field.
+    """
+    return text.translate(_ESCAPE_TABLE)
+
+
+def unescape_field(text: str) -> str:
+    if '\\' not in text:
+        return text
+
+    chars = []
+    escaped = False
+    for char in text:
+        if escaped:
+            chars.append(_UNESCAPES.get(char, char))
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        else:
+            chars.append(char)
+    return ''.join(chars)
+
+
+def format_word_bank_line(category: str, word: str, hint: str) -> str:
+    return FIELD_SEPARATOR.join((category, word, escape_field(hint))) + LINE_SEPARATOR
+
+
+def write_word_bank(path: str | os.PathLike, puzzles_by_category: Mapping[str, Sequence[Puzzle]]) -> None:
+    """
+    Writes puzzles to a word bank file: one UTF-8 line "category<TAB>word<TAB>hint" per puzzle,
+    with tabs and line breaks of the hint escaped.
+    """
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        for category, puzzles in puzzles_by_category.items():
+            for puzzle in puzzles:
+                file.write(format_word_bank_line(category, puzzle.get_word(), puzzle.get_hint()))
+
+
+def iter_words(puzzles: Sequence[Puzzle]) -> Iterator[str]:
+    """
+    Iterates over the words of a sequence of puzzles, without building Puzzle objects if the sequence supports it.
+    """
+    fast_iter_words = getattr(puzzles, 'iter_words', None)
+    if fast_iter_words is not None:
+        return fast_iter_words()
+    return (puzzle.get_word() for puzzle in puzzles)
+
+
+def category_digest(category: str, puzzles: Sequence[Puzzle]) -> bytes:
+    """
+    Returns a digest of the word bank lines of the category puzzles, to tell whether a category changed.
+    """
+    fast_digest = getattr(puzzles, 'digest', None)
+    if fast_digest is not None:
+        return fast_digest()
+    digest = hashlib.blake2b(digest_size=16)
+    for puzzle in puzzles:
+        digest.update(format_word_bank_line(category, puzzle.get_word(), puzzle.get_hint()).encode('utf-8'))
+    return digest.digest()
+
+
+class WordBankCategory(Sequence):
+    """
+    Puzzles of one category of a word bank. Only line offsets are kept in memory,
+    a Puzzle is built when it is accessed.
+    """
+    __slots__ = ('_bank', '_offsets')
+
+    def __init__(self, bank: "WordBank", offsets: array):
+        self._bank = bank
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[ind] for ind in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self._bank.read_puzzle(self._offsets[index], index)
+
+    def __iter__(self) -> Iterator[Puzzle]:
+        for puzzle_id, offset in enumerate(self._offsets):
+            yield self._bank.read_puzzle(offset, puzzle_id)
+
+    def iter_words(self) -> Iterator[str]:
+        """
+        Iterates over the words of the category without building Puzzle objects and decoding hints.
+        """
+        for offset in self._offsets:
+            yield self._bank.read_word(offset)
+
+    def offsets(self) -> array:
+        """
+        Returns the offsets of the puzzle lines in the word bank file.
+        """
+        return self._offsets
+
+    def digest(self) -> bytes:
+        """
+        Returns the digest of the category lines (see category_digest) without building Puzzle objects.
+        """
+        return self._bank.digest_lines(self._offsets)
+
+
+class WordBank(Mapping):
+    """
+    Word bank stored in a file (see write_word_bank for the format) and read through mmap.
+
+    Opening the bank builds an index of line offsets per category; the file contents stay in the page cache,
+    so memory usage and startup time do not depend on the length of the hints.
+    If the offsets were built before for the same file (see hangman_bank_cache), they can be passed instead.
+    """
+    def __init__(self, path: str | os.PathLike, offsets_by_category: Mapping[str, array] | None = None):
+        self._path = os.fspath(path)
+        self._file = open(self._path, 'rb')
+        if os.fstat(self._file.fileno()).st_size:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._data = b''
+        if offsets_by_category is None:
+            offsets_by_category = self._build_index()
+        self._categories = {
+            category: WordBankCategory(self, offsets) for category, offsets in offsets_by_category.items()
+        }
+
+    def _build_index(self) -> dict[str, array]:
+        data = self._data
+        size = len(data)
+        separator = FIELD_SEPARATOR.encode()
+        skipped_starts = (COMMENT_PREFIX.encode(), b'\r')
+        offsets_by_key: dict[bytes, array] = {}
+
+        pos = 0
+        while pos < size:
+            end = data.find(b'\n', pos)
+            if end == -1:
+                end = size
+            if end > pos and data[pos:pos + 1] not in skipped_starts:
+                separator_pos = data.find(separator, pos, end)
+                if separator_pos == -1:
+                    raise ValueError(f"Malformed word bank line at offset {pos} of {self._path}")
+                key = data[pos:separator_pos]
+                offsets = offsets_by_key.get(key)
+                if offsets is None:
+                    offsets = offsets_by_key[key] = array('Q')
+                offsets.append(pos)
+            pos = end + 1
+
+        return {key.decode('utf-8'): offsets for key, offsets in offsets_by_key.items()}
+
+    def _line_end(self, offset: int) -> int:
+        end = self._data.find(b'\n', offset)
+        if end == -1:
+            end = len(self._data)
+        if end > offset and self._data[end - 1:end] == b'\r':
+            end -= 1
+        return end
+
+    def read_puzzle(self, offset: int, puzzle_id: int | None = None) -> Puzzle:
+        line = self._data[offset:self._line_end(offset)].decode('utf-8')
+        fields = line.split(FIELD_SEPARATOR, 2)
+        hint = fields[2] if len(fields) > 2 else ""
+        return Puzzle(word=fields[1], hint=unescape_field(hint), puzzle_id=puzzle_id)
+
+    def read_word(self, offset: int) -> str:
+        end = self._line_end(offset)
+        start = self._data.find(b'\t', offset, end) + 1
+        word_end = self._data.find(b'\t', start, end)
+        return self._data[start:end if word_end == -1 else word_end].decode('utf-8')
+
+    def digest_lines(self, offsets: Sequence[int]) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        for offset in offsets:
+            digest.update(self._data[offset:self._line_end(offset)])
+            digest.update(LINE_SEPARATOR.encode())
+        return digest.digest()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __getitem__(self, category: str) -> WordBankCategory:
+        return self._categories[category]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._categories)
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+    def close(self) -> None:
+        """
+        Closes the file. Puzzles that were already read stay valid.
+        """
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> "WordBank":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,130 @@
+import math
+from array import array
+from collections.abc import Mapping, Sequence
+
+from src.hangman_puzzle import Puzzle
+from src.hangman_representation import MAX_DIFFICULTY
+from src.hangman_word_bank import iter_words
+
+LETTER_FREQUENCIES = {
+    'a': 8.167, 'b': 1.492, 'c': 2.782, 'd': 4.253, 'e': 12.702, 'f': 2.228, 'g': 2.015, 'h': 6.094, 'i': 6.966,
+    'j': 0.153, 'k': 0.772, 'l': 4.025, 'm': 2.406, 'n': 6.749, 'o': 7.507, 'p': 1.929, 'q': 0.095, 'r': 5.987,
+    's': 6.327, 't': 9.056, 'u': 2.758, 'v': 0.978, 'w': 2.360, 'x': 0.150, 'y': 1.974, 'z': 0.074,
+}
+CYRILLIC_LETTER_FREQUENCIES = {
+    'а': 8.01, 'б': 1.59, 'в': 4.54, 'г': 1.70, 'д': 2.98, 'е': 8.45, 'ё': 0.04, 'ж': 0.94, 'з': 1.65, 'и': 7.35,
+    'й': 1.21, 'к': 3.49, 'л': 4.40, 'м': 3.21, 'н': 6.70, 'о': 10.97, 'п': 2.81, 'р': 4.73, 'с': 5.47, 'т': 6.26,
+    'у': 2.62, 'ф': 0.26, 'х': 0.97, 'ц': 0.48, 'ч': 1.44, 'ш': 0.73, 'щ': 0.36, 'ъ': 0.04, 'ы': 1.90, 'ь': 1.74,
+    'э': 0.32, 'ю': 0.64, 'я': 2.01,
+}
+LETTER_RARITY = {
+    letter: -math.log2(frequency / 100)
+    for frequencies in (LETTER_FREQUENCIES, CYRILLIC_LETTER_FREQUENCIES) for letter, frequency in frequencies.items()
+}
+MAX_LETTER_RARITY = max(LETTER_RARITY.values())
+
+
+def word_rarity(distinct_letters: set[str]) -> float:
+    return sum([LETTER_RARITY.get(letter, MAX_LETTER_RARITY) for letter in distinct_letters])
+
+
+def word_hardness(word: str) -> float:
+    """
+    Estimates how hard a word is to guess.
+
+    Rarity is the sum of -log2(frequency) over the distinct letters of the word: rare letters are guessed late.
+    Hardness is rarity per letter of the word: in long words and words with repeated letters every hit reveals more.
+    """
+    return word_rarity(set(word)) / len(word) if word else 0.0
+
+
+def difficulty_bounds(size: int) -> tuple[int, ...]:
+    """
+    Splits the positions of `size` words sorted from the hardest to the easiest into MAX_DIFFICULTY bands.
+    Difficulty level d gets positions from bounds[2 * (d - 1)] to bounds[2 * d - 1].
+    Every band gets at least one word, even if there are fewer words than difficulty levels.
+    """
+    bounds = []
+    for difficulty in range(1, MAX_DIFFICULTY + 1):
+        start = min((difficulty - 1) * size // MAX_DIFFICULTY, max(size - 1, 0))
+        stop = max(difficulty * size // MAX_DIFFICULTY, min(start + 1, size))
+        bounds += [start, stop]
+    return tuple(bounds)
+
+
+class PuzzleBand(Sequence):
+    """
+    Puzzles of a category between two positions of the hardness order, without copying them.
+    """
+    __slots__ = ('_puzzles', '_order', '_start', '_stop')
+
+    def __init__(self, puzzles: Sequence[Puzzle], order: array, start: int, stop: int):
+        self._puzzles = puzzles
+        self._order = order
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[ind] for ind in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PuzzleBand index out of range")
+        return self._puzzles[self._order[self._start + index]]
+
+    def word_ids(self) -> array:
+        """
+        Returns the indices of the band puzzles in their category.
+        """
+        return self._order[self._start:self._stop]
+
+
+class DifficultyIndex:
+    """
+    Puzzles of every category ordered from the hardest to the easiest word and split into difficulty bands.
+    The easier the difficulty level (the more mistakes allowed), the harder the words it gets.
+    Words are scored once, when the index is built; a band lookup is O(1).
+    Orders built before for the same puzzles (see order()) can be passed for some or all categories
+    to skip scoring them.
+    """
+    def __init__(self, puzzles_by_category: Mapping[str, Sequence[Puzzle]],
+                 orders: Mapping[str, array] | None = None):
+        self._puzzles_by_category = puzzles_by_category
+        self._orders: dict[str, array] = {}
+        self._bounds: dict[str, tuple[int, ...]] = {}
+        for category, puzzles in puzzles_by_category.items():
+            order = orders.get(category) if orders is not None else None
+            if order is None:
+                hardness = [word_hardness(word) for word in iter_words(puzzles)]
+                order = array('I', sorted(range(len(hardness)), key=lambda word_id: (-hardness[word_id], word_id)))
+            self._orders[category] = order
+            self._bounds[category] = difficulty_bounds(len(order))
+
+    def order(self, category: str) -> array:
+        """
+        Returns the indices of the category puzzles ordered from the hardest to the easiest word.
+        """
+        return self._orders[category]
+
+    def band(self, category: str, min_difficulty: int, max_difficulty: int | None = None) -> PuzzleBand:
+        """
+        Returns the puzzles of the category suitable for difficulty levels from min_difficulty to max_difficulty.
+
+        Raises:
+            ValueError: If the difficulty levels are out of range.
+        """
+        if max_difficulty is None:
+            max_difficulty = min_difficulty
+        if not 1 <= min_difficulty <= max_difficulty <= MAX_DIFFICULTY:
+            raise ValueError(f"Invalid difficulty band: {min_difficulty}-{max_difficulty}")
+
+        bounds = self._bounds[category]
+        return PuzzleBand(self._puzzles_by_category[category], self._orders[category],
+                          bounds[2 * (min_difficulty - 1)], bounds[2 * max_difficulty - 1])
+
+    def puzzles(self, category: str, difficulty: int) -> PuzzleBand:
+        return self.band(category, difficulty)
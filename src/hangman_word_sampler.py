@@ -0,0 +1,82 @@
+import hashlib
+import random
+from collections.abc import Mapping
+
+FEISTEL_ROUNDS = 4
+_MASK_64 = (1 << 64) - 1
+
+
+def _mix(value: int) -> int:
+    """
+    The splitmix64 finalizer: a cheap bijective scrambling of a 64-bit integer.
+    """
+    value = (value ^ (value >> 30)) * 0xbf58476d1ce4e5b9 & _MASK_64
+    value = (value ^ (value >> 27)) * 0x94d049bb133111eb & _MASK_64
+    return value ^ (value >> 31)
+
+
+class FeistelPermutation:
+    """
+    Pseudo-random permutation of range(size) defined by a key, computed element by element in O(1) memory.
+
+    A balanced Feistel network permutes the integers of 2 * half_bits bits, the smallest such domain
+    not smaller than size (so at most 4 times larger); indices that fall outside range(size) are encrypted
+    again until they fall inside (cycle walking), which keeps the mapping a bijection of range(size).
+    """
+    __slots__ = ('size', '_half_bits', '_half_mask', '_round_keys')
+
+    def __init__(self, size: int, key: bytes):
+        if size < 1:
+            raise ValueError("Cannot permute an empty range")
+        self.size = size
+        self._half_bits = max(((size - 1).bit_length() + 1) // 2, 1)
+        self._half_mask = (1 << self._half_bits) - 1
+        digest = hashlib.blake2b(key, digest_size=8 * FEISTEL_ROUNDS).digest()
+        self._round_keys = tuple(int.from_bytes(digest[ind:ind + 8], 'little') for ind in range(0, len(digest), 8))
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._half_mask
+        for round_key in self._round_keys:
+            left, right = right, left ^ (_mix(right ^ round_key) & self._half_mask)
+        return left << self._half_bits | right
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError("FeistelPermutation index out of range")
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+
+class WordSampler:
+    """
+    Draws the words of a player's session without repeats: every pool of words (e.g. a difficulty band
+    of a category) is walked in a pseudo-random order, and only when all its words were drawn
+    the walk starts over in a different order.
+
+    The state is the seed and one draw counter per pool, so the sampler can be saved and resumed
+    (see cursors()) and takes the same memory however large the word bank is.
+    If a pool changes its size (e.g. another word bank is loaded), its current cycle may repeat words.
+    """
+    def __init__(self, seed: int | None = None, cursors: Mapping[str, int] | None = None):
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self._cursors: dict[str, int] = dict(cursors) if cursors is not None else {}
+
+    def draw(self, pool: str, size: int) -> int:
+        """
+        Returns the index of the next word of the pool of the given size.
+        """
+        cursor = self._cursors.get(pool, 0)
+        self._cursors[pool] = cursor + 1
+        cycle, position = divmod(cursor, size)
+        return FeistelPermutation(size, f"{self.seed}:{pool}:{cycle}".encode())[position]
+
+    def cursors(self) -> dict[str, int]:
+        """
+        Returns the number of words drawn from every pool, to restore the sampler with the same seed later.
+        """
+        return dict(self._cursors)
@@ -1,5 +1,80 @@
+import argparse
+import cProfile
+import os
+
 from src.hangman_game import HangmanGame
+from src.hangman_keyboard import Keyboard
+from src.hangman_journal import DEFAULT_COMMIT_INTERVAL, GameJournal
+from src.hangman_leaderboard import Leaderboard
+from src.hangman_metrics import EXPORT_FORMATS, enable_metrics
+from src.hangman_puzzle_generator import load_word_bank
+from src.hangman_result_store import ResultStore
+from src.hangman_snapshot import restore_game
+
+CONSOLE_SESSION_ID = 0
 
 if __name__ == '__main__':
-    hangman_game = HangmanGame()
-    hangman_game.play_game()
+    parser = argparse.ArgumentParser(description="Hangman game.")
+    parser.add_argument("--word-bank", help="path to a word bank file to take the puzzles from")
+    parser.add_argument("--word-bank-cache", help="path to a cache of the word bank indexes to start faster")
+    parser.add_argument("--evil", action="store_true", help="play puzzles that dodge the guesses")
+    parser.add_argument("--keys", action="store_true",
+                        help="take every keypress as a move and choose from menus with the arrows (on a terminal)")
+    parser.add_argument("--results", help="path to an SQLite database to record the finished games in")
+    parser.add_argument("--player", default="anonymous", help="player name for the recorded results")
+    parser.add_argument("--leaderboard", help="path to a leaderboard snapshot to add the score of the game to")
+    parser.add_argument("--journal", help="directory of a journal to resume an interrupted game from")
+    parser.add_argument("--journal-commit-interval", type=float, default=DEFAULT_COMMIT_INTERVAL,
+                        help="seconds between journal fsyncs")
+    parser.add_argument("--metrics", help="path to export timing metrics to on exit and on SIGUSR1")
+    parser.add_argument("--metrics-format", choices=EXPORT_FORMATS, default="prometheus")
+    parser.add_argument("--profile", help="path to dump cProfile stats of the session to")
+    args = parser.parse_args()
+
+    if args.metrics:
+        enable_metrics(args.metrics, args.metrics_format)
+
+    if args.word_bank:
+        load_word_bank(args.word_bank, args.word_bank_cache)
+
+    result_store = ResultStore(args.results) if args.results else None
+    journal = GameJournal(args.journal, args.journal_commit_interval) if args.journal else None
+    profiler = cProfile.Profile() if args.profile else None
+    keyboard = Keyboard() if args.keys else None
+    leaderboard = None
+    if args.leaderboard:
+        leaderboard = Leaderboard.load(args.leaderboard) if os.path.exists(args.leaderboard) else Leaderboard()
+    try:
+        if keyboard is not None:
+            keyboard.enable()
+        hangman_game = HangmanGame(result_store=result_store, player=args.player, evil=args.evil, journal=journal,
+                                   session_id=CONSOLE_SESSION_ID, keyboard=keyboard, leaderboard=leaderboard)
+        interrupted_game = None
+        if journal is not None:
+            interrupted_game = journal.recover_records().get(CONSOLE_SESSION_ID)
+            journal.compact()
+        if profiler is not None:
+            profiler.enable()
+        if interrupted_game is not None:
+            try:
+                restore_game(interrupted_game, hangman_game)
+            except ValueError as error:
+                print(f"Cannot resume the interrupted game: {error}.")
+                interrupted_game = None
+        if interrupted_game is not None:
+            hangman_game.play_turns()
+        else:
+            hangman_game.play_game()
+    finally:
+        if keyboard is not None:
+            keyboard.restore()
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        if journal is not None:
+            journal.close()
+        if leaderboard is not None:
+            leaderboard.save(args.leaderboard)
+        # Last, as it raises if game results were lost.
+        if result_store is not None:
+            result_store.close()
@@ -0,0 +1,50 @@
+import unittest
+
+from src.hangman_advisor import AdvisorIndex, LetterAdvisor, LetterBitsets
+from src.hangman_puzzle import HangmanPuzzle, Puzzle
+
+
+class TestLetterAdvisor(unittest.TestCase):
+    def setUp(self):
+        self.words = ["lion", "bear", "wolf", "deer", "mole", "toad"]
+        self.advisor = LetterAdvisor(LetterBitsets(self.words))
+
+    def guess(self, hangman_puzzle: HangmanPuzzle, letter: str) -> None:
+        hangman_puzzle.process_letter(letter)
+        self.advisor.observe(letter, hangman_puzzle.get_letter_positions(letter))
+
+    def test_candidates_narrow_after_guesses(self):
+        hangman_puzzle = HangmanPuzzle(Puzzle("deer", ""))
+        self.assertEqual(self.advisor.count_candidates(), 6)
+
+        self.guess(hangman_puzzle, "o")
+        self.assertEqual(self.advisor.get_candidates(), ["bear", "deer"])
+
+        self.guess(hangman_puzzle, "e")
+        self.assertEqual(self.advisor.get_candidates(), ["deer"])
+
+    def test_hit_requires_exact_positions(self):
+        hangman_puzzle = HangmanPuzzle(Puzzle("bear", ""))
+        self.guess(hangman_puzzle, "e")
+        self.assertEqual(self.advisor.get_candidates(), ["bear"])
+
+    def test_suggest_most_informative_letter(self):
+        letter, count = self.advisor.suggest()
+        self.assertEqual((letter, count), ("e", 3))
+
+    def test_suggest_skips_asked_letters(self):
+        hangman_puzzle = HangmanPuzzle(Puzzle("lion", ""))
+        for letter in "lion":
+            self.guess(hangman_puzzle, letter)
+        self.assertEqual(self.advisor.get_candidates(), ["lion"])
+        self.assertIsNone(self.advisor.suggest())
+
+    def test_index_groups_words_by_length(self):
+        index = AdvisorIndex({"animals": [Puzzle(word, "") for word in ["bat", "lion", "cat", "bear"]]})
+        self.assertEqual(index.bitsets("animals", 3).words, ["bat", "cat"])
+        self.assertEqual(index.bitsets("animals", 4).words, ["lion", "bear"])
+        self.assertEqual(index.bitsets("animals", 7).words, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import string
+import unittest
+
+from src.hangman_advisor import AdvisorIndex, LetterAdvisor
+from src.hangman_alphabet import CYRILLIC, LATIN, MAX_ALPHABET_SIZE, Alphabet
+from src.hangman_game import GameEvent, HangmanGame
+from src.hangman_puzzle import HangmanPuzzle, Puzzle
+from src.hangman_puzzle_generator import CATEGORY_ALPHABETS, Category, PUZZLES_BY_CATEGORY_LIST, gen_puzzle
+from src.hangman_snapshot import restore_game, snapshot_game
+
+
+class TestAlphabet(unittest.TestCase):
+    def test_dense_indices(self):
+        self.assertEqual(len(LATIN), 26)
+        self.assertEqual(len(CYRILLIC), 33)
+        self.assertEqual([CYRILLIC.index(letter) for letter in CYRILLIC], list(range(33)))
+        self.assertIn("ё", CYRILLIC)
+        self.assertNotIn("e", CYRILLIC)
+        self.assertTrue(CYRILLIC.contains_word("ёжик"))
+        self.assertFalse(CYRILLIC.contains_word("ежик!"))
+
+    def test_invalid_alphabets(self):
+        with self.assertRaises(ValueError):
+            Alphabet("big", "Big", "".join(chr(0x4e00 + ind) for ind in range(MAX_ALPHABET_SIZE + 1)))
+        with self.assertRaises(ValueError):
+            Alphabet("repeated", "Repeated", "abca")
+        with self.assertRaises(ValueError):
+            Alphabet("capital", "Capital", string.ascii_uppercase)
+
+    def test_every_category_declares_alphabet(self):
+        for category in Category:
+            if category != Category.RANDOM_FLAG:
+                self.assertIn(category, CATEGORY_ALPHABETS)
+                for puzzle in PUZZLES_BY_CATEGORY_LIST.get(category, []):
+                    self.assertTrue(category.alphabet.contains_word(puzzle.get_word()))
+
+
+class TestCyrillicGame(unittest.TestCase):
+    def test_puzzle(self):
+        puzzle = HangmanPuzzle(Puzzle("черепаха", ""), CYRILLIC)
+        self.assertEqual(puzzle.process_letter("а"), (False, "Hit!"))
+        self.assertEqual(puzzle.process_letter("я"), (True, ""))
+        self.assertEqual(puzzle.get_guessed_mask(), 1 << CYRILLIC.index("а") | 1 << CYRILLIC.index("я"))
+        self.assertEqual(str(puzzle.get_guessed_part()), "_____а_а")
+        with self.assertRaises(ValueError):
+            HangmanPuzzle(Puzzle("черепаха", ""))
+
+    def test_game(self):
+        game = HangmanGame()
+        game.resume_game(Category.ANIMALS_RU, 1, PUZZLES_BY_CATEGORY_LIST[Category.ANIMALS_RU][4], 0, 0)
+        event, message = game.process_guess("e")
+        self.assertEqual((event, message), (GameEvent.INVALID_INPUT, "Please, enter a single Cyrillic letter.\n"))
+        for letter in "ЁЖИЯ":
+            game.process_guess(letter)
+        self.assertEqual(game.mistakes, 1)
+        self.assertEqual(str(game.hangman_puzzle.get_guessed_part()), "ёжи_")
+
+        restored = restore_game(snapshot_game(game))
+        self.assertEqual(restored.hangman_puzzle.get_guessed_mask(), game.hangman_puzzle.get_guessed_mask())
+        self.assertEqual(restored.mistakes, 1)
+
+    def test_gen_puzzle_and_advisor(self):
+        category, _, puzzle = gen_puzzle(Category.ANIMALS_RU, 1)
+        self.assertIs(puzzle.get_alphabet(), CYRILLIC)
+
+        index = AdvisorIndex(PUZZLES_BY_CATEGORY_LIST, CATEGORY_ALPHABETS)
+        advisor = LetterAdvisor(index.bitsets(Category.ANIMALS_RU, 4))
+        self.assertEqual(advisor.count_candidates(), 4)
+        advisor.observe("л", (0,))
+        self.assertEqual(advisor.get_candidates(), ["лиса"])
+
+
+if __name__ == '__main__':
+    unittest.main()
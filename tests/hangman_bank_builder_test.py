@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from src.hangman_bank_builder import Rejection, build_word_bank, process_chunk
+from src.hangman_bank_cache import read_bank_cache, source_digest
+from src.hangman_puzzle_generator import (Category, PUZZLES_BY_CATEGORY_LIST, gen_puzzle, get_difficulty_index,
+                                          load_word_bank, set_word_bank)
+from src.hangman_word_difficulty import DifficultyIndex
+
+
+class TestBankBuilder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.directory.name, "words.tsv")
+        self.cache_path = os.path.join(self.directory.name, "words.cache")
+
+    def tearDown(self):
+        set_word_bank(PUZZLES_BY_CATEGORY_LIST)
+        self.directory.cleanup()
+
+    def write_input(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def test_process_chunk(self):
+        records = process_chunk([
+            b"# comment\n",
+            b"\n",
+            b"Animals\t  LION \tA king without a crown.\r\n",
+            b"animals\n",
+            b"planets\tmars\t\n",
+            b"fruits\tkiwi fruit\n",
+            b"fruits\tfig\n",
+            b"nature\tsea\n",
+            b"nature\t\xff\xfe\n",
+            b"nature\tst\n",
+        ])
+        self.assertEqual(records[0][:3], ("animals", "lion", b"animals\tlion\tA king without a crown.\n"))
+        self.assertEqual(records[1:], [Rejection.MALFORMED, Rejection.CATEGORY, Rejection.ALPHABET,
+                                       records[4], records[5], Rejection.ENCODING, Rejection.LENGTH])
+        self.assertEqual(records[4][1], "fig")
+
+    def test_default_category(self):
+        records = process_chunk([b"pear\tIt is green.\n", b"plum\n"], default_category="fruits")
+        self.assertEqual([record[:3] for record in records],
+                         [("fruits", "pear", b"fruits\tpear\tIt is green.\n"), ("fruits", "plum", b"fruits\tplum\t\n")])
+
+    def test_build_word_bank(self):
+        first = self.write_input("first.tsv", b"animals\tlion\tA king\\nwithout a crown.\nfruits\tbroccoli\n"
+                                              b"animals\tzebra\nanimals\tbat\n")
+        second = self.write_input("second.tsv", b"Broccoli\tA vegetable.\nkiwi\n")
+        for jobs in (1, 2):
+            stats = build_word_bank([first, second], self.output_path, self.cache_path, jobs=jobs, chunk_size=2)
+            self.assertEqual((stats.lines, stats.accepted), (6, 4))
+            self.assertEqual(dict(stats.rejected), {Rejection.MALFORMED: 1, Rejection.CATEGORY: 1})
+            with open(self.output_path, "rb") as file:
+                self.assertEqual(file.read(), b"animals\tlion\tA king\\nwithout a crown.\nfruits\tbroccoli\t\n"
+                                              b"animals\tzebra\t\nanimals\tbat\t\n")
+
+        stats = build_word_bank([second], self.output_path, default_category="fruits")
+        self.assertEqual((stats.accepted, stats.rejected[Rejection.DUPLICATE]), (2, 0))
+
+        with self.assertRaises(ValueError):
+            build_word_bank([first, self.output_path], self.output_path)
+
+    def test_duplicates_across_categories(self):
+        path = self.write_input("raw.tsv", b"fruits\tbroccoli\nnature\tbroccoli\nnature\tBROCCOLI\nnature\ttree\n")
+        stats = build_word_bank([path], self.output_path)
+        self.assertEqual((stats.accepted, stats.rejected[Rejection.DUPLICATE]), (2, 2))
+
+    def test_built_bank_is_loadable(self):
+        path = self.write_input("raw.tsv", "animals\tzebra\tStripes.\nanimals\tcat\nanimals\tjaguar\n"
+                                             "nature\triver\tIt flows.\n".encode())
+        build_word_bank([path], self.output_path, self.cache_path)
+        cached = read_bank_cache(self.cache_path, source_digest(self.output_path))
+        self.assertEqual(set(cached), {"animals", "nature"})
+
+        word_bank = load_word_bank(self.output_path, self.cache_path)
+        self.addCleanup(word_bank.close)
+        self.assertEqual(get_difficulty_index().order("animals"), DifficultyIndex(word_bank).order("animals"))
+        self.assertEqual([puzzle.get_hint() for puzzle in word_bank["animals"]], ["Stripes.", "", ""])
+        _, _, puzzle = gen_puzzle(Category.NATURE, 1)
+        self.assertEqual(puzzle.get_puzzle().get_word(), "river")
+
+
+if __name__ == '__main__':
+    unittest.main()
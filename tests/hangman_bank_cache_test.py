@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from array import array
+from unittest.mock import patch
+
+from src.hangman_bank_cache import CategoryIndex, read_bank_cache, source_digest, write_bank_cache
+from src.hangman_puzzle import Puzzle
+from src.hangman_puzzle_generator import (Category, PUZZLES_BY_CATEGORY_LIST, get_difficulty_index,
+                                          load_word_bank, set_word_bank)
+from src.hangman_word_bank import write_word_bank
+
+
+class TestBankCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "words.tsv")
+        self.cache_path = os.path.join(self.directory.name, "words.cache")
+        write_word_bank(self.path, PUZZLES_BY_CATEGORY_LIST)
+
+    def tearDown(self):
+        set_word_bank(PUZZLES_BY_CATEGORY_LIST)
+        self.directory.cleanup()
+
+    def test_roundtrip(self):
+        digest = source_digest(self.path)
+        categories = {
+            "animals": CategoryIndex(array('Q', [0, 17, 40]), array('I', [2, 0, 1])),
+            "пусто": CategoryIndex(array('Q'), array('I')),
+        }
+        write_bank_cache(self.cache_path, digest, categories)
+        self.assertEqual(read_bank_cache(self.cache_path, digest), categories)
+
+    def test_missing_stale_and_damaged_cache(self):
+        digest = source_digest(self.path)
+        self.assertIsNone(read_bank_cache(self.cache_path, digest))
+
+        write_bank_cache(self.cache_path, digest, {"animals": CategoryIndex(array('Q', [0, 17]), array('I', [1, 0]))})
+        self.assertIsNone(read_bank_cache(self.cache_path, bytes(32)))
+
+        with open(self.cache_path, "rb") as file:
+            data = file.read()
+        with open(self.cache_path, "wb") as file:
+            file.write(data[:-1])
+        self.assertIsNone(read_bank_cache(self.cache_path, digest))
+
+    def test_load_word_bank_with_cache(self):
+        word_bank = load_word_bank(self.path, self.cache_path)
+        self.addCleanup(word_bank.close)
+        self.assertTrue(os.path.exists(self.cache_path))
+        orders = {category: get_difficulty_index().order(category) for category in word_bank}
+
+        with patch("src.hangman_word_difficulty.word_hardness") as word_hardness, \
+                patch("src.hangman_word_bank.WordBank._build_index") as build_index:
+            cached_bank = load_word_bank(self.path, self.cache_path)
+            self.addCleanup(cached_bank.close)
+        build_index.assert_not_called()
+        word_hardness.assert_not_called()
+        for category, puzzles in PUZZLES_BY_CATEGORY_LIST.items():
+            self.assertEqual(list(cached_bank[category].iter_words()), [puzzle.get_word() for puzzle in puzzles])
+            self.assertEqual(get_difficulty_index().order(category), orders[category])
+
+    def test_cache_is_rebuilt_when_source_changes(self):
+        load_word_bank(self.path, self.cache_path).close()
+        write_word_bank(self.path, {Category.NATURE: [Puzzle("tree", "It has lots of bark, but no bite?")]})
+        word_bank = load_word_bank(self.path, self.cache_path)
+        self.addCleanup(word_bank.close)
+        self.assertEqual(list(word_bank), [Category.NATURE])
+        self.assertEqual(list(word_bank[Category.NATURE].iter_words()), ["tree"])
+        self.assertEqual(list(read_bank_cache(self.cache_path, source_digest(self.path))), [Category.NATURE])
+
+
+if __name__ == '__main__':
+    unittest.main()
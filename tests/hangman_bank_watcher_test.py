@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+
+from src.hangman_bank_watcher import WordBankWatcher, format_report
+from src.hangman_puzzle import Puzzle
+from src.hangman_puzzle_generator import (Category, PUZZLES_BY_CATEGORY_LIST, gen_puzzle, get_bank_state,
+                                          load_word_bank, reload_word_bank, set_word_bank)
+from src.hangman_word_bank import write_word_bank
+
+
+class TestReloadWordBank(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "words.tsv")
+        write_word_bank(self.path, PUZZLES_BY_CATEGORY_LIST)
+        load_word_bank(self.path)
+
+    def tearDown(self):
+        set_word_bank(PUZZLES_BY_CATEGORY_LIST)
+        self.directory.cleanup()
+
+    def replace_bank(self, puzzles_by_category):
+        temp_path = f"{self.path}.tmp"
+        write_word_bank(temp_path, puzzles_by_category)
+        os.replace(temp_path, self.path)
+
+    def changed_bank(self):
+        puzzles_by_category = dict(PUZZLES_BY_CATEGORY_LIST)
+        puzzles_by_category[Category.FRUITS] = [Puzzle("quince", "A hard yellow fruit")] + \
+            [Puzzle(puzzle.get_word(), puzzle.get_hint()) for puzzle in PUZZLES_BY_CATEGORY_LIST[Category.FRUITS]]
+        return puzzles_by_category
+
+    def test_rebuilds_changed_categories_only(self):
+        previous = get_bank_state()
+        bitsets = previous.advisor_index.bitsets(Category.ANIMALS, 3)
+        bitmaps = previous.pattern_index.bitmaps(Category.ANIMALS, 3)
+        self.replace_bank(self.changed_bank())
+        report = reload_word_bank(self.path)
+
+        state = get_bank_state()
+        self.assertEqual(report.changed_categories, [Category.FRUITS])
+        self.assertEqual(report.removed_categories, [])
+        self.assertIn(Category.ANIMALS, report.reused_categories)
+        self.assertGreater(report.index_bytes, 0)
+        self.assertIs(state.difficulty_index.order(Category.ANIMALS), previous.difficulty_index.order(Category.ANIMALS))
+        self.assertIs(state.advisor_index.bitsets(Category.ANIMALS, 3), bitsets)
+        self.assertIs(state.pattern_index.bitmaps(Category.ANIMALS, 3), bitmaps)
+        self.assertIn("quince", state.word_bank[Category.FRUITS].iter_words())
+        self.assertIn("rebuilt fruits,", format_report(self.path, report))
+
+    def test_previous_bank_stays_readable(self):
+        previous = get_bank_state()
+        band = previous.difficulty_index.puzzles(Category.FRUITS, 1)
+        words = [puzzle.get_word() for puzzle in band]
+        self.replace_bank(self.changed_bank())
+        reload_word_bank(self.path)
+
+        self.assertEqual([puzzle.get_word() for puzzle in band], words)
+        self.assertEqual(list(previous.word_bank[Category.FRUITS].iter_words()),
+                         [puzzle.get_word() for puzzle in PUZZLES_BY_CATEGORY_LIST[Category.FRUITS]])
+        category, _, puzzle = gen_puzzle(Category.FRUITS, 1)
+        self.assertEqual(category, Category.FRUITS)
+        self.assertIn(puzzle.get_puzzle().get_word(), get_bank_state().word_bank[Category.FRUITS].iter_words())
+
+    def test_removed_category(self):
+        puzzles_by_category = dict(PUZZLES_BY_CATEGORY_LIST)
+        del puzzles_by_category[Category.FRUITS]
+        self.replace_bank(puzzles_by_category)
+        self.assertEqual(reload_word_bank(self.path).removed_categories, [Category.FRUITS])
+
+
+class TestWordBankWatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "words.tsv")
+        write_word_bank(self.path, PUZZLES_BY_CATEGORY_LIST)
+        load_word_bank(self.path)
+        self.reports = []
+        self.errors = []
+        self.watcher = WordBankWatcher(self.path, on_reload=self.reports.append, on_error=self.errors.append)
+
+    def tearDown(self):
+        self.watcher.stop()
+        set_word_bank(PUZZLES_BY_CATEGORY_LIST)
+        self.directory.cleanup()
+
+    def test_reloads_when_the_file_is_stable(self):
+        self.assertIsNone(self.watcher.check())
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("animals\tzebra\tA striped horse\n")
+        self.assertIsNone(self.watcher.check())
+        self.assertIsNotNone(self.watcher.check())
+        self.assertIsNone(self.watcher.check())
+        self.assertEqual([report.changed_categories for report in self.reports], [[Category.ANIMALS]])
+        self.assertIn("zebra", get_bank_state().word_bank[Category.ANIMALS].iter_words())
+
+    def test_keeps_the_bank_on_errors(self):
+        state = get_bank_state()
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("planets\tmars\tThe red planet\n")
+        self.watcher.check()
+        self.assertIsNone(self.watcher.check())
+        self.assertEqual(len(self.errors), 1)
+        self.assertIsInstance(self.errors[0], ValueError)
+        self.assertIs(get_bank_state(), state)
+        self.assertIsNone(self.watcher.check())
+        self.assertEqual(len(self.errors), 1)
+
+    def test_background_polling(self):
+        self.watcher.interval = 0.01
+        self.watcher.start()
+        temp_path = f"{self.path}.tmp"
+        write_word_bank(temp_path, {Category.ANIMALS: PUZZLES_BY_CATEGORY_LIST[Category.ANIMALS]})
+        os.replace(temp_path, self.path)
+        for _ in range(500):
+            if self.reports:
+                break
+            self.watcher._stop.wait(0.01)
+        self.watcher.stop()
+        self.assertEqual(len(self.reports), 1)
+        self.assertNotIn(Category.FRUITS, get_bank_state().word_bank)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from src.hangman_advisor import LetterBitsets
+from src.hangman_evil_puzzle import EvilHangmanPuzzle, partition_by_letter
+from src.hangman_puzzle import Puzzle
+
+
+class TestEvilHangmanPuzzle(unittest.TestCase):
+    def setUp(self):
+        self.words = ["deer", "bear", "beer", "lion", "wolf", "mole", "toad"]
+        self.puzzles = [Puzzle(word, f"hint {word}", puzzle_id) for puzzle_id, word in enumerate(self.words)]
+        self.hangman_puzzle = EvilHangmanPuzzle(self.puzzles, LetterBitsets(self.words))
+
+    def test_partition_by_letter(self):
+        bitsets = LetterBitsets(self.words)
+        families = {positions: [self.words[ind] for ind in range(len(self.words)) if family >> ind & 1]
+                    for positions, family in partition_by_letter(bitsets.all, bitsets, bitsets.alphabet.index("e"))}
+        self.assertEqual(families, {(1, 2): ["deer", "beer"], (1,): ["bear"], (3,): ["mole"],
+                                    (): ["lion", "wolf", "toad"]})
+
+    def test_dodges_the_letter_of_a_minority(self):
+        got_mistake, message = self.hangman_puzzle.process_letter("e")
+        self.assertTrue(got_mistake)
+        self.assertEqual(message, "")
+        self.assertEqual(self.hangman_puzzle.get_candidate_count(), 3)
+        self.assertFalse(self.hangman_puzzle.get_letter_positions("e"))
+
+    def test_hit_reveals_positions_of_the_largest_family(self):
+        self.hangman_puzzle.process_letter("e")
+        got_mistake, message = self.hangman_puzzle.process_letter("o")
+        self.assertFalse(got_mistake)
+        self.assertEqual(message, "Hit!")
+        self.assertEqual(self.hangman_puzzle.get_guessed_part(), ["_", "o", "_", "_"])
+        self.assertEqual(self.hangman_puzzle.get_candidate_count(), 2)
+        self.assertIn(self.hangman_puzzle.get_puzzle().get_word(), ["wolf", "toad"])
+        self.assertIn("contains", self.hangman_puzzle.remind_about_asked_letter("o"))
+
+    def test_ties_prefer_fewer_revealed_letters(self):
+        hangman_puzzle = EvilHangmanPuzzle(self.puzzles[:2], LetterBitsets(self.words[:2]))
+        got_mistake, _ = hangman_puzzle.process_letter("d")
+        self.assertTrue(got_mistake)
+        self.assertEqual(hangman_puzzle.get_puzzle().get_word(), "bear")
+
+    def test_repeated_letter(self):
+        self.hangman_puzzle.process_letter("e")
+        got_mistake, message = self.hangman_puzzle.process_letter("e")
+        self.assertFalse(got_mistake)
+        self.assertIn("doesn't contain", message)
+
+    def test_game_can_be_won(self):
+        for letter in "abcdefghijklmnopqrstuvwxyz":
+            self.hangman_puzzle.process_letter(letter)
+        self.assertEqual(self.hangman_puzzle.get_candidate_count(), 1)
+        self.assertTrue(self.hangman_puzzle.get_is_guessed())
+        word = self.hangman_puzzle.get_puzzle().get_word()
+        self.assertEqual(str(self.hangman_puzzle.get_guessed_part()), word)
+        self.assertEqual(self.hangman_puzzle.get_puzzle().get_hint(), f"hint {word}")
+
+    def test_restore_guessed_mask(self):
+        self.hangman_puzzle.process_letter("e")
+        self.hangman_puzzle.process_letter("o")
+        restored = EvilHangmanPuzzle(self.puzzles, LetterBitsets(self.words))
+        restored.restore_guessed_mask(self.hangman_puzzle.get_guessed_mask())
+        self.assertEqual(restored.get_guessed_part(), self.hangman_puzzle.get_guessed_part())
+        self.assertEqual(restored.get_candidate_count(), self.hangman_puzzle.get_candidate_count())
+
+    def test_empty_words(self):
+        with self.assertRaises(ValueError):
+            EvilHangmanPuzzle([], LetterBitsets([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
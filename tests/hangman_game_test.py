@@ -1,13 +1,22 @@
+import io
 import unittest
 from textwrap import dedent
 from unittest.mock import patch, MagicMock
 
+from src.hangman_advisor import LetterAdvisor
+from src.hangman_alphabet import LATIN
 from src.hangman_game import set_category, set_difficulty, HangmanGame
 from src.hangman_puzzle import HangmanPuzzle, Puzzle
-from src.hangman_puzzle_generator import Category
+from src.hangman_puzzle_generator import Category, get_advisor_index
+from src.hangman_renderer import TerminalRenderer, ERASE_SCREEN
 from src.hangman_representation import MAX_DIFFICULTY, DIFFICULTY_LEVELS
 
 
+class FakeTerminal(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
 class TestSetup(unittest.TestCase):
     @patch('builtins.input', side_effect=['animals'])
     def test_set_category_valid(self, mock_input):
@@ -62,15 +71,33 @@ class TestInitGame(unittest.TestCase):
         mock_set_difficulty.assert_called_once()
         mock_gen_puzzle.assert_called_once()
 
+    @patch('src.hangman_game.set_category', return_value=Category.ANIMALS)
+    @patch('src.hangman_game.set_difficulty', return_value=3)
+    @patch('src.hangman_game.gen_puzzle',
+           return_value=(Category.ANIMALS, 3, HangmanPuzzle(Puzzle("lion", "A king without a crown."))))
+    @patch('builtins.print')
+    def test_rules_stay_on_cleared_screen(self, mock_print, mock_gen_puzzle, mock_set_difficulty, mock_set_category):
+        stream = FakeTerminal()
+        game = HangmanGame(renderer=TerminalRenderer(stream))
+        game.init_game()
+        game.render_screen("", "Guess a letter:")
+
+        screen = stream.getvalue()
+        self.assertIn(ERASE_SCREEN, screen)
+        screen = screen[screen.index(ERASE_SCREEN):]
+        self.assertIn("Chosen category: animals", screen)
+        self.assertIn("Enter 'quit' to quit.", screen)
+        self.assertIn("Enter 'help' to get a clue.", screen)
+
 
 class TestPlayGame(unittest.TestCase):
     @patch('builtins.input', side_effect=['l', 'i', 'o', 'n'])
-    @patch('src.hangman_game.clear_console', return_value=None)
     @patch('src.hangman_game.HangmanGame.init_game', return_value=3)
-    def test_play_game_win(self, mock_init_game, mock_clear, mock_input):
+    def test_play_game_win(self, mock_init_game, mock_input):
         game = HangmanGame()
 
         game.hangman_puzzle = MagicMock(spec=HangmanPuzzle)
+        game.hangman_puzzle.get_alphabet.return_value = LATIN
         game.hangman_puzzle.get_puzzle().get_word.return_value = "lion"
         game.hangman_puzzle.get_puzzle().get_hint.return_value = "A king without a crown."
 
@@ -96,12 +123,12 @@ class TestPlayGame(unittest.TestCase):
         game.hangman_representation.update_hangman_parts.assert_not_called()
 
     @patch('builtins.input', side_effect=['x', 'y', 'l', 'i', 'o', 'n'])
-    @patch('src.hangman_game.clear_console', return_value=None)
     @patch('src.hangman_game.HangmanGame.init_game', return_value=3)
-    def test_play_game_with_mistakes(self, mock_init_game, mock_clear, mock_input):
+    def test_play_game_with_mistakes(self, mock_init_game, mock_input):
         game = HangmanGame()
 
         game.hangman_puzzle = MagicMock(spec=HangmanPuzzle)
+        game.hangman_puzzle.get_alphabet.return_value = LATIN
         game.hangman_puzzle.get_puzzle().get_word.return_value = "lion"
         game.hangman_puzzle.get_puzzle().get_hint.return_value = "A king without a crown."
 
@@ -129,12 +156,54 @@ class TestPlayGame(unittest.TestCase):
         self.assertEqual(game.hangman_representation.update_hangman_parts.call_count, 2)
 
 
+class TestHints(unittest.TestCase):
+    @patch('src.hangman_game.set_category', return_value=Category.ANIMALS)
+    @patch('src.hangman_game.set_difficulty', return_value=1)
+    @patch('src.hangman_game.gen_puzzle',
+           return_value=(Category.ANIMALS, 1, HangmanPuzzle(Puzzle("lion", "A king without a crown."))))
+    @patch('builtins.print')
+    def test_hint_tiers(self, mock_print, mock_gen_puzzle, mock_set_difficulty, mock_set_category):
+        game = HangmanGame()
+        game.init_game()
+
+        self.assertEqual(game.give_hint(), "A king without a crown.\n")
+        self.assertTrue(game.give_hint().startswith("Try the letter '"))
+
+    def test_evil_game_recommends_letters_only(self):
+        game = HangmanGame(evil=True)
+        game.start_game(Category.ANIMALS, 1)
+        game.process_guess("e")
+        hint = game.give_hint()
+        self.assertTrue(hint.startswith("Try the letter '"))
+        self.assertNotIn(game.hangman_puzzle.get_puzzle().get_hint(), hint)
+        self.assertEqual(game.advisor.count_candidates(), game.hangman_puzzle.get_candidate_count())
+
+    def test_advisor_is_built_on_demand(self):
+        game = HangmanGame()
+        game.resume_game(Category.ANIMALS, 1, Puzzle("lion", "A king without a crown."), 0, 0)
+        for guess in "lie":
+            game.process_guess(guess)
+        self.assertIsNone(game.advisor)
+
+        expected = LetterAdvisor(get_advisor_index().bitsets(Category.ANIMALS, 4))
+        for letter in "lie":
+            expected.observe(letter, game.hangman_puzzle.get_letter_positions(letter))
+        game.give_hint()
+        game.give_hint()
+        self.assertEqual(game.advisor.get_candidates(), expected.get_candidates())
+
+        game.process_guess("o")
+        expected.observe("o", game.hangman_puzzle.get_letter_positions("o"))
+        self.assertEqual(game.advisor.get_candidates(), expected.get_candidates())
+
+
 class TestSumUpTheGame(unittest.TestCase):
     @patch('builtins.print')
     def test_sum_up_the_game_win(self, mock_print):
         game = HangmanGame()
         game.hangman_puzzle = HangmanPuzzle(Puzzle("lion", "A king without a crown."))
-        game.hangman_puzzle._is_guessed = True
+        for letter in "lion":
+            game.hangman_puzzle.process_letter(letter)
         game.mistakes = 2
         game.max_mistakes = 5
 
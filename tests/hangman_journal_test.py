@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+
+from src.hangman_game import HangmanGame
+from src.hangman_journal import GameJournal, list_segments, read_journal
+from src.hangman_puzzle_generator import Category
+from src.hangman_snapshot import restore_game
+
+
+class TestGameJournal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, "journal")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def play(self, journal: GameJournal, session_id: int, guesses: str, evil: bool = False) -> HangmanGame:
+        game = HangmanGame(journal=journal, session_id=session_id, evil=evil)
+        game.start_game(Category.ANIMALS, 1)
+        for guess in guesses:
+            game.process_guess(guess)
+        return game
+
+    def assertRecovered(self, recovered: HangmanGame, game: HangmanGame):
+        self.assertEqual(recovered.category, game.category)
+        self.assertEqual(recovered.difficulty, game.difficulty)
+        self.assertEqual(recovered.mistakes, game.mistakes)
+        self.assertEqual(recovered.hangman_puzzle.get_puzzle().get_word(), game.hangman_puzzle.get_puzzle().get_word())
+        self.assertEqual(recovered.hangman_puzzle.get_guessed_mask(), game.hangman_puzzle.get_guessed_mask())
+
+    def test_recover_games_in_progress(self):
+        with GameJournal(self.directory) as journal:
+            first = self.play(journal, 1, "ea")
+            second = self.play(journal, 2, "zq")
+            finished = self.play(journal, 3, "o")
+            finished.finish_game()
+
+        with GameJournal(self.directory) as journal:
+            games = journal.recover()
+        self.assertEqual(sorted(games), [1, 2])
+        self.assertRecovered(games[1], first)
+        self.assertRecovered(games[2], second)
+
+    def test_recover_evil_games(self):
+        with GameJournal(self.directory) as journal:
+            game = self.play(journal, 1, "ote", evil=True)
+        with GameJournal(self.directory) as journal:
+            recovered = journal.recover()[1]
+        self.assertTrue(recovered.evil)
+        self.assertRecovered(recovered, game)
+        self.assertEqual(recovered.hangman_puzzle.get_candidate_count(), game.hangman_puzzle.get_candidate_count())
+
+    def test_durable_records_are_on_disk(self):
+        with GameJournal(self.directory, commit_interval=0, durable=True) as journal:
+            game = self.play(journal, 7, "e")
+            self.assertRecovered(restore_game(read_journal(self.directory)[7]), game)
+
+    def test_writer_failure_is_raised(self):
+        journal = GameJournal(self.directory, commit_interval=0, durable=True)
+        with journal._io_lock:
+            journal._file.close()
+        with self.assertRaises(RuntimeError):
+            journal.log_end(1)
+        with self.assertRaises(RuntimeError):
+            journal.flush()
+        with self.assertRaises(RuntimeError):
+            journal.close()
+
+    def test_writer_failure_is_raised_without_durable(self):
+        journal = GameJournal(self.directory, commit_interval=0)
+        with journal._io_lock:
+            journal._file.close()
+        journal.log_end(1)
+        with self.assertRaises(RuntimeError):
+            journal.flush()
+        with self.assertRaises(RuntimeError):
+            journal.log_end(2)
+        with self.assertRaises(RuntimeError):
+            journal.close()
+
+    def test_torn_tail_is_ignored(self):
+        with GameJournal(self.directory) as journal:
+            game = self.play(journal, 1, "e")
+            self.play(journal, 2, "")
+        _, path = list_segments(self.directory)[-1]
+        with open(path, 'r+b') as file:
+            file.truncate(os.path.getsize(path) - 3)
+
+        games = read_journal(self.directory)
+        self.assertEqual(list(games), [1])
+        self.assertRecovered(restore_game(games[1]), game)
+
+    def test_damaged_record_is_ignored(self):
+        with GameJournal(self.directory) as journal:
+            self.play(journal, 1, "")
+        _, path = list_segments(self.directory)[-1]
+        with open(path, 'r+b') as file:
+            file.seek(-1, os.SEEK_END)
+            last_byte = file.read(1)
+            file.seek(-1, os.SEEK_END)
+            file.write(bytes([last_byte[0] ^ 0xFF]))
+        self.assertEqual(read_journal(self.directory), {})
+
+    def test_segments_rotate(self):
+        with GameJournal(self.directory, segment_size=64) as journal:
+            games = {}
+            for session_id in range(5):
+                games[session_id] = self.play(journal, session_id, "eaio")
+                journal.flush()
+        self.assertGreater(len(list_segments(self.directory)), 2)
+
+        recovered = read_journal(self.directory)
+        self.assertEqual(sorted(recovered), list(range(5)))
+        for session_id, game in games.items():
+            self.assertRecovered(restore_game(recovered[session_id]), game)
+
+    def test_compaction_drops_finished_games(self):
+        with GameJournal(self.directory, segment_size=64) as journal:
+            in_progress = self.play(journal, 1, "e")
+            for session_id in range(2, 10):
+                self.play(journal, session_id, "ea").finish_game()
+                journal.flush()
+            journal.compact()
+            self.assertEqual(len(list_segments(self.directory)), 2)
+
+            in_progress.process_guess("o")
+            self.play(journal, 2, "")
+            journal.log_end(2)
+
+        games = read_journal(self.directory)
+        self.assertEqual(list(games), [1])
+        self.assertRecovered(restore_game(games[1]), in_progress)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import io
+import os
+import unittest
+
+from src.hangman_game import HangmanGame, SpecialCommand
+from src.hangman_keyboard import Key, Keyboard, parse_keys, select_option, split_keys, termios
+from src.hangman_renderer import TerminalRenderer
+
+
+class FakeKeyboard:
+    def __init__(self, keys: list[str]):
+        self.keys = list(keys)
+
+    def is_raw(self) -> bool:
+        return True
+
+    def read_key(self) -> str:
+        return self.keys.pop(0) if self.keys else Key.EOF
+
+
+class TestParseKeys(unittest.TestCase):
+    def test_characters(self):
+        self.assertEqual(parse_keys("aёZ?"), ["a", "ё", "Z", "?"])
+
+    def test_arrows(self):
+        self.assertEqual(parse_keys("\x1b[A\x1b[B\x1bOC\x1b[D"), [Key.UP, Key.DOWN, Key.RIGHT, Key.LEFT])
+
+    def test_control_keys(self):
+        self.assertEqual(parse_keys("\r\n\x7f\x04"), [Key.ENTER, Key.ENTER, Key.BACKSPACE, Key.EOF])
+
+    def test_escape(self):
+        self.assertEqual(parse_keys("\x1b"), [Key.ESCAPE])
+        self.assertEqual(parse_keys("\x1bq"), [Key.ESCAPE, "q"])
+
+    def test_unknown_sequences_are_dropped(self):
+        self.assertEqual(parse_keys("a\x1b[5~b\x1b[1;5A"), ["a", "b", Key.UP])
+        self.assertEqual(parse_keys("a\x1b[1;"), ["a"])
+
+    def test_unfinished_sequences(self):
+        self.assertEqual(split_keys("a\x1b"), (["a"], "\x1b"))
+        self.assertEqual(split_keys("\x1b[1;"), ([], "\x1b[1;"))
+        self.assertEqual(split_keys("\x1bq\x1b[A"), ([Key.ESCAPE, "q", Key.UP], ""))
+
+
+class TestKeyboard(unittest.TestCase):
+    def test_falls_back_when_not_a_terminal(self):
+        with Keyboard(io.StringIO("abc")) as keyboard:
+            self.assertFalse(keyboard.is_raw())
+
+    @unittest.skipIf(termios is None, "termios is not available")
+    def test_raw_mode_on_a_terminal(self):
+        import pty
+        master, slave = pty.openpty()
+        self.addCleanup(os.close, master)
+        with open(slave, 'r', closefd=True) as stream:
+            attributes = termios.tcgetattr(slave)
+            with Keyboard(stream) as keyboard:
+                self.assertTrue(keyboard.is_raw())
+                self.assertFalse(termios.tcgetattr(slave)[3] & termios.ICANON)
+                os.write(master, "x\x1b[B".encode() + "ё".encode()[:1])
+                self.assertEqual(keyboard.read_key(), "x")
+                self.assertEqual(keyboard.read_key(), Key.DOWN)
+                os.write(master, "ё".encode()[1:])
+                self.assertEqual(keyboard.read_key(), "ё")
+            self.assertFalse(keyboard.is_raw())
+            self.assertEqual(termios.tcgetattr(slave), attributes)
+
+            with Keyboard(stream) as keyboard:
+                # An arrow split between two reads.
+                os.write(master, b"x\x1b")
+                self.assertEqual(keyboard.read_key(), "x")
+                os.write(master, b"[A")
+                self.assertEqual(keyboard.read_key(), Key.UP)
+                os.write(master, b"\x1b")
+                self.assertEqual(keyboard.read_key(), Key.ESCAPE)
+
+            with self.assertRaises(RuntimeError):
+                with Keyboard(stream):
+                    raise RuntimeError
+            self.assertEqual(termios.tcgetattr(slave), attributes)
+
+
+class TestSelectOption(unittest.TestCase):
+    def setUp(self):
+        self.renderer = TerminalRenderer(io.StringIO())
+
+    def test_arrows_and_enter(self):
+        keyboard = FakeKeyboard([Key.DOWN, Key.DOWN, Key.UP, Key.ENTER])
+        self.assertEqual(select_option(keyboard, self.renderer, "Choose", ["a", "b", "c"]), 1)
+
+    def test_wraps_around(self):
+        keyboard = FakeKeyboard([Key.UP, Key.ENTER])
+        self.assertEqual(select_option(keyboard, self.renderer, "Choose", ["a", "b", "c"]), 2)
+
+    def test_number_chooses_at_once(self):
+        keyboard = FakeKeyboard(["x", "3"])
+        self.assertEqual(select_option(keyboard, self.renderer, "Choose", ["a", "b", "c"]), 2)
+
+    def test_non_ascii_digits_are_ignored(self):
+        keyboard = FakeKeyboard(["²", "٣", "2"])
+        self.assertEqual(select_option(keyboard, self.renderer, "Choose", ["a", "b", "c"]), 1)
+
+    def test_closed_input(self):
+        with self.assertRaises(EOFError):
+            select_option(FakeKeyboard([]), self.renderer, "Choose", ["a"])
+
+
+class TestKeyGuesses(unittest.TestCase):
+    def test_keys_are_mapped_to_guesses(self):
+        game = HangmanGame(renderer=TerminalRenderer(io.StringIO()),
+                           keyboard=FakeKeyboard([Key.DOWN, "e", "?", Key.ENTER, Key.ESCAPE]))
+        self.assertEqual(game.read_guess(), "e")
+        self.assertEqual(game.read_guess(), SpecialCommand.HELP_WORD)
+        self.assertEqual(game.read_guess(), SpecialCommand.STOP_WORD)
+        self.assertEqual(game.read_guess(), SpecialCommand.STOP_WORD)
+
+
+if __name__ == '__main__':
+    unittest.main()
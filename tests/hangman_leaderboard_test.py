@@ -0,0 +1,134 @@
+import os
+import random
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from src.hangman_game import HangmanGame
+from src.hangman_leaderboard import GLOBAL_SCOPE, Leaderboard, LeaderboardEntry, RankedKeys, scope_name
+from src.hangman_puzzle_generator import Category, PUZZLES_BY_CATEGORY_LIST
+
+
+class TestRankedKeys(unittest.TestCase):
+    @patch('src.hangman_leaderboard.BUCKET_LOAD', 4)
+    def test_matches_sorted_list(self):
+        rng = random.Random(5)
+        keys = RankedKeys()
+        expected = set()
+        for _ in range(2000):
+            key = rng.randrange(500)
+            if key in expected:
+                keys.remove(key)
+                expected.remove(key)
+            else:
+                keys.add(key)
+                expected.add(key)
+        expected = sorted(expected)
+
+        self.assertEqual(list(keys), expected)
+        self.assertEqual(len(keys), len(expected))
+        for index, key in enumerate(expected):
+            self.assertEqual(keys.rank(key), index)
+            self.assertEqual(next(keys.iter_from(index)), key)
+        self.assertEqual(keys.rank(1000), len(expected))
+        self.assertEqual(list(keys.iter_from(len(expected) - 3)), expected[-3:])
+
+    def test_remove_missing_key(self):
+        keys = RankedKeys([1, 3])
+        with self.assertRaises(KeyError):
+            keys.remove(2)
+        with self.assertRaises(KeyError):
+            keys.remove(4)
+
+
+class TestLeaderboard(unittest.TestCase):
+    def setUp(self):
+        self.leaderboard = Leaderboard()
+        for player, category, difficulty, score in [("ann", "animals", 1, 16), ("bob", "fruits", 2, 8),
+                                                    ("cid", "animals", 1, 4), ("bob", "animals", 1, 8),
+                                                    ("dan", "animals", 2, 16), ("eve", "fruits", 2, 0)]:
+            self.leaderboard.record(player, category, difficulty, score)
+
+    def test_top(self):
+        self.assertEqual(self.leaderboard.top(3), [LeaderboardEntry(1, "ann", 16), LeaderboardEntry(2, "bob", 16),
+                                                   LeaderboardEntry(3, "dan", 16)])
+        self.assertEqual([entry.player for entry in self.leaderboard.top(10, "animals:1")], ["ann", "bob", "cid"])
+        self.assertEqual(self.leaderboard.top(10, "nature"), [])
+
+    def test_rank(self):
+        self.assertEqual(self.leaderboard.rank("cid"), LeaderboardEntry(4, "cid", 4))
+        self.assertEqual(self.leaderboard.rank("eve"), LeaderboardEntry(5, "eve", 0))
+        self.assertEqual(self.leaderboard.rank("bob", scope_name("fruits")), LeaderboardEntry(1, "bob", 8))
+        self.assertIsNone(self.leaderboard.rank("cid", "fruits"))
+        self.assertIsNone(self.leaderboard.rank("zed"))
+
+    def test_scores_accumulate(self):
+        self.leaderboard.record("cid", "animals", 1, 32)
+        self.assertEqual(self.leaderboard.rank("cid"), LeaderboardEntry(1, "cid", 36))
+        self.assertEqual(self.leaderboard.rank("ann"), LeaderboardEntry(2, "ann", 16))
+
+    def test_around(self):
+        self.assertEqual([entry.player for entry in self.leaderboard.around("dan", 1)], ["bob", "dan", "cid"])
+        self.assertEqual([entry.player for entry in self.leaderboard.around("ann", 2)], ["ann", "bob", "dan"])
+        self.assertEqual([entry.rank for entry in self.leaderboard.around("eve", 1)], [4, 5])
+        self.assertEqual(self.leaderboard.around("zed", 1), [])
+
+    def test_scopes(self):
+        self.assertEqual(set(self.leaderboard.scopes()),
+                         {GLOBAL_SCOPE, "animals", "animals:1", "animals:2", "fruits", "fruits:2"})
+        self.assertEqual(self.leaderboard.size(), 5)
+        self.assertEqual(self.leaderboard.size("animals"), 4)
+
+    def test_invalid_records(self):
+        with self.assertRaises(ValueError):
+            self.leaderboard.record("ann", "animals", 1, -1)
+        with self.assertRaises(ValueError):
+            self.leaderboard.record("a\0b", "animals", 1, 1)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "leaderboard.bin")
+            self.leaderboard.save(path)
+            loaded = Leaderboard.load(path)
+            for scope in self.leaderboard.scopes():
+                self.assertEqual(loaded.top(10, scope), self.leaderboard.top(10, scope))
+            loaded.record("eve", "fruits", 2, 64)
+            self.assertEqual(loaded.rank("eve"), LeaderboardEntry(1, "eve", 64))
+
+            with open(path, 'r+b') as file:
+                file.truncate(os.path.getsize(path) - 4)
+            with self.assertRaises(ValueError):
+                Leaderboard.load(path)
+
+    def test_scopes_hold_their_players_only(self):
+        for player_ind in range(1000):
+            self.leaderboard.record(f"player{player_ind}", "animals", 1, player_ind)
+        self.leaderboard.record("late", "nature", 3, 5)
+        self.assertEqual(len(self.leaderboard._scopes["nature:3"].scores), 1)
+        self.assertEqual(self.leaderboard.rank("late", "nature:3"), LeaderboardEntry(1, "late", 5))
+
+    def test_periodic_snapshots(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "leaderboard.bin")
+            self.leaderboard.start_snapshots(path, interval=0.01)
+            self.addCleanup(self.leaderboard.stop_snapshots)
+            for _ in range(200):
+                if os.path.exists(path):
+                    break
+                time.sleep(0.01)
+            self.leaderboard.stop_snapshots()
+            self.assertEqual(Leaderboard.load(path).top(10), self.leaderboard.top(10))
+
+    def test_finished_games_are_recorded(self):
+        game = HangmanGame(player="ann", leaderboard=self.leaderboard)
+        game.resume_game(Category.ANIMALS, 1, PUZZLES_BY_CATEGORY_LIST[Category.ANIMALS][0], 0, 0)
+        for letter in set(PUZZLES_BY_CATEGORY_LIST[Category.ANIMALS][0].get_word()):
+            game.process_guess(letter)
+        message = game.finish_game()
+        self.assertEqual(self.leaderboard.rank("ann").score, 16 + game.current_score)
+        self.assertIn("rank 1 of 5", message)
+
+
+if __name__ == '__main__':
+    unittest.main()
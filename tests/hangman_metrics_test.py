@@ -0,0 +1,93 @@
+import json
+import os
+import signal
+import tempfile
+import threading
+import time
+import unittest
+
+from src.hangman_metrics import Histogram, Metrics, NULL_SPAN, SignalExporter
+
+
+class TestMetrics(unittest.TestCase):
+    def test_disabled_metrics_record_nothing(self):
+        metrics = Metrics()
+        self.assertIs(metrics.span("turn"), NULL_SPAN)
+        with metrics.span("turn"):
+            pass
+        metrics.count("events.hit")
+        self.assertEqual(metrics.counters, {})
+        self.assertEqual(metrics.histograms, {})
+
+    def test_spans_and_counters(self):
+        metrics = Metrics(enabled=True)
+        for _ in range(3):
+            with metrics.span("turn.render"):
+                pass
+        metrics.count("events.hit", 2)
+        metrics.count("events.hit")
+        self.assertEqual(metrics.histograms["turn.render"].count, 3)
+        self.assertEqual(metrics.counters["events.hit"], 3)
+
+    def test_histogram_quantiles(self):
+        histogram = Histogram()
+        for _ in range(99):
+            histogram.observe(0.0004)
+        histogram.observe(2.0)
+        self.assertEqual(histogram.quantile(0.5), 0.0005)
+        self.assertEqual(histogram.quantile(0.99), 0.0005)
+        self.assertEqual(histogram.quantile(1.0), 2.5)
+        histogram.observe(100.0)
+        self.assertEqual(histogram.quantile(1.0), float("inf"))
+
+    def test_prometheus_export(self):
+        metrics = Metrics(enabled=True)
+        metrics.observe("turn.input_wait", 0.003)
+        metrics.count("events.miss")
+        text = metrics.to_prometheus()
+        self.assertIn("# TYPE hangman_events_miss_total counter\nhangman_events_miss_total 1\n", text)
+        self.assertIn('hangman_turn_input_wait_seconds_bucket{le="0.0025"} 0\n', text)
+        self.assertIn('hangman_turn_input_wait_seconds_bucket{le="0.005"} 1\n', text)
+        self.assertIn('hangman_turn_input_wait_seconds_bucket{le="+Inf"} 1\n', text)
+        self.assertIn("hangman_turn_input_wait_seconds_count 1\n", text)
+
+    def test_json_export(self):
+        metrics = Metrics(enabled=True)
+        metrics.observe("render.write", 0.00002)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.json")
+            metrics.export(path, "json")
+            with open(path, encoding="utf-8") as file:
+                snapshot = json.load(file)
+        self.assertEqual(snapshot["histograms"]["render.write"]["count"], 1)
+        self.assertEqual(snapshot["histograms"]["render.write"]["p50"], 0.000025)
+
+    @unittest.skipUnless(hasattr(signal, "pthread_kill"), "SIGUSR1 is not available")
+    def test_signal_while_the_lock_is_held(self):
+        metrics = Metrics(enabled=True)
+        metrics.count("events.hit")
+        previous_handler = signal.getsignal(signal.SIGUSR1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.prom")
+            exporter = SignalExporter(metrics, path)
+            exporter.install()
+            try:
+                with metrics._lock:
+                    signal.pthread_kill(threading.get_ident(), signal.SIGUSR1)
+                    # The handler has run by now and returned without waiting for the lock.
+                    metrics.counters["events.miss"] = 1
+                for _ in range(500):
+                    if os.path.exists(path):
+                        break
+                    time.sleep(0.01)
+                with open(path, encoding="utf-8") as file:
+                    text = file.read()
+            finally:
+                exporter.close()
+                signal.signal(signal.SIGUSR1, previous_handler)
+        self.assertIn("hangman_events_hit_total 1\n", text)
+        self.assertIn("hangman_events_miss_total 1\n", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
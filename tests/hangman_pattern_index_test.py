@@ -0,0 +1,81 @@
+import contextlib
+import io
+import random
+import unittest
+
+from src.hangman_alphabet import CYRILLIC
+from src.hangman_pattern_index import CompressedBitmap, PatternIndex, main, parse_pattern
+from src.hangman_puzzle import Puzzle
+from src.hangman_puzzle_generator import Category, PUZZLES_BY_CATEGORY_LIST
+
+
+def fits(word: str, pattern: str, excluded: str) -> bool:
+    open_letters = set(pattern) - {"_"}
+    return len(word) == len(pattern) and not set(word) & set(excluded) and all(
+        (char == letter) if char != "_" else letter not in open_letters for char, letter in zip(pattern, word))
+
+
+class TestCompressedBitmap(unittest.TestCase):
+    def test_matches_sets(self):
+        rng = random.Random(3)
+        sets = [set(rng.sample(range(200000), size)) for size in (0, 30, 3000, 60000, 150000)]
+        sets.append(set(range(65536, 131072)))
+        bitmaps = [CompressedBitmap.from_ids(sorted(ids)) for ids in sets]
+        for first, first_bitmap in zip(sets, bitmaps):
+            self.assertEqual(len(first_bitmap), len(first))
+            self.assertEqual(list(first_bitmap), sorted(first))
+            for second, second_bitmap in zip(sets, bitmaps):
+                self.assertEqual(list(first_bitmap & second_bitmap), sorted(first & second))
+                self.assertEqual(list(first_bitmap - second_bitmap), sorted(first - second))
+
+    def test_contains(self):
+        bitmap = CompressedBitmap.from_ids([3, 70000, *range(140000, 142000)])
+        self.assertIn(3, bitmap)
+        self.assertIn(70000, bitmap)
+        self.assertIn(141999, bitmap)
+        self.assertNotIn(4, bitmap)
+        self.assertNotIn(300000, bitmap)
+
+    def test_sparse_chunks_are_smaller(self):
+        self.assertEqual(CompressedBitmap.from_ids([1, 5, 9]).nbytes(), 6)
+        self.assertEqual(CompressedBitmap.from_ids(range(5000)).nbytes(), 8192)
+
+
+class TestPatternIndex(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        words = ["".join(rng.choices("aeilnorst", k=rng.randint(3, 6))) for _ in range(3000)]
+        index = PatternIndex({"words": [Puzzle(word, "") for word in words]})
+        for pattern, excluded in [("_a__a_", "eot"), ("____", ""), ("s___", "a"), ("__", "aeilnorst"),
+                                  ("t_t", ""), ("zzz", ""), ("_______", "")]:
+            matches = index.match("words", pattern, excluded)
+            expected = [word_id for word_id, word in enumerate(words) if fits(word, pattern, excluded)]
+            self.assertEqual(len(matches), len(expected), pattern)
+            self.assertEqual(list(matches), expected, pattern)
+            self.assertEqual([puzzle.get_word() for puzzle in matches.puzzles()],
+                             [words[word_id] for word_id in expected])
+
+    def test_word_bank_categories(self):
+        index = PatternIndex(PUZZLES_BY_CATEGORY_LIST, {Category.ANIMALS_RU: CYRILLIC})
+        animals = [puzzle.get_word() for puzzle in PUZZLES_BY_CATEGORY_LIST[Category.ANIMALS_RU]]
+        self.assertEqual([animals[word_id] for word_id in index.match(Category.ANIMALS_RU, "__", "ж")],
+                         [word for word in animals if fits(word, "__", "ж")])
+        with self.assertRaises(ValueError):
+            index.match(Category.ANIMALS_RU, "l___")
+        with self.assertRaises(ValueError):
+            index.match(Category.ANIMALS, "____", "ж")
+
+    def test_parse_pattern(self):
+        self.assertEqual(parse_pattern("_A_"), [None, "a", None])
+        with self.assertRaises(ValueError):
+            parse_pattern("a-b")
+
+    def test_main(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main(["animals", "_i__"])
+        self.assertEqual(output.getvalue().split(), ["1", "lion"])
+
+
+if __name__ == '__main__':
+    unittest.main()
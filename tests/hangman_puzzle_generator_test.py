@@ -2,7 +2,8 @@ import unittest
 from textwrap import dedent
 from unittest.mock import patch
 
-from src.hangman_puzzle_generator import gen_puzzle, Category, PUZZLES_BY_CATEGORY_LIST
+from src.hangman_evil_puzzle import EvilHangmanPuzzle
+from src.hangman_puzzle_generator import gen_puzzle, get_difficulty_index, Category, PUZZLES_BY_CATEGORY_LIST
 
 
 class TestGenPuzzle(unittest.TestCase):
@@ -47,6 +48,28 @@ class TestGenPuzzle(unittest.TestCase):
                             I touch your face, I'm in your words,
                             I'm lack of space and beloved by birds.\n"""))
 
+    def test_gen_puzzle_takes_word_of_difficulty(self):
+        for difficulty in range(1, 5):
+            band_words = {puzzle.get_word() for puzzle in get_difficulty_index().puzzles(Category.ANIMALS, difficulty)}
+            for _ in range(10):
+                _, _, puzzle = gen_puzzle(Category.ANIMALS, difficulty)
+                self.assertIn(puzzle.get_puzzle().get_word(), band_words)
+
+    def test_gen_puzzle_with_word_band(self):
+        band_words = {puzzle.get_word() for puzzle in get_difficulty_index().band(Category.FRUITS, 3, 4)}
+        for _ in range(10):
+            _, difficulty, puzzle = gen_puzzle(Category.FRUITS, 1, word_band=(3, 4))
+            self.assertEqual(difficulty, 1)
+            self.assertIn(puzzle.get_puzzle().get_word(), band_words)
+
+    def test_gen_evil_puzzle(self):
+        _, _, puzzle = gen_puzzle(Category.ANIMALS, 2, evil=True)
+        self.assertIsInstance(puzzle, EvilHangmanPuzzle)
+        length = len(puzzle.get_guessed_part())
+        same_length = [p for p in PUZZLES_BY_CATEGORY_LIST[Category.ANIMALS] if len(p.get_word()) == length]
+        self.assertEqual(puzzle.get_candidate_count(), len(same_length))
+        self.assertIn(puzzle.get_puzzle().get_word(), {p.get_word() for p in same_length})
+
 
 if __name__ == '__main__':
     unittest.main()
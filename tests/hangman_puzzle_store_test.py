@@ -0,0 +1,64 @@
+import unittest
+from array import array
+
+from src.hangman_puzzle import Puzzle
+from src.hangman_puzzle_generator import (Category, PUZZLES_BY_CATEGORY_LIST, gen_puzzle, get_difficulty_index,
+                                          set_word_bank)
+from src.hangman_puzzle_store import NO_DIFFICULTY, PuzzleStore, store_word_bank
+
+
+class TestPuzzleStore(unittest.TestCase):
+    def setUp(self):
+        self.store = store_word_bank(PUZZLES_BY_CATEGORY_LIST, get_difficulty_index())
+
+    def tearDown(self):
+        set_word_bank(PUZZLES_BY_CATEGORY_LIST)
+
+    def test_views_match_puzzles(self):
+        self.assertEqual(list(self.store), list(PUZZLES_BY_CATEGORY_LIST))
+        for category, puzzles in PUZZLES_BY_CATEGORY_LIST.items():
+            stored = self.store[category]
+            self.assertEqual([(puzzle.get_word(), puzzle.get_hint()) for puzzle in stored],
+                             [(puzzle.get_word(), puzzle.get_hint()) for puzzle in puzzles])
+            self.assertEqual(list(stored.iter_words()), [puzzle.get_word() for puzzle in puzzles])
+            self.assertEqual([puzzle.get_id() for puzzle in stored], list(range(len(puzzles))))
+            self.assertEqual({puzzle.get_category() for puzzle in stored}, {category})
+            self.assertEqual(stored[-1].get_word(), puzzles[-1].get_word())
+        with self.assertRaises(IndexError):
+            self.store[Category.ANIMALS][len(PUZZLES_BY_CATEGORY_LIST[Category.ANIMALS])]
+
+    def test_difficulty_codes(self):
+        index = get_difficulty_index()
+        for difficulty in (1, 2, 3):
+            band = index.puzzles(Category.FRUITS, difficulty)
+            rows = self.store.rows_with_difficulty(Category.FRUITS, difficulty)
+            self.assertEqual(sorted(self.store.puzzle(row).get_word() for row in rows),
+                             sorted(puzzle.get_word() for puzzle in band))
+
+        unscored = PuzzleStore.from_puzzles({"words": [Puzzle("cat", "meow")]})
+        self.assertEqual(unscored["words"][0].get_difficulty(), NO_DIFFICULTY)
+
+    def test_columns(self):
+        store = PuzzleStore.from_puzzles({"a": [Puzzle("ёж", "Колючий"), Puzzle("cat", "")],
+                                          "b": [Puzzle("dog", "Woof\tbark")]})
+        self.assertEqual(store.puzzle_count(), 3)
+        self.assertEqual(store["a"][0].get_word(), "ёж")
+        self.assertEqual(store["a"][1].get_hint(), "")
+        self.assertEqual(store["b"][0].get_hint(), "Woof\tbark")
+        self.assertEqual(store["b"][0].get_id(), 0)
+        self.assertEqual(store.category(2), "b")
+        self.assertEqual(store["b"].rows(), range(2, 3))
+        self.assertEqual(store.nbytes(), len("ёжcatdog".encode()) + len("КолючийWoof\tbark".encode())
+                         + 2 * 4 * array('I').itemsize + 2 * 3)
+        self.assertEqual(store["a"][1], store.puzzle(1))
+        self.assertNotEqual(store["a"][1], store.puzzle(0))
+
+    def test_gen_puzzle_from_store(self):
+        set_word_bank(self.store)
+        category, difficulty, puzzle = gen_puzzle(Category.ANIMALS, 2)
+        self.assertIn(puzzle.get_puzzle().get_word(),
+                      [puzzle.get_word() for puzzle in PUZZLES_BY_CATEGORY_LIST[Category.ANIMALS]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,6 +39,28 @@ class TestHangmanPuzzle(unittest.TestCase):
         self.assertTrue(self.hangman_puzzle.get_is_guessed())
         self.assertEqual(self.hangman_puzzle.get_guessed_part(), ['a', 'p', 'p', 'l', 'e'])
 
+    def test_repeated_letter_is_revealed_at_once(self):
+        self.hangman_puzzle.process_letter('p')
+        self.assertEqual(self.hangman_puzzle.get_guessed_part(), ['_', 'p', 'p', '_', '_'])
+        self.assertFalse(self.hangman_puzzle.get_is_guessed())
+
+    def test_guessed_part_is_read_only_view(self):
+        guessed_part = self.hangman_puzzle.get_guessed_part()
+        self.hangman_puzzle.process_letter('e')
+        self.assertEqual(''.join(guessed_part), "____e")
+        with self.assertRaises(TypeError):
+            guessed_part[0] = 'a'
+
+    def test_word_out_of_alphabet(self):
+        with self.assertRaises(ValueError):
+            HangmanPuzzle(Puzzle(word="café", hint=""))
+
+    def test_puzzles_are_distinct_and_hashable(self):
+        first = Puzzle("apple", "A fruit")
+        second = Puzzle("pear", "Another fruit")
+        self.assertNotEqual(first, second)
+        self.assertEqual(len({first, second, first}), 2)
+
 
 if __name__ == '__main__':
     unittest.main()
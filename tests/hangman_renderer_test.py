@@ -0,0 +1,70 @@
+import io
+import unittest
+
+from src.hangman_renderer import TerminalRenderer, CURSOR_HOME, ERASE_SCREEN, ERASE_BELOW, move_cursor
+
+
+class FakeTerminal(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+class TestTerminalRenderer(unittest.TestCase):
+    def setUp(self):
+        self.stream = FakeTerminal()
+        self.renderer = TerminalRenderer(self.stream)
+
+    def take_output(self) -> str:
+        output = self.stream.getvalue()
+        self.stream.seek(0)
+        self.stream.truncate()
+        return output
+
+    def test_first_frame_clears_screen(self):
+        self.renderer.render(picture="+---+\n|", word="The word: ____", prompt="Guess a letter:")
+        output = self.take_output()
+        self.assertTrue(output.startswith(CURSOR_HOME + ERASE_SCREEN))
+        self.assertIn("The word: ____", output)
+        self.assertTrue(output.endswith(move_cursor(5) + ERASE_BELOW))
+
+    def test_only_changed_region_is_redrawn(self):
+        self.renderer.render(picture="+---+\n|", word="The word: ____", message="", prompt="Guess a letter:")
+        self.take_output()
+
+        self.renderer.render(picture="+---+\n|", word="The word: l___", message="Hit!", prompt="Guess a letter:")
+        output = self.take_output()
+        self.assertNotIn(ERASE_SCREEN, output)
+        self.assertNotIn("+---+", output)
+        self.assertIn(move_cursor(3), output)
+        self.assertIn("The word: l___", output)
+        self.assertIn("Hit!", output)
+        self.assertIn("Guess a letter:", output)
+
+    def test_unchanged_frame_only_clears_input_line(self):
+        self.renderer.render(word="The word: ____", prompt="Guess a letter:")
+        self.take_output()
+
+        self.renderer.render(word="The word: ____", prompt="Guess a letter:")
+        self.assertEqual(self.take_output(), move_cursor(3) + ERASE_BELOW)
+
+    def test_non_tty_fallback(self):
+        stream = io.StringIO()
+        renderer = TerminalRenderer(stream)
+        renderer.render(word="The word: ____", message="Hit!\n")
+        renderer.render(word="The word: l___")
+        self.assertEqual(stream.getvalue(), "The word: ____\nHit!\nThe word: l___\n")
+
+    def test_non_tty_header_is_written_once(self):
+        stream = io.StringIO()
+        renderer = TerminalRenderer(stream)
+        renderer.render(header="Rules", word="The word: ____")
+        renderer.render(header="Rules", word="The word: l___")
+        self.assertEqual(stream.getvalue(), "Rules\nThe word: ____\nThe word: l___\n")
+
+    def test_unknown_region(self):
+        with self.assertRaises(ValueError):
+            self.renderer.render(footer="bye")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from src.hangman_game import HangmanGame
+from src.hangman_replay import ScriptError, main, replay_lines, replay_script, replay_stream
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.game = HangmanGame()
+
+    def replay(self, **script) -> dict:
+        return replay_script(self.game, script)
+
+    def test_win(self):
+        result = self.replay(word="lion", category="animals", difficulty=1, guesses="lxionzz")
+        self.assertEqual(result, {"category": "animals", "word": "lion", "difficulty": 1, "outcome": "won",
+                                  "mistakes": 1, "score": 32, "guesses": 5})
+
+    def test_loss_quit_and_unfinished(self):
+        self.assertEqual(self.replay(word="lion", category="animals", difficulty=4, guesses="zl")["outcome"], "lost")
+        result = self.replay(word="lion", category="animals", difficulty=1, guesses=["l", "help", "quit", "i"])
+        self.assertEqual((result["outcome"], result["guesses"]), ("quit", 3))
+        self.assertEqual(self.replay(word="lion", category="animals", difficulty=1, guesses="li")["outcome"],
+                         "unfinished")
+
+    def test_seed_is_deterministic(self):
+        first = self.replay(seed=42, guesses="etaoinshrdlu")
+        second = self.replay(seed=42, guesses="etaoinshrdlu")
+        self.assertEqual(first, second)
+
+    def test_malformed_scripts(self):
+        for script in ({"guesses": "abc"}, {"word": "lion", "difficulty": 1}, {"word": "lion", "category": "planets"},
+                       {"word": "lion", "category": "animals", "difficulty": 9}, {"seed": 1, "guesses": 5}):
+            with self.assertRaises(ScriptError):
+                replay_script(self.game, script)
+
+    def test_replay_lines(self):
+        results = [json.loads(line) for line in replay_lines([
+            '{"id": "a", "word": "bat", "category": "animals", "difficulty": 2, "guesses": "bat"}',
+            '',
+            'not json',
+            '{"id": 7, "word": "bat", "category": "animals"}',
+        ])]
+        self.assertEqual(results[0]["id"], "a")
+        self.assertEqual(results[0]["outcome"], "won")
+        self.assertEqual(results[1]["line"], 3)
+        self.assertIn("error", results[1])
+        self.assertEqual((results[2]["id"], results[2]["line"]), (7, 4))
+
+    def test_parallel_replay_keeps_order(self):
+        lines = [json.dumps({"id": ind, "seed": ind, "difficulty": 2, "guesses": "etaoinshrdlucmfwyp"})
+                 for ind in range(300)]
+        sequential = io.StringIO()
+        replay_stream(lines, sequential, chunk_size=16)
+        parallel = io.StringIO()
+        replay_stream(lines, parallel, jobs=2, chunk_size=16)
+        self.assertEqual(parallel.getvalue(), sequential.getvalue())
+        self.assertEqual([json.loads(line)["id"] for line in parallel.getvalue().splitlines()], list(range(300)))
+
+    def test_main_with_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "scripts.jsonl")
+            output_path = os.path.join(directory, "results.jsonl")
+            with open(input_path, "w", encoding="utf-8") as file:
+                file.write('{"word": "bat", "category": "animals", "difficulty": 3, "guesses": "bat"}\n')
+            main([input_path, "--output", output_path])
+            with open(output_path, encoding="utf-8") as file:
+                self.assertEqual(json.loads(file.read())["outcome"], "won")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
+from textwrap import dedent
 
-from src.hangman_representation import HangmanRepresentation
+from src.hangman_representation import (HangmanRepresentation, PICTURES, PICTURES_BYTES, DIFFICULTY_LEVELS,
+                                         count_parts_drawn)
 
 
 class TestHangmanRepresentation(unittest.TestCase):
@@ -55,6 +57,35 @@ class TestHangmanRepresentation(unittest.TestCase):
         expected_result_1 = [' ', ' ', ' ', ' ', ' ', ' ']
         self.assertEqual(hangman.hangman_parts_drawn, expected_result_1)
 
+    def test_parts_are_never_removed(self):
+        hangman = HangmanRepresentation()
+        hangman.update_hangman_parts(mistakes=2, difficulty=2)
+        hangman.update_hangman_parts(mistakes=1, difficulty=2)
+        self.assertEqual(hangman.hangman_parts_drawn, ['O', '|', '/', '\\', ' ', ' '])
+
+    def test_hangman_picture(self):
+        hangman = HangmanRepresentation()
+        hangman.update_hangman_parts(mistakes=2, difficulty=2)
+        self.assertEqual(hangman.hangman_picture, dedent("""\
+            +---+
+            |   |
+            |   O
+            |  /|\\
+            |     
+            |
+            =======
+            """))
+        self.assertEqual(hangman.hangman_picture_bytes, hangman.hangman_picture.encode())
+
+    def test_pictures_are_prebuilt(self):
+        for difficulty, max_mistakes in enumerate(DIFFICULTY_LEVELS, start=1):
+            for mistakes in range(max_mistakes + 1):
+                hangman = HangmanRepresentation()
+                hangman.update_hangman_parts(mistakes, difficulty)
+                parts_drawn = count_parts_drawn(mistakes, difficulty)
+                self.assertIs(PICTURES[parts_drawn], hangman.hangman_picture)
+                self.assertIs(PICTURES_BYTES[parts_drawn], hangman.hangman_picture_bytes)
+
 
 if __name__ == '__main__':
     unittest.main()
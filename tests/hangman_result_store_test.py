@@ -0,0 +1,81 @@
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.hangman_game import HangmanGame
+from src.hangman_puzzle_generator import Category, PUZZLES_BY_CATEGORY_LIST
+from src.hangman_result_store import GameResult, ResultStore
+
+
+def make_result(player: str, word: str, won: bool, finished_at: float) -> GameResult:
+    return GameResult(player=player, category="animals", word=word, difficulty=2, mistakes=0 if won else 3,
+                      score=64 if won else 0, won=won, duration=1.5, guesses="abc", finished_at=finished_at)
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.store = ResultStore(os.path.join(self.directory.name, "results.db"), batch_size=10,
+                                 flush_interval=0.01)
+        self.addCleanup(self.store.close)
+
+    def test_history_and_word_stats(self):
+        for ind in range(25):
+            self.store.record(make_result("alice" if ind % 2 else "bob", "lion" if ind % 5 else "bat",
+                                          won=ind % 3 != 0, finished_at=1000.0 + ind))
+        self.store.flush()
+
+        history = self.store.player_history("alice", limit=3)
+        self.assertEqual([result.finished_at for result in history], [1023.0, 1021.0, 1019.0])
+        self.assertIsInstance(history[0].won, bool)
+        self.assertEqual(len(self.store.player_history("bob", limit=100)), 13)
+
+        stats = self.store.word_stats("bat")
+        self.assertEqual(stats.games, 5)
+        self.assertEqual(stats.wins, 3)
+        self.assertEqual(self.store.word_stats("owl").games, 0)
+
+    def test_close_commits_queued_results(self):
+        path = self.store.path
+        self.store.record(make_result("carol", "bat", True, 1.0))
+        self.store.close()
+
+        with ResultStore(path) as store:
+            self.assertEqual(len(store.player_history("carol")), 1)
+
+    def test_dropped_results_are_reported(self):
+        connection = sqlite3.connect(self.store.path)
+        connection.execute("DROP TABLE game_results")
+        connection.close()
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            self.store.record(make_result("erin", "bat", True, 1.0))
+            with self.assertRaises(RuntimeError) as context:
+                self.store.flush()
+            self.store.record(make_result("erin", "owl", True, 2.0))
+            with self.assertRaises(RuntimeError):
+                self.store.close()
+        self.assertIsInstance(context.exception.__cause__, sqlite3.OperationalError)
+        self.assertEqual(self.store.dropped_results, 2)
+        self.assertEqual(errors.getvalue().count("Cannot write game results"), 1)
+        self.store.close()
+
+    def test_game_records_result(self):
+        game = HangmanGame(result_store=self.store, player="dave")
+        game.resume_game(Category.ANIMALS, 2, PUZZLES_BY_CATEGORY_LIST[Category.ANIMALS][0], 0, 0)
+        for letter in "bxat":
+            game.process_guess(letter)
+        game.finish_game()
+        self.store.flush()
+
+        [result] = self.store.player_history("dave")
+        self.assertEqual((result.word, result.category, result.difficulty), ("bat", "animals", 2))
+        self.assertEqual((result.mistakes, result.score, result.won, result.guesses), (1, 32, True, "bxat"))
+
+
+if __name__ == '__main__':
+    unittest.main()
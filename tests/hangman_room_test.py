@@ -0,0 +1,190 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from src.hangman_puzzle import HangmanPuzzle, Puzzle
+from src.hangman_puzzle_generator import Category
+from src.hangman_room import HangmanRoom, HangmanRoomServer, RoomMode, RoomView, encode_delta
+
+
+def fixed_puzzle(word: str):
+    return patch('src.hangman_game.gen_puzzle', side_effect=lambda category, difficulty, sampler=None, evil=False:
+                 (Category.ANIMALS, 2, HangmanPuzzle(Puzzle(word, "A hint."))))
+
+
+def apply_all(view: RoomView, data: bytes) -> None:
+    for line in data.decode().splitlines():
+        view.apply(line)
+
+
+class TestHangmanRoom(unittest.TestCase):
+    def setUp(self):
+        patcher = fixed_puzzle("banana")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_guesses_are_broadcast_as_deltas(self):
+        room = HangmanRoom("lobby")
+        ann = room.join("ann")
+        bob = room.join("bob")
+        spectator = room.join("spectator", is_player=False)
+        views = {member: RoomView() for member in (ann, bob, spectator)}
+        for member, view in views.items():
+            apply_all(view, member.take())
+            self.assertEqual(view.word, "______")
+
+        self.assertIsNone(room.guess(ann, "a"))
+        self.assertIsNone(room.guess(bob, "x"))
+        self.assertEqual(spectator.take(), b"+ 2 ann a 1,3,5 0\n+ 3 bob x - 1\n")
+        for member in (ann, bob):
+            apply_all(views[member], member.take())
+            self.assertEqual(views[member].word, "_a_a_a")
+            self.assertEqual(views[member].mistakes, 1)
+
+    def test_encodes_once_per_event(self):
+        room = HangmanRoom("lobby")
+        player = room.join("ann")
+        spectators = [room.join("spectator", is_player=False) for _ in range(300)]
+        for member in [player, *spectators]:
+            member.take()
+        with patch('src.hangman_room.encode_delta', wraps=encode_delta) as encode:
+            room.guess(player, "n")
+        encode.assert_called_once()
+        self.assertTrue(all(spectator._queue[0] is spectators[0]._queue[0] for spectator in spectators))
+
+    def test_rejected_guesses_are_private(self):
+        room = HangmanRoom("lobby", RoomMode.TURNS)
+        ann = room.join("ann")
+        bob = room.join("bob")
+        spectator = room.join("spectator", is_player=False)
+        self.assertIn("banana", room.snapshot().decode().replace("_", "banana"))
+        for member in (ann, bob, spectator):
+            member.take()
+
+        self.assertIn("ann's turn", room.guess(bob, "a"))
+        self.assertIn("Spectators", room.guess(spectator, "a"))
+        self.assertIn("single", room.guess(ann, "ab"))
+        self.assertEqual(room.guess(ann, "help"), "A hint.\n")
+        self.assertFalse(spectator.has_messages())
+
+        self.assertIsNone(room.guess(ann, "b"))
+        self.assertIn("already asked", room.guess(bob, "b"))
+        self.assertEqual(spectator.take(), b"+ 3 ann b 0 0\n> 4 bob\n")
+
+    def test_turns_skip_players_who_leave(self):
+        room = HangmanRoom("lobby", RoomMode.TURNS)
+        ann = room.join("ann")
+        bob = room.join("bob")
+        cid = room.join("cid")
+        room.guess(ann, "b")
+        self.assertIs(room.current_player(), bob)
+        self.assertEqual(room.guess(bob, "quit"), "You left the room.\n")
+        self.assertIs(room.current_player(), cid)
+        room.guess(cid, "n")
+        self.assertIs(room.current_player(), ann)
+
+        view = RoomView()
+        apply_all(view, ann.take())
+        self.assertEqual(view.turn, "ann")
+        self.assertEqual(view.word, "b_n_n_")
+
+    def test_next_round_after_the_end(self):
+        room = HangmanRoom("lobby")
+        player = room.join("ann")
+        view = RoomView()
+        apply_all(view, player.take())
+        for letter in "ban":
+            room.guess(player, letter)
+        data = player.take()
+        self.assertIn(b"! 5 won banana\n", data)
+        apply_all(view, data)
+        self.assertEqual(room.rounds, 2)
+        self.assertEqual(view.word, "______")
+        self.assertEqual(view.seq, room.seq)
+
+    def test_slow_member_gets_a_snapshot(self):
+        room = HangmanRoom("lobby", max_pending_bytes=40)
+        player = room.join("ann")
+        slow = room.join("slow", is_player=False)
+        view = RoomView()
+        apply_all(view, slow.take())
+        player.take()
+
+        for letter in "xyb":
+            room.guess(player, letter)
+        self.assertEqual(slow.dropped, 1)
+        data = slow.take()
+        self.assertTrue(data.startswith(b"= "))
+        apply_all(view, data)
+        self.assertEqual(view.mistakes, 2)
+        self.assertEqual(view.asked, set("xyb"))
+        room.guess(player, "a")
+        apply_all(view, slow.take())
+        self.assertEqual(view.word, "ba_a_a")
+
+    def test_invalid_names(self):
+        room = HangmanRoom("lobby")
+        with self.assertRaises(ValueError):
+            room.join("ann lee")
+        with self.assertRaises(ValueError):
+            room.join("")
+
+
+async def read_until(reader: asyncio.StreamReader, text: str) -> str:
+    data = b""
+    while text.encode() not in data:
+        chunk = await asyncio.wait_for(reader.read(4096), 5)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode()
+
+
+class TestHangmanRoomServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        patcher = fixed_puzzle("lion")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server = HangmanRoomServer(port=0, idle_timeout=2)
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def connect(self, command: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.server.host, self.server.port)
+        self.addCleanup(writer.close)
+        await read_until(reader, "watch.\n")
+        writer.write(f"{command}\n".encode())
+        await read_until(reader, "\n")
+        return reader, writer
+
+    async def test_play_together_over_tcp(self):
+        ann_reader, ann_writer = await self.connect("join lobby ann")
+        bob_reader, bob_writer = await self.connect("join lobby bob")
+        spectators = [await self.connect("watch lobby") for _ in range(5)]
+        self.assertEqual(len(self.server.rooms["lobby"].members), 7)
+
+        ann_writer.write(b"l\ni\n")
+        bob_writer.write(b"o\nn\n")
+        await read_until(bob_reader, "won lion")
+        for reader, _ in spectators:
+            output = await read_until(reader, "won lion")
+            self.assertIn(" won lion\n", output)
+
+        bob_writer.write(b"e\n")
+        self.assertIn("+ 8 bob e - 1\n", await read_until(ann_reader, "bob e - 1\n"))
+
+        for _, writer in spectators:
+            writer.close()
+        ann_writer.write(b"quit\n")
+        bob_writer.close()
+        for _ in range(100):
+            if not self.server.rooms:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.server.rooms, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
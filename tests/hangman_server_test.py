@@ -0,0 +1,87 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from src.hangman_puzzle import HangmanPuzzle, Puzzle
+from src.hangman_puzzle_generator import Category
+from src.hangman_server import HangmanServer
+
+
+async def read_until(reader: asyncio.StreamReader, text: str) -> str:
+    data = b""
+    while text.encode() not in data:
+        chunk = await asyncio.wait_for(reader.read(4096), 5)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode()
+
+
+class TestHangmanServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = HangmanServer(port=0, idle_timeout=0.5)
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.server.host, self.server.port)
+        self.addCleanup(writer.close)
+        return reader, writer
+
+    async def play(self, guesses: str) -> str:
+        reader, writer = await self.connect()
+        await read_until(reader, 'print "random".')
+        writer.write(b"animals\n")
+        await read_until(reader, "mistakes\n")
+        writer.write(b"2\n")
+        await read_until(reader, "Guess a letter:")
+        for letter in guesses:
+            writer.write(f"{letter}\n".encode())
+        return await read_until(reader, "Final score")
+
+    @patch('src.hangman_game.gen_puzzle',
+           return_value=(Category.ANIMALS, 2, HangmanPuzzle(Puzzle("lion", "A king without a crown."))))
+    async def test_play_over_tcp(self, mock_gen_puzzle):
+        output = await self.play("lion")
+        self.assertIn("You won!", output)
+
+    @patch('src.hangman_game.gen_puzzle',
+           side_effect=lambda category, difficulty, sampler=None, evil=False:
+           (Category.ANIMALS, 2, HangmanPuzzle(Puzzle("bat", ""))))
+    async def test_concurrent_sessions(self, mock_gen_puzzle):
+        outputs = await asyncio.gather(*(self.play("bat") for _ in range(20)))
+        for output in outputs:
+            self.assertIn("You won!", output)
+
+    async def test_slow_game_start_does_not_block_other_connections(self):
+        def slow_gen_puzzle(category, difficulty, sampler=None, evil=False):
+            time.sleep(1)
+            return Category.ANIMALS, 2, HangmanPuzzle(Puzzle("lion", ""))
+
+        with patch('src.hangman_game.gen_puzzle', side_effect=slow_gen_puzzle):
+            reader, writer = await self.connect()
+            await read_until(reader, 'print "random".')
+            writer.write(b"animals\n")
+            await read_until(reader, "mistakes\n")
+            started = time.monotonic()
+            writer.write(b"2\n")
+            await asyncio.sleep(0.1)
+
+            # The server shares the event loop with the test, so a blocked loop would delay the reply past the start.
+            other_reader, _ = await self.connect()
+            await read_until(other_reader, 'print "random".')
+            self.assertLess(time.monotonic() - started, 0.5)
+            await read_until(reader, "Guess a letter:")
+
+    async def test_idle_timeout(self):
+        reader, writer = await self.connect()
+        output = await read_until(reader, "bye!")
+        self.assertIn("Idle timeout", output)
+        self.assertEqual(await reader.read(), b"")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import patch
+
+from src.hangman_game import GameEvent
+from src.hangman_puzzle import HangmanPuzzle, Puzzle
+from src.hangman_puzzle_generator import Category
+from src.hangman_session import HangmanSession, SessionState
+
+
+def gen_lion(category, difficulty, sampler=None, evil=False):
+    return Category.ANIMALS, 3 if difficulty == Category.RANDOM_FLAG else difficulty, \
+        HangmanPuzzle(Puzzle("lion", "A king without a crown."))
+
+
+@patch('src.hangman_game.gen_puzzle', side_effect=gen_lion)
+class TestHangmanSession(unittest.TestCase):
+    def start_guessing(self, difficulty="3") -> HangmanSession:
+        session = HangmanSession()
+        self.assertIn("Welcome to Hangman game!", session.start().output)
+        self.assertEqual(session.feed("animals").events, [GameEvent.CATEGORY_SET])
+        reply = session.feed(difficulty)
+        self.assertEqual(reply.events, [GameEvent.DIFFICULTY_SET, GameEvent.GAME_STARTED])
+        self.assertIn("The word: ____", reply.output)
+        self.assertEqual(session.state, SessionState.GUESSING)
+        return session
+
+    def test_invalid_setup_input(self, mock_gen_puzzle):
+        session = HangmanSession()
+        session.start()
+        self.assertEqual(session.feed("planets").events, [GameEvent.INVALID_INPUT])
+        session.feed("random")
+        self.assertEqual(session.feed("0").events, [GameEvent.INVALID_INPUT])
+        self.assertEqual(session.state, SessionState.CHOOSING_DIFFICULTY)
+
+    def test_win(self, mock_gen_puzzle):
+        session = self.start_guessing()
+        self.assertEqual(session.feed("l").events, [GameEvent.HIT])
+        self.assertEqual(session.feed("L").events, [GameEvent.REPEAT])
+        self.assertEqual(session.feed("xy").events, [GameEvent.INVALID_INPUT])
+        self.assertEqual(session.feed("help").events, [GameEvent.HINT])
+        session.feed("i")
+        session.feed("o")
+        reply = session.feed("n")
+        self.assertEqual(reply.events, [GameEvent.HIT, GameEvent.WON])
+        self.assertIn("You won!", reply.output)
+        self.assertTrue(session.finished)
+        with self.assertRaises(RuntimeError):
+            session.feed("a")
+
+    def test_loss(self, mock_gen_puzzle):
+        session = self.start_guessing("4")
+        reply = session.feed("z")
+        self.assertEqual(reply.events, [GameEvent.MISS, GameEvent.LOST])
+        self.assertIn("You lost!", reply.output)
+        self.assertIn("The hidden word is lion.", reply.output)
+
+    def test_quit(self, mock_gen_puzzle):
+        session = self.start_guessing()
+        reply = session.feed("quit")
+        self.assertEqual(reply.events, [GameEvent.QUIT, GameEvent.LOST])
+        self.assertTrue(session.finished)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from src.hangman_puzzle import Puzzle
+from src.hangman_puzzle_generator import Category
+from src.hangman_representation import DIFFICULTY_LEVELS
+from src import hangman_simulator
+from src.hangman_simulator import build_calibration_table, simulate_games, summarize, STRATEGIES
+
+
+@unittest.skipIf(hangman_simulator.np is None, "NumPy is not installed")
+class TestSimulator(unittest.TestCase):
+    def test_every_game_ends_with_the_word_guessed(self):
+        for strategy_name in STRATEGIES:
+            words, targets, mistakes = simulate_games(["lion", "bat", "shark"], 500, strategy_name, seed=1)
+            self.assertEqual(len(mistakes), 500)
+            self.assertTrue((mistakes >= 0).all())
+            self.assertTrue((mistakes <= 26 - 3).all())
+
+    def test_optimal_strategy_never_misses_on_a_single_word(self):
+        words, targets, mistakes = simulate_games(["lion"], 100, "optimal", seed=1)
+        self.assertTrue((mistakes == 0).all())
+
+    def test_optimal_strategy_filters_candidates(self):
+        # "lion" is the only word of its length; "bat" and "cat" differ in a letter only one of them has.
+        words, targets, mistakes = simulate_games(["bat", "cat", "lion", "owl"], 300, "optimal", seed=1, batch_size=7)
+        self.assertTrue((mistakes[targets == 2] == 0).all())
+        self.assertTrue((mistakes[targets != 2] <= 2).all())
+        self.assertEqual(set(mistakes[targets < 2].tolist()), {0, 1})
+
+    def test_frequency_strategy_is_deterministic(self):
+        # The letters are asked in the order a, b, g, k, n, o, r, t: "bat" misses g, k, n, o, r,
+        # and "kangaroo" misses b.
+        words, targets, mistakes = simulate_games(["kangaroo", "bat"], 200, "frequency", seed=1)
+        self.assertEqual(set(targets.tolist()), {0, 1})
+        self.assertTrue((mistakes[targets == 0] == 1).all())
+        self.assertTrue((mistakes[targets == 1] == 5).all())
+
+    def test_batches_are_limited(self):
+        words = hangman_simulator.WordMatrix(["bat"] * 8000)
+        self.assertEqual(hangman_simulator.CandidateFilteringStrategy().max_batch_size(words),
+                         hangman_simulator.MAX_CANDIDATE_BYTES // 1000)
+        self.assertIsNone(hangman_simulator.RandomStrategy().max_batch_size(words))
+
+    def test_summarize_follows_game_rules(self):
+        mistakes = hangman_simulator.np.array([0, 1, 2])
+        rows = summarize(Category.ANIMALS, mistakes)
+        self.assertEqual([row.difficulty for row in rows], list(range(1, len(DIFFICULTY_LEVELS) + 1)))
+        self.assertAlmostEqual(rows[0].win_rate, 1.0)
+        self.assertAlmostEqual(rows[0].expected_score, (64 + 32 + 16) / 3)
+        self.assertAlmostEqual(rows[3].win_rate, 1 / 3)
+        self.assertAlmostEqual(rows[3].expected_score, 64 / 3)
+
+    def test_per_word_table(self):
+        puzzles = {Category.ANIMALS: [Puzzle("bat", ""), Puzzle("lion", "")]}
+        table = build_calibration_table(100, "random", seed=3, per_word=True, puzzles_by_category=puzzles)
+        self.assertEqual({row.word for row in table}, {"bat", "lion"})
+        self.assertEqual(sum(row.games for row in table if row.difficulty == 1), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
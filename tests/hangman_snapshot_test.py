@@ -0,0 +1,110 @@
+import unittest
+
+from src.hangman_evil_puzzle import EvilHangmanPuzzle
+from src.hangman_game import HangmanGame
+from src.hangman_puzzle import Puzzle
+from src.hangman_puzzle_generator import Category, PUZZLES_BY_CATEGORY_LIST, set_word_bank
+from src.hangman_snapshot import GAME_RECORD, SESSION_RECORD, dump_games, load_games, restore_game, snapshot_game
+
+
+def start_game(word_ind: int, difficulty: int, guesses: str) -> HangmanGame:
+    game = HangmanGame()
+    game.resume_game(Category.ANIMALS, difficulty, PUZZLES_BY_CATEGORY_LIST[Category.ANIMALS][word_ind], 0, 0)
+    for letter in guesses:
+        game.process_guess(letter)
+    return game
+
+
+class TestSnapshot(unittest.TestCase):
+    def assertSameGame(self, restored: HangmanGame, game: HangmanGame):
+        self.assertEqual(restored.category, game.category)
+        self.assertEqual(restored.difficulty, game.difficulty)
+        self.assertEqual(restored.max_mistakes, game.max_mistakes)
+        self.assertEqual(restored.mistakes, game.mistakes)
+        self.assertEqual(restored.hints_given, game.hints_given)
+        self.assertEqual(restored.hangman_puzzle.get_puzzle().get_word(), game.hangman_puzzle.get_puzzle().get_word())
+        self.assertEqual(restored.hangman_puzzle.get_guessed_part(), game.hangman_puzzle.get_guessed_part())
+        self.assertEqual(restored.hangman_puzzle.get_guessed_mask(), game.hangman_puzzle.get_guessed_mask())
+        self.assertEqual(restored.hangman_representation.hangman_picture, game.hangman_representation.hangman_picture)
+
+    def test_record_is_small(self):
+        self.assertLessEqual(GAME_RECORD.size, 32)
+        self.assertLessEqual(SESSION_RECORD.size, 40)
+
+    def test_snapshot_and_restore(self):
+        game = start_game(4, 1, "exla")
+        game.give_hint()
+        record = snapshot_game(game)
+        self.assertEqual(len(record), GAME_RECORD.size)
+
+        restored = restore_game(record)
+        self.assertSameGame(restored, game)
+
+        restored.process_guess("p")
+        restored.process_guess("h")
+        restored.process_guess("n")
+        restored.process_guess("t")
+        self.assertTrue(restored.hangman_puzzle.get_is_guessed())
+
+    def test_evil_game(self):
+        game = HangmanGame(evil=True)
+        game.start_game(Category.ANIMALS, 3)
+        for letter in "tkeoa":
+            game.process_guess(letter)
+
+        restored = restore_game(snapshot_game(game))
+        self.assertIsInstance(restored.hangman_puzzle, EvilHangmanPuzzle)
+        self.assertTrue(restored.evil)
+        self.assertSameGame(restored, game)
+        self.assertEqual(restored.hangman_puzzle.get_candidate_count(), game.hangman_puzzle.get_candidate_count())
+        for letter in "iruns":
+            self.assertEqual(restored.process_guess(letter), game.process_guess(letter))
+        self.assertSameGame(restored, game)
+
+    def test_bulk_dump_and_load(self):
+        games = {session_id: start_game(session_id % 6, session_id % 4 + 1, "aeiou"[:session_id % 5])
+                 for session_id in range(50)}
+        data = dump_games(games)
+        self.assertEqual(len(data), 50 * SESSION_RECORD.size)
+
+        restored = load_games(data)
+        self.assertEqual(restored.keys(), games.keys())
+        for session_id, game in games.items():
+            self.assertSameGame(restored[session_id], game)
+
+    def test_invalid_records(self):
+        game = start_game(0, 2, "b")
+        record = bytearray(snapshot_game(game))
+        record[0] = 99
+        with self.assertRaises(ValueError):
+            restore_game(bytes(record))
+        with self.assertRaises(ValueError):
+            load_games(b"\0" * (SESSION_RECORD.size - 1))
+
+    def test_changed_category_is_rejected(self):
+        game = start_game(4, 1, "ex")
+        other_game = HangmanGame()
+        other_game.resume_game(Category.FRUITS, 1, PUZZLES_BY_CATEGORY_LIST[Category.FRUITS][0], 0, 0)
+
+        animals = [Puzzle(puzzle.get_word(), puzzle.get_hint())
+                   for puzzle in reversed(PUZZLES_BY_CATEGORY_LIST[Category.ANIMALS])]
+        set_word_bank({**PUZZLES_BY_CATEGORY_LIST, Category.ANIMALS: animals})
+        try:
+            # The game keeps the tag of the bank it took the word from.
+            record = snapshot_game(game)
+            with self.assertRaises(ValueError):
+                restore_game(record)
+            self.assertSameGame(restore_game(snapshot_game(other_game)), other_game)
+        finally:
+            set_word_bank(PUZZLES_BY_CATEGORY_LIST)
+        self.assertSameGame(restore_game(record), game)
+
+    def test_puzzle_without_id(self):
+        game = HangmanGame()
+        game.resume_game(Category.ANIMALS, 1, Puzzle("owl", ""), 0, 0)
+        with self.assertRaises(ValueError):
+            snapshot_game(game)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from textwrap import dedent
+from unittest.mock import patch
+
+from src.hangman_puzzle import Puzzle
+from src.hangman_puzzle_generator import (Category, PUZZLES_BY_CATEGORY_LIST, gen_puzzle, get_word_bank,
+                                          load_word_bank, set_word_bank)
+from src.hangman_word_bank import WordBank, write_word_bank, escape_field, unescape_field
+
+
+class TestWordBank(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "words.tsv")
+
+    def tearDown(self):
+        set_word_bank(PUZZLES_BY_CATEGORY_LIST)
+        self.directory.cleanup()
+
+    def test_escape_roundtrip(self):
+        text = "line one\n\tline two with \\ backslash\r\n"
+        self.assertNotIn("\n", escape_field(text))
+        self.assertEqual(unescape_field(escape_field(text)), text)
+
+    def test_write_and_read(self):
+        write_word_bank(self.path, PUZZLES_BY_CATEGORY_LIST)
+        with WordBank(self.path) as word_bank:
+            self.assertEqual(set(word_bank), set(PUZZLES_BY_CATEGORY_LIST))
+            for category, puzzles in PUZZLES_BY_CATEGORY_LIST.items():
+                self.assertEqual(len(word_bank[category]), len(puzzles))
+                for expected, actual in zip(puzzles, word_bank[category]):
+                    self.assertEqual(actual.get_word(), expected.get_word())
+                    self.assertEqual(actual.get_hint(), expected.get_hint())
+                self.assertEqual(list(word_bank[category].iter_words()),
+                                 [puzzle.get_word() for puzzle in puzzles])
+
+    def test_comments_blank_lines_and_crlf(self):
+        with open(self.path, "w", encoding="utf-8", newline="") as file:
+            file.write("# comment\r\n\r\nanimals\tbat\tflies at night\r\nanimals\tlion\r\n")
+        with WordBank(self.path) as word_bank:
+            self.assertEqual([puzzle.get_hint() for puzzle in word_bank["animals"]], ["flies at night", ""])
+            self.assertEqual(list(word_bank["animals"].iter_words()), ["bat", "lion"])
+
+    def test_malformed_line(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("animals bat\n")
+        with self.assertRaises(ValueError):
+            WordBank(self.path)
+
+    def test_empty_file(self):
+        open(self.path, "w").close()
+        with WordBank(self.path) as word_bank:
+            self.assertEqual(len(word_bank), 0)
+
+    @patch('random.choice')
+    def test_gen_puzzle_from_loaded_bank(self, mock_choice):
+        write_word_bank(self.path, {Category.NATURE: [Puzzle("tree", "It has lots of bark, but no bite?")]})
+        word_bank = load_word_bank(self.path)
+        self.addCleanup(word_bank.close)
+        self.assertIs(get_word_bank(), word_bank)
+
+        mock_choice.side_effect = lambda seq: seq[0]
+        category, difficulty, puzzle = gen_puzzle(Category.RANDOM_FLAG, 2)
+        self.assertEqual(category, Category.NATURE)
+        self.assertEqual(puzzle.get_puzzle().get_word(), "tree")
+
+        with self.assertRaises(ValueError):
+            gen_puzzle(Category.ANIMALS, 2)
+
+    def test_load_unknown_category(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(dedent("""\
+                planets\tmars\tThe red one.
+                """))
+        with self.assertRaises(ValueError):
+            load_word_bank(self.path)
+        self.assertIs(get_word_bank(), PUZZLES_BY_CATEGORY_LIST)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from src.hangman_puzzle import Puzzle
+from src.hangman_representation import MAX_DIFFICULTY
+from src.hangman_word_difficulty import DifficultyIndex, difficulty_bounds, word_hardness, word_rarity
+
+
+class TestWordHardness(unittest.TestCase):
+    def test_hardness_is_rarity_per_letter(self):
+        self.assertAlmostEqual(word_hardness("apple"), word_rarity({"a", "p", "l", "e"}) / 5)
+
+    def test_rare_letters_are_harder(self):
+        self.assertGreater(word_hardness("jazz"), word_hardness("tree"))
+
+
+class TestDifficultyIndex(unittest.TestCase):
+    def setUp(self):
+        words = ["jazz", "tree", "banana", "quiz", "eerie", "strawberry", "fizz", "seat"]
+        self.puzzles = {"animals": [Puzzle(word, "") for word in words]}
+        self.index = DifficultyIndex(self.puzzles)
+
+    def test_bounds_cover_all_words(self):
+        for size in range(0, 20):
+            bounds = difficulty_bounds(size)
+            self.assertEqual(bounds[0], 0)
+            self.assertEqual(bounds[-1], size)
+            for difficulty in range(MAX_DIFFICULTY):
+                if size:
+                    self.assertLess(bounds[2 * difficulty], bounds[2 * difficulty + 1])
+
+    def test_easy_levels_get_hard_words(self):
+        hardest = [puzzle.get_word() for puzzle in self.index.puzzles("animals", 1)]
+        easiest = [puzzle.get_word() for puzzle in self.index.puzzles("animals", MAX_DIFFICULTY)]
+        self.assertEqual(len(hardest), 2)
+        self.assertEqual(len(easiest), 2)
+        self.assertGreater(min(word_hardness(word) for word in hardest),
+                           max(word_hardness(word) for word in easiest))
+
+    def test_band(self):
+        band = self.index.band("animals", 1, MAX_DIFFICULTY)
+        self.assertEqual(len(band), 8)
+        self.assertEqual(sorted(puzzle.get_word() for puzzle in band),
+                         sorted(puzzle.get_word() for puzzle in self.puzzles["animals"]))
+        self.assertEqual(band[-1].get_word(), band[7].get_word())
+        with self.assertRaises(IndexError):
+            band[8]
+        with self.assertRaises(ValueError):
+            self.index.band("animals", 3, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from src.hangman_puzzle_generator import Category, gen_puzzle, get_difficulty_index
+from src.hangman_representation import MAX_DIFFICULTY
+from src.hangman_word_sampler import FeistelPermutation, WordSampler
+
+
+class TestFeistelPermutation(unittest.TestCase):
+    def test_is_permutation(self):
+        for size in (1, 2, 3, 7, 16, 17, 100, 1000):
+            permutation = FeistelPermutation(size, b"key")
+            self.assertEqual(sorted(permutation[index] for index in range(size)), list(range(size)))
+
+    def test_depends_on_key(self):
+        first = [FeistelPermutation(1000, b"first")[index] for index in range(1000)]
+        second = [FeistelPermutation(1000, b"second")[index] for index in range(1000)]
+        self.assertNotEqual(first, second)
+        self.assertNotEqual(first, list(range(1000)))
+
+    def test_index_out_of_range(self):
+        with self.assertRaises(IndexError):
+            FeistelPermutation(5, b"key")[5]
+        with self.assertRaises(ValueError):
+            FeistelPermutation(0, b"key")
+
+
+class TestWordSampler(unittest.TestCase):
+    def test_every_word_once_per_cycle(self):
+        sampler = WordSampler(seed=1)
+        first_cycle = [sampler.draw("pool", 50) for _ in range(50)]
+        second_cycle = [sampler.draw("pool", 50) for _ in range(50)]
+        self.assertEqual(sorted(first_cycle), list(range(50)))
+        self.assertEqual(sorted(second_cycle), list(range(50)))
+        self.assertNotEqual(first_cycle, second_cycle)
+
+    def test_resume_from_cursors(self):
+        sampler = WordSampler(seed=7)
+        for _ in range(13):
+            sampler.draw("animals:1-1", 30)
+        sampler.draw("fruits:2-2", 4)
+
+        resumed = WordSampler(sampler.seed, sampler.cursors())
+        self.assertEqual(resumed.cursors(), {"animals:1-1": 13, "fruits:2-2": 1})
+        self.assertEqual([resumed.draw("animals:1-1", 30) for _ in range(40)],
+                         [sampler.draw("animals:1-1", 30) for _ in range(40)])
+
+    def test_gen_puzzle_without_repeats(self):
+        sampler = WordSampler(seed=3)
+        band = get_difficulty_index().band(Category.ANIMALS, 1, MAX_DIFFICULTY)
+        words = []
+        for _ in range(len(band)):
+            _, _, puzzle = gen_puzzle(Category.ANIMALS, 1, word_band=(1, MAX_DIFFICULTY), sampler=sampler)
+            words.append(puzzle.get_puzzle().get_word())
+        self.assertEqual(sorted(words), sorted(puzzle.get_word() for puzzle in band))
+
+
+if __name__ == '__main__':
+    unittest.main()